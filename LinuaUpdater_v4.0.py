@@ -6,14 +6,9 @@
 import os
 import sys
 import time
-import json
 import shutil
-import zipfile
 import tempfile
-import subprocess
-import requests
-import socket
-import webbrowser
+import html
 import traceback
 from pathlib import Path
 from datetime import datetime
@@ -23,23 +18,27 @@ if sys.platform != "win32":
     import signal
     signal.signal(signal.SIGINT, signal.SIG_DFL)
 
-# Отключаем предупреждения SSL (только для локального использования)
-try:
-    import urllib3
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-except ImportError:
-    pass
+# Подкоманды (install, list, ...) уходят в CLI до загрузки PyQt6
+if __name__ == "__main__" and len(sys.argv) > 1 and not sys.argv[1].startswith("-"):
+    from linua_cli import main as cli_main
+    sys.exit(cli_main())
+
+# Движок установки без Qt (общий с linua_cli.py)
+from linua_core import (
+    APP_VERSION, SevenZipFinder, HttpTransport, ArchiveCache, ProgressTracker,
+    InstallService, DownloadEngine, Extractor, RepairEngine,
+    InstallPlanner, StagingManager, InstallTransaction, Logger, ConfigManager, InstalledIndex, ExternalDatabase, IntegrityVerifier,
+    AdvancedRepair, OfflineMode, DLCDatabase
+)
 
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, pyqtSlot
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal, QTimer, pyqtSlot
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QDialog, QFileDialog,
     QLabel, QPushButton, QTextEdit, QVBoxLayout,
     QHBoxLayout, QWidget, QLineEdit, QCheckBox,
     QScrollArea, QMessageBox, QProgressBar
 )
-from PyQt6.QtGui import QFont
-
-APP_VERSION = "4.0"
+from PyQt6.QtGui import QFont, QTextCursor
 
 # ================================================================
 #                     LOG WRITER (из старого кода)
@@ -54,516 +53,156 @@ class LogWriter:
             self.widget.ensureCursorVisible()
 
 
-# ================================================================
-#                   7ZIP DETECTOR (HYBRID) - из старого кода
-# ================================================================
-class SevenZipFinder:
-    POSSIBLE_LOCATIONS = [
-        "7z.exe",
-        "7za.exe",
-        r"C:\Program Files\7-Zip\7z.exe",
-        r"C:\Program Files\7-Zip\7za.exe",
-        r"C:\Program Files (x86)\7-Zip\7z.exe",
-        r"C:\Program Files (x86)\7-Zip\7za.exe",
-    ]
-
-    def __init__(self, logger):
-        self.logger = logger
-
-    def find(self):
-        # 1) check local directory (same folder as EXE)
-        exe_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
-        local = os.path.join(exe_dir, "7z.exe")
-        if os.path.exists(local):
-            if self.logger:
-                self.logger.log("Using local 7z.exe")
-            return local
-
-        # 2) check system locations
-        for p in self.POSSIBLE_LOCATIONS:
-            if os.path.exists(p):
-                if self.logger:
-                    self.logger.log(f"Found 7zip at: {p}")
-                return p
-
-        # 3) check via PATH
-        try:
-            if sys.platform == "win32":
-                result = subprocess.run(["where", "7z"], capture_output=True, text=True, shell=True)
-            else:
-                result = subprocess.run(["which", "7z"], capture_output=True, text=True)
-                
-            if result.returncode == 0:
-                path = result.stdout.strip().split('\n')[0]
-                if self.logger:
-                    self.logger.log(f"Found 7zip via PATH: {path}")
-                return path
-        except:
-            pass
-
-        # 4) 7zip not found
-        if self.logger:
-            self.logger.log("7z.exe not found. Multipart DLC will not extract.")
-        return None
-
-
-# ================================================================
-#                  ADVANCED DOWNLOAD ENGINE - из старого кода
-# ================================================================
-class DownloadEngine:
+class LogView(QObject):
     """
-    Stable downloader - direct downloads only
+    Окно лога: строки, накопленные Logger в любых потоках, забираются
+    таймером в GUI-потоке и выводятся пачкой; виджет хранит не больше
+    MAX_LINES строк (старые удаляются)
     """
 
-    def __init__(self, logger):
-        self.logger = logger
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-
-    def log(self, text):
-        if self.logger:
-            self.logger.log(text)
-
-    def download(self, url, out_path, dlc_name=None):
-        """Основной метод скачивания"""
-        try:
-            # Показываем название DLC вместо ссылки
-            display_text = dlc_name if dlc_name else url
-            self.log(f"Downloading: {display_text}")
+    INTERVAL_MS = 100
+    MAX_LINES = 3000
 
-            # Для ВСЕХ ссылок используем прямой download
-            return self.download_direct(url, out_path)
-
-        except Exception as e:
-            return False, f"Download error: {str(e)}"
+    def __init__(self, logger, widget):
+        super().__init__(widget)
+        self.logger = logger
+        self.widget = widget
+        self.widget.document().setMaximumBlockCount(self.MAX_LINES)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.pump)
+        self.timer.start(self.INTERVAL_MS)
 
-    def download_direct(self, url, out_path):
-        """Прямое скачивание с улучшенной проверкой безопасности"""
-        try:
-            # Создаем родительскую директорию если нужно
-            os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
-            
-            with self.session.get(url, stream=True, timeout=30, verify=False) as r:
-                r.raise_for_status()
-                
-                if r.status_code != 200:
-                    return False, f"HTTP {r.status_code}"
-                
-                # Проверка content-type для безопасности
-                content_type = r.headers.get('content-type', '')
-                valid_types = ['application/zip', 'application/octet-stream', 
-                              'application/x-zip-compressed', 'application/x-7z-compressed']
-                
-                if not any(ct in content_type for ct in valid_types):
-                    self.log(f"Warning: Unexpected content type: {content_type}")
-
-                total = int(r.headers.get("content-length", 0))
-                # УВЕЛИЧИЛИ ЛИМИТ ДО 10GB ДЛЯ КРУПНЫХ DLC
-                if total > 10 * 1024 * 1024 * 1024:  # 10GB
-                    return False, "File too large (max 10GB)"
-
-                downloaded = 0
-                with open(out_path, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=1024 * 256):
-                        if chunk:
-                            f.write(chunk)
-                            downloaded += len(chunk)
-
-                # Проверить что файл не пустой
-                if downloaded == 0:
-                    return False, "Empty file downloaded"
-
-                if total > 0 and downloaded < total * 0.90:
-                    return False, f"File incomplete ({downloaded}/{total})"
-
-                return True, "OK"
-
-        except requests.exceptions.Timeout:
-            return False, "Connection timeout"
-        except requests.exceptions.ConnectionError:
-            return False, "Connection error"
-        except Exception as e:
-            return False, f"Direct download error: {str(e)}"
+    @staticmethod
+    def color(text):
+        # Цвет строки по её содержимому
+        text = text.upper()
+        if "ERROR" in text:
+            return "red"
+        if "WARNING" in text:
+            return "yellow"
+        if "SUCCESS" in text or "OK" in text:
+            return "lightgreen"
+        if "DEBUG" in text:
+            return "gray"
+        return "white"
+
+    def pump(self):
+        lines = self.logger.drain()
+        if not lines:
+            return
+        cursor = QTextCursor(self.widget.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        # Одна операция редактирования - одна перерисовка на всю пачку
+        cursor.beginEditBlock()
+        for line in lines:
+            if not self.widget.document().isEmpty():
+                cursor.insertBlock()
+            cursor.insertHtml(f'<font color="{self.color(line)}">{html.escape(line)}</font>')
+        cursor.endEditBlock()
+        bar = self.widget.verticalScrollBar()
+        bar.setValue(bar.maximum())
 
 
 # ================================================================
-#                     ZIP / 7Z SAFE EXTRACTOR - из старого кода
+#                   CONNECTION CHECK (в фоне)
 # ================================================================
-class Extractor:
-    def __init__(self, logger):
-        self.logger = logger
-
-    def log(self, text):
-        if self.logger:
-            self.logger.log(text)
-
-    def extract_zip(self, file, out_dir):
-        """Распаковать ZIP архив"""
-        try:
-            # Создаем директорию для распаковки
-            os.makedirs(out_dir, exist_ok=True)
-            
-            with zipfile.ZipFile(file, "r") as z:
-                # Проверяем архив перед распаковкой
-                bad_file = z.testzip()
-                if bad_file:
-                    return False, f"Corrupted ZIP file: {bad_file}"
-                    
-                total = len(z.infolist())
-                extracted = 0
-                for member in z.infolist():
-                    z.extract(member, out_dir)
-                    extracted += 1
-                    
-            self.log(f"Extracted {extracted} files from ZIP")
-            return True, "OK"
-        except zipfile.BadZipFile:
-            return False, "Invalid or corrupted ZIP file"
-        except Exception as e:
-            return False, f"ZIP extraction error: {str(e)}"
+class ConnectionCheckThread(QThread):
+    """Проверка сети после показа окна, чтобы не держать GUI-поток"""
+    done = pyqtSignal(bool)
 
-    def extract_7z(self, seven, archive_path, out_dir):
-        """Распаковать 7z архив"""
-        try:
-            # Проверяем существование 7z
-            if not os.path.exists(seven):
-                return False, "7z.exe not found"
-                
-            # Проверяем существование архива
-            if not os.path.exists(archive_path):
-                return False, "Archive file not found"
-                
-            # Создаем директорию для распаковки
-            os.makedirs(out_dir, exist_ok=True)
-            
-            cmd = [
-                seven,
-                "x",
-                archive_path,
-                f"-o{out_dir}",
-                "-y"
-            ]
-            
-            self.log(f"Running: {' '.join(cmd)}")
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True, timeout=300)
-            self.log(f"7z output: {result.stdout[:200]}")
-            
-            return True, "OK"
-
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr if e.stderr else str(e)
-            return False, f"7z error: {error_msg}"
-        except subprocess.TimeoutExpired:
-            return False, "7z extraction timeout"
-        except FileNotFoundError:
-            return False, "7z.exe not found in PATH"
-        except Exception as e:
-            return False, f"7z error: {str(e)}"
+    def run(self):
+        self.done.emit(OfflineMode.probe())
 
 
 # ================================================================
-#                    DLC INSTALL ENGINE - из старого кода
+#                  DLC DATABASE SYNC (в фоне)
 # ================================================================
-class SingleDLCInstaller:
-    """Установка одиночных DLC"""
-
-    def __init__(self, dlc_id, info, game_path, downloader, extractor, logger):
-        self.dlc = dlc_id
-        self.info = info
-        self.game = game_path
-        self.dl = downloader
-        self.ex = extractor
-        self.logger = logger
+class DatabaseSyncThread(QThread):
+    """Условная синхронизация базы DLC с GitHub вне GUI-потока"""
+    done = pyqtSignal(object)
 
-    def log(self, t):
-        if self.logger:
-            self.logger.log(f"[{self.dlc}] {t}")
+    def __init__(self, external_db):
+        super().__init__()
+        self.external_db = external_db
 
     def run(self):
-        temp = None
-        try:
-            url = self.info.get("url")
-            if not url:
-                return False, "URL missing"
-
-            # Создаем временный файл с уникальным именем
-            temp_dir = tempfile.gettempdir()
-            temp = os.path.join(temp_dir, f"{self.dlc}_{int(time.time())}.zip")
-
-            self.log("Downloading...")
-            # Передаем название DLC для красивого логирования
-            dlc_name = f"{self.dlc} - {self.info.get('name', 'Unknown DLC')}"
-            ok, reason = self.dl.download(url, temp, dlc_name)
-            if not ok:
-                return False, reason
-
-            # Проверяем размер файла
-            if os.path.getsize(temp) == 0:
-                return False, "Downloaded file is empty"
-
-            self.log("Extracting...")
-            ok, reason = self.ex.extract_zip(temp, self.game)
-            if not ok:
-                return False, reason
-
-            self.log("Installation completed successfully")
-            return True, "OK"
-
-        except Exception as e:
-            return False, f"Installation error: {str(e)}"
-        finally:
-            # Cleanup временного файла
-            if temp and os.path.exists(temp):
-                try:
-                    os.remove(temp)
-                except:
-                    pass
+        self.done.emit(self.external_db.get_database())
 
 
 # ================================================================
-#               MULTIPART DLC INSTALLER - из старого кода
+#                 INSTALL PLANNING (размеры до старта)
 # ================================================================
-class MultiPartInstaller:
-    """Установка многодольных DLC"""
-
-    def __init__(self, dlc_id, info, game_path, downloader, extractor, seven_path, logger):
-        self.dlc = dlc_id
-        self.info = info
-        self.game = game_path
-        self.dl = downloader
-        self.ex = extractor
-        self.seven = seven_path
-        self.logger = logger
+class PlanThread(QThread):
+    """HEAD-запросы и расчёт места для выбранных DLC вне GUI-потока"""
+    done = pyqtSignal(object)
 
-    def log(self, t):
-        if self.logger:
-            self.logger.log(f"[{self.dlc}] {t}")
+    def __init__(self, service, jobs, game_path, download_slots, extract_slots, installed):
+        super().__init__()
+        self.service = service
+        self.jobs = jobs
+        self.game_path = game_path
+        self.download_slots = download_slots
+        self.extract_slots = extract_slots
+        self.installed = installed
 
     def run(self):
-        downloaded_files = []
         try:
-            if not self.seven or not os.path.exists(self.seven):
-                return False, "7z.exe not found"
-
-            parts = self.info.get("parts", [])
-            if not parts:
-                return False, "No parts defined"
-
-            # Скачиваем все части
-            for i, url in enumerate(parts):
-                name = f"{self.dlc}.7z.{str(i+1).zfill(3)}"
-                out = os.path.join(tempfile.gettempdir(), name)
-
-                self.log(f"Downloading part {i+1}/{len(parts)}...")
-                # Передаем название DLC для красивого логирования
-                dlc_name = f"{self.dlc} - {self.info.get('name', 'Unknown DLC')} [Part {i+1}]"
-                ok, reason = self.dl.download(url, out, dlc_name)
-                if not ok:
-                    # Очищаем уже скачанные части
-                    for f in downloaded_files:
-                        try:
-                            os.remove(f)
-                        except:
-                            pass
-                    return False, reason
-
-                downloaded_files.append(out)
-
-            # Проверяем что первая часть существует
-            if not downloaded_files or not os.path.exists(downloaded_files[0]):
-                return False, "First part not found"
-
-            # Извлекаем через 7-Zip
-            part1 = downloaded_files[0]
-            self.log("Extracting multipart archive...")
-
-            ok, reason = self.ex.extract_7z(self.seven, part1, self.game)
-            if not ok:
-                return False, reason
-
-            self.log("Installation completed successfully")
-            return True, "OK"
-
+            plan = self.service.plan(
+                self.jobs, self.game_path, self.download_slots, self.extract_slots, self.installed
+            )
         except Exception as e:
-            return False, f"Multipart installation error: {str(e)}"
-        finally:
-            # Очищаем временные файлы
-            for f in downloaded_files:
-                try:
-                    if os.path.exists(f):
-                        os.remove(f)
-                except:
-                    pass
+            plan = {"ok": False, "reason": f"Planning failed: {e}", "entries": {}}
+        self.done.emit(plan)
 
 
 # ================================================================
-#                 INSTALLATION THREADS - из старого кода
+#                  INSTALLED INDEX REFRESH (в фоне)
 # ================================================================
-class ZipInstallThread(QThread):
-    log = pyqtSignal(str)
-    done = pyqtSignal(str, bool, str)
-    
-    def __init__(self, dlc_id, info, game_path, downloader, extractor, logger):
-        super().__init__()
-        self.dlc = dlc_id
-        self.info = info
-        self.game = game_path
-        self.downloader = downloader
-        self.extractor = extractor
-        self.logger = logger
-        self._stop_requested = False
-        
-    def stop(self):
-        """Запросить остановку потока"""
-        self._stop_requested = True
-        
-    def run(self):
-        inst = SingleDLCInstaller(
-            self.dlc, self.info, self.game,
-            self.downloader, self.extractor, self.logger
-        )
-        
-        # Проверяем флаг остановки во время установки
-        if not self._stop_requested:
-            success, reason = inst.run()
-            self.done.emit(self.dlc, success, reason)
-        else:
-            self.log.emit(f"[{self.dlc}] Installation cancelled")
-            self.done.emit(self.dlc, False, "Cancelled by user")
-
+class IndexThread(QThread):
+    """Обновление индекса установленных DLC вне GUI-потока"""
+    done = pyqtSignal(int)
 
-class MultiPartInstallThread(QThread):
-    log = pyqtSignal(str)
-    done = pyqtSignal(str, bool, str)
-    
-    def __init__(self, dlc_id, info, game_path, downloader, extractor, logger):
+    def __init__(self, index, logger=None):
         super().__init__()
-        self.dlc = dlc_id
-        self.info = info
-        self.game = game_path
-        self.downloader = downloader
-        self.extractor = extractor
+        self.index = index
         self.logger = logger
-        self._stop_requested = False
-        
-    def stop(self):
-        """Запросить остановку потока"""
-        self._stop_requested = True
-        
-    def run(self):
-        # Проверяем флаг остановки
-        if self._stop_requested:
-            self.log.emit(f"[{self.dlc}] Installation cancelled")
-            self.done.emit(self.dlc, False, "Cancelled by user")
-            return
-            
-        # Find 7z when thread starts
-        seven_finder = SevenZipFinder(self.logger)
-        seven_path = seven_finder.find()
-        
-        if not seven_path:
-            self.log.emit(f"[{self.dlc}] ERROR: 7-zip not found")
-            self.done.emit(self.dlc, False, "7-zip not found")
-            return
 
-        inst = MultiPartInstaller(
-            self.dlc, self.info, self.game,
-            self.downloader, self.extractor,
-            seven_path, self.logger
-        )
-        
-        # Проверяем флаг остановки снова
-        if not self._stop_requested:
-            success, reason = inst.run()
-            self.done.emit(self.dlc, success, reason)
-        else:
-            self.log.emit(f"[{self.dlc}] Installation cancelled")
-            self.done.emit(self.dlc, False, "Cancelled by user")
+    def run(self):
+        # Сначала доводим/откатываем установки, прерванные сбоем - индекс увидит итог
+        InstallTransaction.recover(self.index.game, self.logger)
+        self.done.emit(len(self.index.refresh()))
 
 
 # ================================================================
-#                           REPAIR ENGINE - из старого кода
+#                 FULL REPAIR THREAD (этапы в фоне)
 # ================================================================
-class RepairEngine:
-    """Система восстановления папки Sims 4"""
-
-    def __init__(self, game_path, logger):
-        self.game = Path(game_path)
-        self.logger = logger
-
-    def log(self, msg):
-        if self.logger:
-            self.logger.log(msg)
-
-    def run(self):
-        try:
-            if not self.game.exists():
-                self.log("Invalid game path")
-                return False
+class FullRepairThread(QThread):
+    """Полный ремонт по этапам вне GUI-потока; лог и прогресс идут сигналами"""
+    message = pyqtSignal(str)
+    progress = pyqtSignal(str, int, int)  # этап, проверено, всего
+    done = pyqtSignal(object, str)        # results, report
 
-            self.log("Starting deep repair...")
+    def __init__(self, game_path, index, budgets=None, db=None, temp_dir=None):
+        super().__init__()
+        # Свой движок загрузки: отмена установки не обрывает ремонт, отмена ремонта - установку
+        self.downloader = DownloadEngine(self)
+        # Проверка хэшей DLC и докачка повреждённых файлов
+        integrity = IntegrityVerifier(game_path, self, self.downloader, Extractor(self))
+        self.repair = AdvancedRepair(
+            game_path, self, index=index, budgets=budgets, integrity=integrity, db=db, temp_dir=temp_dir
+        )
 
-            self.check_structure()
-            self.check_executables()
-            self.clean_empty_dlc()
-            self.clean_temp_files()
+    def log(self, text):
+        """AdvancedRepair пишет лог из рабочих потоков - в GUI он попадает сигналом"""
+        self.message.emit(text)
 
-            self.log("Repair completed successfully")
-            return True
+    def stop(self):
+        self.repair.cancel()
+        self.downloader.cancel()
 
-        except Exception as e:
-            self.log(f"Repair failed: {e}")
-            return False
-
-    def check_structure(self):
-        self.log("Checking game structure...")
-        required = ["Game", "Data"]
-        for f in required:
-            if not (self.game / f).exists():
-                self.log(f"Missing folder: {f}")
-
-    def check_executables(self):
-        self.log("Checking executables...")
-        exe = self.game / "Game" / "Bin" / "TS4_x64.exe"
-        if not exe.exists():
-            self.log("TS4_x64.exe missing - game may not run")
-        else:
-            size_mb = exe.stat().st_size / (1024 * 1024)
-            self.log(f"TS4_x64.exe size: {size_mb:.1f} MB")
-
-    def clean_empty_dlc(self):
-        self.log("Cleaning empty DLC folders...")
-        cleaned = 0
-        for item in self.game.iterdir():
-            if item.is_dir():
-                name = item.name.upper()
-                if name.startswith(("EP", "GP", "SP", "FP")):
-                    if not any(item.iterdir()):
-                        self.log(f"Removing empty folder: {name}")
-                        try:
-                            shutil.rmtree(item, ignore_errors=True)
-                            cleaned += 1
-                        except:
-                            pass
-        self.log(f"Cleaned {cleaned} empty DLC folders")
-
-    def clean_temp_files(self):
-        self.log("Cleaning temp files...")
-        temp = Path(tempfile.gettempdir())
-        patterns = [".7z.001", ".7z.002", ".zip", ".tmp", ".part"]
-        
-        cleaned = 0
-        for pattern in patterns:
-            for f in temp.glob(f"*{pattern}"):
-                try:
-                    if f.is_file():
-                        f.unlink()
-                        cleaned += 1
-                except:
-                    pass
-        self.log(f"Cleaned {cleaned} temp files")
+    def run(self):
+        results, report = self.repair.run_full_repair(self.progress.emit)
+        self.done.emit(results, report)
 
 
 # ================================================================
@@ -573,10 +212,11 @@ class RepairThread(QThread):
     done = pyqtSignal(bool)
     log = pyqtSignal(str)
     
-    def __init__(self, game_path, logger):
+    def __init__(self, game_path, logger, temp_dir=None):
         super().__init__()
         self.game_path = game_path
         self.logger = logger
+        self.temp_dir = temp_dir
         self._stop_requested = False
         
     def stop(self):
@@ -585,7 +225,7 @@ class RepairThread(QThread):
         
     def run(self):
         if not self._stop_requested:
-            engine = RepairEngine(self.game_path, self.logger)
+            engine = RepairEngine(self.game_path, self.logger, self.temp_dir)
             ok = engine.run()
             self.done.emit(ok)
 
@@ -599,41 +239,32 @@ class RepairThread(QThread):
 # ================================================================
 #                APPLICATION CONTROLLER - ИСПРАВЛЕННЫЙ
 # ================================================================
-class AppController:
-    def __init__(self, logger, thread_manager):
-        self.logger = logger
-        self.downloader = DownloadEngine(logger)
-        self.extractor = Extractor(logger)
+class InstallBridge(QObject):
+    """Передаёт результаты планировщика из рабочих потоков в GUI-поток"""
+    done = pyqtSignal(str, bool, str)
+
+
+class AppController(InstallService):
+    def __init__(self, logger, thread_manager, cache=None, temp_dir=None):
+        super().__init__(logger, cache=cache, temp_dir=temp_dir)
         self.thread_manager = thread_manager
-        
-    def install_zip(self, dlc_id, dlc_info, game_path, finished_callback):
-        worker = ZipInstallThread(
-            dlc_id, dlc_info, game_path,
-            self.downloader,
-            self.extractor,
-            self.logger
+        self.bridge = None
+
+    def install_batch(self, jobs, game_path, finished_callback,
+                      download_slots=2, extract_slots=1, order="smallest"):
+        """Результаты планировщика доставляются в GUI-поток через сигнал"""
+        if self.bridge:
+            # Поздние отчёты отменённой очереди не должны попасть в новую
+            self.bridge.done.disconnect()
+        self.bridge = InstallBridge()
+        self.bridge.done.connect(finished_callback)
+        return super().install_batch(
+            jobs, game_path, self.bridge.done.emit,
+            download_slots=download_slots, extract_slots=extract_slots, order=order
         )
-        worker.log.connect(self.logger.log)
-        worker.done.connect(finished_callback)
-        self.thread_manager.add_thread(worker)
-        worker.start()
-        return worker
-
-    def install_multipart(self, dlc_id, dlc_info, game_path, finished_callback):
-        worker = MultiPartInstallThread(
-            dlc_id, dlc_info, game_path,
-            self.downloader,
-            self.extractor,
-            self.logger
-        )
-        worker.log.connect(self.logger.log)
-        worker.done.connect(finished_callback)
-        self.thread_manager.add_thread(worker)
-        worker.start()
-        return worker
-
+        
     def run_repair(self, game_path, finished_callback):
-        repair = RepairThread(game_path, self.logger)
+        repair = RepairThread(game_path, self.logger, self.temp_dir)
         repair.done.connect(finished_callback)
         repair.log.connect(self.logger.log)
         self.thread_manager.add_thread(repair)
@@ -641,117 +272,6 @@ class AppController:
         return repair
 
 
-# ================================================================
-#                       NETWORK CHECKER
-# ================================================================
-class NetworkChecker:
-    @staticmethod
-    def is_online():
-        try:
-            socket.create_connection(("8.8.8.8", 53), timeout=2)
-            return True
-        except:
-            return False
-
-
-# ================================================================
-#                      DISK SPACE CHECKER - из старого кода
-# ================================================================
-class DiskChecker:
-    @staticmethod
-    def get_free_gb(path):
-        try:
-            usage = shutil.disk_usage(path)
-            return usage.free / (1024**3)  # Convert to GB
-        except:
-            return 0
-
-    @staticmethod
-    def check_disk_space(path, required_gb=10):
-        """Проверка свободного места на диске"""
-        try:
-            total, used, free = shutil.disk_usage(path)
-            free_gb = free // (2**30)  # Конвертируем в GB
-            return free_gb >= required_gb, free_gb
-        except Exception as e:
-            return True, 0  # Если проверка не удалась, продолжаем
-
-
-# ================================================================
-#                           LOGGER
-# ================================================================
-class Logger:
-    def __init__(self, widget=None):
-        self.widget = widget
-        self.log_dir = Path.home() / "AppData" / "Local" / "LinuaUpdater" / "logs"
-        self.log_dir.mkdir(parents=True, exist_ok=True)
-        self.log_file = self.log_dir / f"log_{time.strftime('%Y-%m-%d')}.txt"
-
-    def log(self, text):
-        t = time.strftime("[%H:%M:%S]")
-        line = f"{t} {text}"
-
-        if self.widget:
-            # Используем HTML для цветного текста
-            if "ERROR" in text.upper():
-                line = f'<font color="red">{line}</font>'
-            elif "WARNING" in text.upper():
-                line = f'<font color="yellow">{line}</font>'
-            elif "SUCCESS" in text.upper() or "OK" in text.upper():
-                line = f'<font color="lightgreen">{line}</font>'
-            elif "DEBUG" in text.upper():
-                line = f'<font color="gray">{line}</font>'
-            else:
-                line = f'<font color="white">{line}</font>'
-            
-            self.widget.append(line)
-            self.widget.ensureCursorVisible()
-
-        try:
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(f"{t} {text}\n")
-        except Exception as e:
-            print(f"Failed to write log: {e}")
-
-    def write(self, text):
-        """Совместимость с LogWriter из старого кода"""
-        self.log(text)
-
-
-# ================================================================
-#                        CONFIG MANAGER
-# ================================================================
-class ConfigManager:
-    def __init__(self):
-        self.path = Path.home() / "AppData" / "Local" / "LinuaUpdater" / "config.json"
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-
-        if not self.path.exists():
-            self.data = {"game_path": ""}
-            self.save()
-        else:
-            try:
-                with open(self.path, "r", encoding="utf-8") as f:
-                    self.data = json.load(f)
-            except:
-                self.data = {"game_path": ""}
-                self.save()
-
-    def get(self, key, default=None):
-        return self.data.get(key, default)
-
-    def set(self, key, value):
-        self.data[key] = value
-        self.save()
-
-    def save(self):
-        try:
-            with open(self.path, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, indent=4)
-        except Exception as e:
-            print(f"Failed to save config: {e}")
-
-
 # ================================================================
 #               НОВЫЕ КЛАССЫ ДЛЯ УЛУЧШЕНИЙ v4.0
 # ================================================================
@@ -803,7 +323,7 @@ class ThreadManager:
         self.is_cancelling = False
         
     def cleanup_temporary_files(self):
-        """Очистка временных файлов после отмены"""
+        """Очистка временных файлов после отмены (рабочие папки StagingManager не трогаем - там докачка)"""
         temp_dir = Path(tempfile.gettempdir())
         patterns = ["*.tmp", "*.zip", "*.7z.*", "_linua_*", "*.part"]
         
@@ -825,690 +345,6 @@ class ThreadManager:
             time.sleep(0.1)
 
 
-# 2. Умное скачивание с очередью
-class DownloadThread(QThread):
-    progress = pyqtSignal(int, int)  # current, total in MB
-    finished = pyqtSignal(str, bool, str)  # dlc_id, success, message
-    
-    def __init__(self, dlc_id, url, path, logger):
-        super().__init__()
-        self.dlc_id = dlc_id
-        self.url = url
-        self.path = path
-        self.logger = logger
-        self._stop_flag = False
-        
-    def stop(self):
-        self._stop_flag = True
-        
-    def run(self):
-        try:
-            # Создаем сессию для этого потока
-            session = requests.Session()
-            session.headers.update({'User-Agent': 'Linua-Updater/4.0'})
-            
-            with session.get(self.url, stream=True, timeout=30, verify=False) as r:
-                r.raise_for_status()
-                
-                total_size = int(r.headers.get('content-length', 0))
-                downloaded = 0
-                
-                # Создаем директорию если нужно
-                os.makedirs(os.path.dirname(self.path), exist_ok=True)
-                
-                with open(self.path, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=8192):
-                        if self._stop_flag:
-                            self.finished.emit(self.dlc_id, False, "Cancelled")
-                            try:
-                                os.remove(self.path)
-                            except:
-                                pass
-                            return
-                            
-                        if chunk:
-                            f.write(chunk)
-                            downloaded += len(chunk)
-                            mb_downloaded = downloaded / (1024 * 1024)
-                            mb_total = total_size / (1024 * 1024) if total_size else 0
-                            self.progress.emit(int(mb_downloaded), int(mb_total))
-                
-                # Проверка целостности
-                if total_size > 0 and downloaded < total_size * 0.95:
-                    try:
-                        os.remove(self.path)
-                    except:
-                        pass
-                    self.finished.emit(self.dlc_id, False, "File incomplete")
-                else:
-                    self.finished.emit(self.dlc_id, True, "Downloaded successfully")
-                    
-        except Exception as e:
-            self.finished.emit(self.dlc_id, False, str(e))
-
-
-class DownloadManager:
-    def __init__(self, max_workers=2, logger=None):
-        self.max_workers = max_workers
-        self.logger = logger
-        self.download_queue = []
-        self.active_downloads = []
-        self.paused = False
-        
-    def add_to_queue(self, dlc_id, url, path, callback):
-        self.download_queue.append({
-            'id': dlc_id,
-            'url': url,
-            'path': path,
-            'callback': callback
-        })
-        self.process_queue()
-        
-    def process_queue(self):
-        while (len(self.active_downloads) < self.max_workers and 
-               self.download_queue and not self.paused):
-            item = self.download_queue.pop(0)
-            self.start_download(item)
-            
-    def start_download(self, item):
-        thread = DownloadThread(
-            item['id'], item['url'], item['path'], self.logger
-        )
-        thread.finished.connect(lambda success, msg, dlc=item['id']: 
-                               self.download_finished(item, success, msg))
-        thread.start()
-        self.active_downloads.append(thread)
-        
-    def download_finished(self, item, success, message):
-        # Удаляем завершенный поток
-        for thread in self.active_downloads:
-            if not thread.isRunning():
-                self.active_downloads.remove(thread)
-                break
-                
-        item['callback'](item['id'], success, message)
-        self.process_queue()
-        
-    def pause_all(self):
-        self.paused = True
-        for thread in self.active_downloads:
-            if hasattr(thread, 'stop'):
-                thread.stop()
-        
-    def resume_all(self):
-        self.paused = False
-        self.process_queue()
-        
-    def cancel_all(self):
-        self.pause_all()
-        for thread in self.active_downloads:
-            if thread.isRunning():
-                thread.terminate()
-        self.active_downloads.clear()
-        self.download_queue.clear()
-
-
-# 3. Rollback система
-class RollbackManager:
-    def __init__(self, game_path, logger):
-        self.game_path = Path(game_path)
-        self.logger = logger
-        self.backup_dir = self.game_path / "_linua_backup"
-        self.rollback_log = []
-        
-    def create_backup(self, dlc_id):
-        """Создать бэкап перед установкой"""
-        dlc_path = self.game_path / dlc_id
-        if dlc_path.exists() and dlc_path.is_dir():
-            backup_path = self.backup_dir / dlc_id
-            self.backup_dir.mkdir(exist_ok=True)
-            
-            if backup_path.exists():
-                shutil.rmtree(backup_path, ignore_errors=True)
-                
-            try:
-                shutil.copytree(dlc_path, backup_path)
-                self.rollback_log.append({
-                    'action': 'backup',
-                    'dlc': dlc_id,
-                    'path': str(backup_path)
-                })
-                self.logger.log(f"[BACKUP] Created backup for {dlc_id}")
-            except Exception as e:
-                self.logger.log(f"[BACKUP] Failed to backup {dlc_id}: {e}")
-            
-    def rollback(self, dlc_id):
-        """Откатить установку DLC"""
-        dlc_path = self.game_path / dlc_id
-        backup_path = self.backup_dir / dlc_id
-        
-        # Удаляем текущий DLC
-        if dlc_path.exists():
-            try:
-                shutil.rmtree(dlc_path, ignore_errors=True)
-            except Exception as e:
-                self.logger.log(f"[ROLLBACK] Failed to remove {dlc_id}: {e}")
-            
-        # Восстанавливаем из бэкапа
-        if backup_path.exists() and backup_path.is_dir():
-            try:
-                shutil.move(str(backup_path), str(dlc_path))
-                self.logger.log(f"[ROLLBACK] {dlc_id} restored from backup")
-            except Exception as e:
-                self.logger.log(f"[ROLLBACK] Failed to restore {dlc_id}: {e}")
-            
-    def cleanup(self):
-        """Очистить бэкапы после успешной установки"""
-        if self.backup_dir.exists():
-            try:
-                shutil.rmtree(self.backup_dir, ignore_errors=True)
-                self.logger.log("[BACKUP] Cleaned up backup files")
-            except Exception as e:
-                self.logger.log(f"[BACKUP] Failed to cleanup: {e}")
-
-
-# 4. Улучшенная проверка DLC (ПРАВИЛЬНАЯ ДЛЯ SIMS 4)
-class DLCValidator:
-    @staticmethod
-    def is_dlc_valid(dlc_path):
-        """Проверка DLC The Sims 4 - правильная структура"""
-        path = Path(dlc_path)
-        
-        # 1. Папка существует
-        if not path.exists():
-            return False, "Path doesn't exist"
-            
-        # 2. Не пустая
-        if not any(path.iterdir()):
-            return False, "Empty DLC folder"
-            
-        # 3. Sims 4 DLC имеет специфическую структуру:
-        #    - Папки: _locdata_, _installer, Geometry, etc.
-        #    - Файлы: *.package, *.bnk, *.trayitem и т.д.
-        
-        # Ищем характерные для Sims 4 DLC файлы и папки
-        sims4_dlc_markers = {
-            "folders": [
-                "_locdata_", "_installer", "Geometry", 
-                "Thumbnails", "UI", "Audio", "Movies"
-            ],
-            "files": [
-                "*.package", "*.bnk", "*.trayitem",
-                "*.sgi", "*.dll", "*.ts4script"
-            ]
-        }
-        
-        # Проверяем папки
-        found_folders = []
-        for folder in sims4_dlc_markers["folders"]:
-            if (path / folder).exists():
-                found_folders.append(folder)
-                
-        # Проверяем файлы
-        found_files = []
-        for pattern in sims4_dlc_markers["files"]:
-            if list(path.rglob(pattern)):
-                found_files.append(pattern.replace("*", ""))
-                
-        # Для DLC Sims 4 достаточно найти либо характерные папки, либо файлы
-        if found_folders or found_files:
-            # Это похоже на валидный DLC Sims 4
-            markers = []
-            if found_folders:
-                markers.append(f"folders: {', '.join(found_folders[:3])}")
-            if found_files:
-                markers.append(f"files: {', '.join(found_files[:3])}")
-                
-            return True, f"Valid Sims 4 DLC ({'; '.join(markers)})"
-            
-        # Если нет характерных маркеров, проверим есть ли package файлы
-        package_files = list(path.rglob("*.package"))
-        if package_files:
-            return True, f"Valid DLC ({len(package_files)} package files)"
-            
-        # Если ничего не найдено - возможно не DLC
-        return False, "No Sims 4 DLC markers found"
-        
-    @staticmethod
-    def get_dlc_size(dlc_path):
-        """Получить размер DLC"""
-        total = 0
-        for file in Path(dlc_path).rglob('*'):
-            if file.is_file():
-                try:
-                    total += file.stat().st_size
-                except:
-                    pass
-        return total / (1024*1024*1024)  # в GB
-
-
-# 5. Улучшенная проверка игры (ОБНОВЛЕННЫЙ)
-class GameValidator:
-    # ТОЛЬКО ОБЯЗАТЕЛЬНЫЕ ФАЙЛЫ
-    ESSENTIAL_FILES = [
-        "Game/Bin/TS4_x64.exe",  # Основной исполняемый файл
-        "Data/Client/ClientDeltaBuild0.package",  # Обязательный файл данных
-        "Data/Client/ClientFullBuild0.package"   # Обязательный файл данных
-    ]
-    
-    # ОПЦИОНАЛЬНЫЕ ФАЙЛЫ (32-битные версии не обязательны)
-    OPTIONAL_FILES = [
-        "Game/Bin/TS4.exe",      # 32-битная версия (не обязательна)
-        "Game/Bin/TS4_x86.exe",  # Старая версия (не обязательна)
-    ]
-    
-    ESSENTIAL_FOLDERS = [
-        "Game",
-        "Data", 
-        "Delta",           # Delta может отсутствовать в некоторых установках
-        "Game/Bin",
-        "Data/Client"
-    ]
-    
-    @staticmethod
-    def validate_game_path(path, logger=None):
-        """Проверка игры - без ложных предупреждений о размере"""
-        game_path = Path(path)
-        issues = []
-        
-        if not game_path.exists():
-            return False, ["Game folder doesn't exist"]
-            
-        # 1. ОБЯЗАТЕЛЬНО: TS4_x64.exe
-        ts4_exe = game_path / "Game/Bin/TS4_x64.exe"
-        if not ts4_exe.exists():
-            issues.append("TS4_x64.exe missing - game cannot run")
-        else:
-            # ТОЛЬКО логируем размер, не проверяем
-            try:
-                size_mb = ts4_exe.stat().st_size / (1024 * 1024)
-                if logger:
-                    logger.log(f"[VALIDATE] TS4_x64.exe: {size_mb:.1f} MB")
-            except:
-                pass
-                
-        # 2. ОБЯЗАТЕЛЬНО: Основные папки
-        required_folders = ["Game", "Data", "Game/Bin"]
-        for folder in required_folders:
-            if not (game_path / folder).exists():
-                issues.append(f"Missing folder: {folder}")
-                
-        # 3. Проверка на Sims 4
-        sims4_markers = [
-            "Data/Client/ClientDeltaBuild0.package",
-            "Data/Client/ClientFullBuild0.package",
-            "Data/Simulation/FullBuild0.package"
-        ]
-        
-        found_markers = sum(1 for marker in sims4_markers if (game_path / marker).exists())
-        if found_markers < 1:
-            issues.append("Doesn't appear to be a Sims 4 folder")
-                
-        return len(issues) == 0, issues
-
-
-# 6. Внешняя DLC Database
-class ExternalDatabase:
-    DB_URL = "https://raw.githubusercontent.com/l1ntol/Linua-Updater/main/dlc_database.json"
-    CACHE_TIME = 3600  # 1 час
-    
-    def __init__(self, logger):
-        self.logger = logger
-        self.cache_file = Path.home() / "AppData" / "Local" / "LinuaUpdater" / "dlc_cache.json"
-        self.local_db = DLCDatabase().all()  # Используем локальную базу как fallback
-        
-    def fetch_remote_database(self, force=False):
-        """Пытаться загрузить с GitHub, но использовать локальную если нет"""
-        try:
-            # Проверить кэш (опционально)
-            if not force and self.cache_file.exists():
-                try:
-                    cache_age = time.time() - self.cache_file.stat().st_mtime
-                    if cache_age < self.CACHE_TIME:
-                        with open(self.cache_file, 'r', encoding='utf-8') as f:
-                            cached_db = json.load(f)
-                            self.logger.log("[DB] Using cached database")
-                            return cached_db
-                except:
-                    pass
-                        
-            # Пытаться загрузить с GitHub
-            self.logger.log("[DB] Trying to fetch database from GitHub...")
-            response = requests.get(self.DB_URL, timeout=5, verify=False)
-            if response.status_code == 200:
-                db_data = response.json()
-                
-                # Сохранить в кэш
-                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
-                with open(self.cache_file, 'w', encoding='utf-8') as f:
-                    json.dump(db_data, f, indent=2)
-                    
-                self.logger.log("[DB] Database updated from GitHub successfully")
-                return db_data
-                
-        except Exception as e:
-            self.logger.log(f"[DB] GitHub fetch failed: {e}. Using local database.")
-            
-        # Всегда возвращаем локальную базу как fallback
-        return self.local_db
-        
-    def get_database(self, force_refresh=False):
-        """Получить актуальную базу данных"""
-        try:
-            return self.fetch_remote_database(force_refresh)
-        except:
-            return self.local_db
-
-
-# 7. Расширенный Repair-режим
-class AdvancedRepair:
-    def __init__(self, game_path, logger):
-        self.game_path = Path(game_path)
-        self.logger = logger
-        
-    def run_full_repair(self):
-        """Полный ремонт игры - правильная проверка DLC"""
-        results = {
-            "checks": [],
-            "fixed": [],
-            "errors": [],
-            "warnings": []
-        }
-        
-        # 1. Проверка структуры игры
-        results["checks"].append("Checking game structure...")
-        structure_ok, issues = GameValidator.validate_game_path(self.game_path)
-        if not structure_ok:
-            results["errors"].extend(issues)
-            
-        # 2. Проверка DLC Sims 4 (ПРАВИЛЬНАЯ)
-        results["checks"].append("Checking DLC folders...")
-        dlc_folders = [f for f in self.game_path.iterdir() 
-                      if f.is_dir() and f.name.upper().startswith(("EP", "GP", "SP", "FP"))]
-        
-        valid_dlc_count = 0
-        total_dlc_size = 0
-        
-        for dlc in dlc_folders:
-            valid, reason = DLCValidator.is_dlc_valid(dlc)
-            if valid:
-                valid_dlc_count += 1
-                size_gb = DLCValidator.get_dlc_size(dlc)
-                total_dlc_size += size_gb
-                self.logger.log(f"[OK] {dlc.name} - {reason}")
-            else:
-                # Проверим если это может быть другим типом контента
-                content_files = list(dlc.rglob("*"))
-                if content_files:
-                    # Есть файлы, но не похоже на стандартный DLC
-                    results["warnings"].append(f"{dlc.name}: Non-standard content ({len(content_files)} files)")
-                else:
-                    # Пустая папка - удалить?
-                    results["warnings"].append(f"{dlc.name}: Empty folder")
-                
-        results["checks"].append(f"Found {valid_dlc_count}/{len(dlc_folders)} valid DLC ({total_dlc_size:.1f} GB total)")
-        
-        # 3. Проверка TS4_x64.exe
-        exe_path = self.game_path / "Game/Bin/TS4_x64.exe"
-        if exe_path.exists():
-            try:
-                size_mb = exe_path.stat().st_size / (1024 * 1024)
-                results["checks"].append(f"TS4_x64.exe: {size_mb:.1f} MB")
-                
-                # Диапазон размеров для разных версий Sims 4
-                if size_mb > 30 and size_mb < 200:
-                    results["fixed"].append(f"Game executable OK ({size_mb:.1f} MB)")
-                elif size_mb < 30:
-                    results["warnings"].append(f"TS4_x64.exe small ({size_mb:.1f} MB)")
-                else:
-                    results["warnings"].append(f"TS4_x64.exe large ({size_mb:.1f} MB)")
-            except:
-                results["checks"].append("TS4_x64.exe: Unable to get size")
-        else:
-            results["errors"].append("TS4_x64.exe missing")
-                
-        # 4. Очистка временных файлов
-        results["checks"].append("Cleaning temp files...")
-        cleaned = self.clean_temp_files()
-        if cleaned:
-            results["fixed"].append(f"Cleaned {cleaned} temp files")
-            
-        # 5. Проверка прав
-        results["checks"].append("Checking permissions...")
-        if not self.check_permissions():
-            results["warnings"].append("Insufficient write permissions")
-            
-        # 6. Сводка
-        if not results["errors"]:
-            results["fixed"].append("No critical errors found")
-            
-        report = self.generate_report(results)
-        return results, report
-        
-        
-    def clean_temp_files(self):
-        """Очистка временных файлов"""
-        patterns = [
-            "*.tmp", "*.temp", "Thumbs.db", "desktop.ini",
-            "_linua_*", "*.part", "*.crdownload"
-        ]
-        
-        cleaned = 0
-        for pattern in patterns:
-            for file in self.game_path.rglob(pattern):
-                try:
-                    if file.is_file():
-                        file.unlink()
-                        cleaned += 1
-                except:
-                    pass
-        return cleaned
-                    
-    def check_permissions(self):
-        """Проверка прав на запись"""
-        test_file = self.game_path / ".permission_test"
-        try:
-            test_file.touch()
-            test_file.unlink()
-            return True
-        except:
-            return False
-            
-    def generate_report(self, results):
-        """Создать отчет о ремонте"""
-        report_lines = [
-            "=== Linua Updater Repair Report ===",
-            f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            f"Game path: {self.game_path}",
-            ""
-        ]
-        
-        if results["checks"]:
-            report_lines.append("Checks performed:")
-            for check in results["checks"]:
-                report_lines.append(f"  • {check}")
-                
-        if results["fixed"]:
-            report_lines.append("\nIssues fixed:")
-            for fix in results["fixed"]:
-                report_lines.append(f"  ✓ {fix}")
-                
-        if results["warnings"]:
-            report_lines.append("\nWarnings:")
-            for warning in results["warnings"]:
-                report_lines.append(f"  ⚠ {warning}")
-                
-        if results["errors"]:
-            report_lines.append("\nCritical errors:")
-            for error in results["errors"]:
-                report_lines.append(f"  ✗ {error}")
-                
-        return "\n".join(report_lines)
-
-
-# 8. Offline-режим
-class OfflineMode:
-    def __init__(self, config, logger):
-        self.config = config
-        self.logger = logger
-        self.is_offline = False
-        
-    def check_connection(self):
-        """Проверить подключение"""
-        try:
-            socket.create_connection(("8.8.8.8", 53), timeout=2)
-            socket.create_connection(("github.com", 443), timeout=2)
-            self.is_offline = False
-            return True
-        except:
-            self.is_offline = True
-            self.enable_offline_mode()
-            return False
-            
-    def enable_offline_mode(self):
-        """Включить оффлайн-режим"""
-        self.logger.log("[OFFLINE] Running in offline mode")
-        
-    def get_available_features(self):
-        """Получить доступные функции в оффлайн-режиме"""
-        if self.is_offline:
-            return {
-                "repair": True,
-                "validate": True,
-                "check_installed": True,
-                "cleanup": True,
-                "update": False,
-                "download": False,
-                "auto_update": False
-            }
-        return {
-            "repair": True,
-            "validate": True,
-            "check_installed": True,
-            "cleanup": True,
-            "update": True,
-            "download": True,
-            "auto_update": True
-        }
-
-
-# ================================================================
-#                         DLC DATABASE
-# ================================================================
-class DLCDatabase:
-    def __init__(self):
-        # База данных из старого кода (103 DLC)
-        self.dlc = {
-            "EP01": {"name": "Get to Work", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP01/Sims4_DLC_EP01_Get_to_Work.zip"},
-            "EP02": {"name": "Get Together", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP02/Sims4_DLC_EP02_Get_Together.zip"},
-            "EP04": {"name": "Cats and Dogs", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP04/Sims4_DLC_EP04_Cats_and_Dogs.zip"},
-            "EP05": {"name": "Seasons", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP05/Sims4_DLC_EP05_Seasons.zip"},
-            "EP07": {"name": "Island Living", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP07/Sims4_DLC_EP07_Island_Living.zip"},
-            "EP08": {"name": "Discover University", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP08/Sims4_DLC_EP08_Discover_University.zip"},
-            "EP09": {"name": "Eco Lifestyle", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP09/Sims4_DLC_EP09_Eco_Lifestyle.zip"},
-            "EP10": {"name": "Snowy Escape", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP10/Sims4_DLC_EP10_Snowy_Escape.zip"},
-            "EP11": {"name": "Cottage Living", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP11/Sims4_DLC_EP11_Cottage_Living.zip"},
-            "EP12": {"name": "High School Years", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP12/Sims4_DLC_EP12_High_School_Years.zip"},
-            "EP13": {"name": "Growing Together", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP13/Sims4_DLC_EP13_Growing_Together.zip"},
-            "EP14": {"name": "Horse Ranch", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP14/Sims4_DLC_EP14_Horse_Ranch.zip"},
-            "EP15": {"name": "For Rent", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP15/Sims4_DLC_EP15_For_Rent.zip"},
-            "EP16": {"name": "Lovestruck", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP16/Sims4_DLC_EP16_Lovestruck.zip"},
-            "EP17": {"name": "Life and Death", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP17/Sims4_DLC_EP17_Life_and_Death.zip"},
-            "EP18": {"name": "Businesses and Hobbies", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP18/Sims4_DLC_EP18_Businesses_and_Hobbies.zip"},
-            "EP19": {"name": "Enchanted by Nature", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP19/Sims4_DLC_EP19_Enchanted_by_Nature_Expansion_Pack.zip"},
-            "EP20": {"name": "Adventure Awaits", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP20/Sims4_DLC_EP20_Adventure_Awaits_Expansion_Pack.zip"},
-            "GP01": {"name": "Outdoor Retreat", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP01/Sims4_DLC_GP01_Outdoor_Retreat.zip"},
-            "GP02": {"name": "Spa Day", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP02/Sims4_DLC_GP02_Spa_Day.zip"},
-            "GP03": {"name": "Dine Out", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP03/Sims4_DLC_GP03_Dine_Out.zip"},
-            "GP04": {"name": "Vampires", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP04/Sims4_DLC_GP04_Vampires.zip"},
-            "GP05": {"name": "Parenthood", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP05/Sims4_DLC_GP05_Parenthood.zip"},
-            "GP06": {"name": "Jungle Adventure", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP06/Sims4_DLC_GP06_Jungle_Adventure.zip"},
-            "GP07": {"name": "StrangerVille", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP07/Sims4_DLC_GP07_StrangerVille.zip"},
-            "GP08": {"name": "Realm of Magic", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP08/Sims4_DLC_GP08_Realm_of_Magic.zip"},
-            "GP09": {"name": "Star Wars: Journey to Batuu", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP09/Sims4_DLC_GP09_Star_Wars_Journey_to_Batuu.zip"},
-            "GP10": {"name": "Dream Home Decorator", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP10/Sims4_DLC_GP10_Dream_Home_Decorator.zip"},
-            "GP11": {"name": "My Wedding Stories", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP11/Sims4_DLC_GP11_My_Wedding_Stories.zip"},
-            "GP12": {"name": "Werewolves", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP12/Sims4_DLC_GP12_Werewolves.zip"},
-            "SP01": {"name": "Luxury Party Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP01/Sims4_DLC_SP01_Luxury_Party_Stuff.zip"},
-            "SP02": {"name": "Perfect Patio Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP02/Sims4_DLC_SP02_Perfect_Patio_Stuff.zip"},
-            "SP03": {"name": "Cool Kitchen Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP03/Sims4_DLC_SP03_Cool_Kitchen_Stuff.zip"},
-            "SP04": {"name": "Spooky Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP04/Sims4_DLC_SP04_Spooky_Stuff.zip"},
-            "SP05": {"name": "Movie Hangout Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP05/Sims4_DLC_SP05_Movie_Hangout_Stuff.zip"},
-            "SP06": {"name": "Romantic Garden Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP06/Sims4_DLC_SP06_Romantic_Garden_Stuff.zip"},
-            "SP07": {"name": "Kids Room Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP07/Sims4_DLC_SP07_Kids_Room_Stuff.zip"},
-            "SP08": {"name": "Backyard Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP08/Sims4_DLC_SP08_Backyard_Stuff.zip"},
-            "SP09": {"name": "Vintage Glamour Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP09/Sims4_DLC_SP09_Vintage_Glamour_Stuff.zip"},
-            "SP10": {"name": "Bowling Night Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP10/Sims4_DLC_SP10_Bowling_Night_Stuff.zip"},
-            "SP11": {"name": "Fitness Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP11/Sims4_DLC_SP11_Fitness_Stuff.zip"},
-            "SP12": {"name": "Toddler Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP12/Sims4_DLC_SP12_Toddler_Stuff.zip"},
-            "SP13": {"name": "Laundry Day Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP13/Sims4_DLC_SP13_Laundry_Day_Stuff.zip"},
-            "SP14": {"name": "My First Pet Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP14/Sims4_DLC_SP14_My_First_Pet_Stuff.zip"},
-            "SP15": {"name": "Moschino Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP15/Sims4_DLC_SP15_Moschino_Stuff.zip"},
-            "SP16": {"name": "Tiny Living Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP16/Sims4_DLC_SP16_Tiny_Living_Stuff_Pack.zip"},
-            "SP17": {"name": "Nifty Knitting", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP17/Sims4_DLC_SP17_Nifty_Knitting.zip"},
-            "SP18": {"name": "Paranormal Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP18/Sims4_DLC_SP18_Paranormal_Stuff_Pack.zip"},
-            "SP20": {"name": "Throwback Fit Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP20/Sims4_DLC_SP20_Throwback_Fit_Kit.zip"},
-            "SP21": {"name": "Country Kitchen Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP21/Sims4_DLC_SP21_Country_Kitchen_Kit.zip"},
-            "SP22": {"name": "Bust the Dust Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP22/Sims4_DLC_SP22_Bust_the_Dust_Kit.zip"},
-            "SP23": {"name": "Courtyard Oasis Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP23/Sims4_DLC_SP23_Courtyard_Oasis_Kit.zip"},
-            "SP24": {"name": "Fashion Street Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP24/Sims4_DLC_SP24_Fashion_Street_Kit.zip"},
-            "SP25": {"name": "Industrial Loft Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP25/Sims4_DLC_SP25_Industrial_Loft_Kit.zip"},
-            "SP26": {"name": "Incheon Arrivals Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP26/Sims4_DLC_SP26_Incheon_Arrivals_Kit.zip"},
-            "SP28": {"name": "Modern Menswear Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP28/Sims4_DLC_SP28_Modern_Menswear_Kit.zip"},
-            "SP29": {"name": "Blooming Rooms Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP29/Sims4_DLC_SP29_Blooming_Rooms_Kit.zip"},
-            "SP30": {"name": "Carnaval Streetwear Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP30/Sims4_DLC_SP30_Carnaval_Streetwear_Kit.zip"},
-            "SP31": {"name": "Decor to the Max Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP31/Sims4_DLC_SP31_Decor_to_the_Max_Kit.zip"},
-            "SP32": {"name": "Moonlight Chic Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP32/Sims4_DLC_SP32_Moonlight_Chic_Kit.zip"},
-            "SP33": {"name": "Little Campers Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP33/Sims4_DLC_SP33_Little_Campers_Kit.zip"},
-            "SP34": {"name": "First Fits Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP34/Sims4_DLC_SP34_First_Fits_Kit.zip"},
-            "SP35": {"name": "Desert Luxe Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP35/Sims4_DLC_SP35_Desert_Luxe_Kit.zip"},
-            "SP36": {"name": "Pastel Pop Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP36/Sims4_DLC_SP36_Pastel_Pop_Kit.zip"},
-            "SP37": {"name": "Everyday Clutter Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP37/Sims4_DLC_SP37_Everyday_Clutter_Kit.zip"},
-            "SP38": {"name": "Simtimates Collection Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP38/Sims4_DLC_SP38_Simtimates_Collection_Kit.zip"},
-            "SP39": {"name": "Bathroom Clutter Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP39/Sims4_DLC_SP39_Bathroom_Clutter_Kit.zip"},
-            "SP40": {"name": "Greenhouse Haven Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP40/Sims4_DLC_SP40_Greenhouse_Haven_Kit.zip"},
-            "SP41": {"name": "Basement Treasures Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP41/Sims4_DLC_SP41_Basement_Treasures_Kit.zip"},
-            "SP42": {"name": "Grunge Revival Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP42/Sims4_DLC_SP42_Grunge_Revival_Kit.zip"},
-            "SP43": {"name": "Book Nook Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP43/Sims4_DLC_SP43_Book_Nook_Kit.zip"},
-            "SP44": {"name": "Poolside Splash Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP44/Sims4_DLC_SP44_Poolside_Splash_Kit.zip"},
-            "SP45": {"name": "Modern Luxe Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP45/Sims4_DLC_SP45_Modern_Luxe_Kit.zip"},
-            "SP46": {"name": "Home Chef Hustle Stuff Pack", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP46/Sims4_DLC_SP46_Home_Chef_Hustle_Stuff_Pack.zip"},
-            "SP47": {"name": "Castle Estate Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP47/Sims4_DLC_SP47_Castle_Estate_Kit.zip"},
-            "SP48": {"name": "Goth Galore Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP48/Sims4_DLC_SP48_Goth_Galore_Kit.zip"},
-            "SP49": {"name": "Crystal Creations Stuff Pack", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP49/Sims4_DLC_SP49_Crystal_Creations_Stuff_Pack.zip"},
-            "SP50": {"name": "Urban Homage Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP50/Sims4_DLC_SP50_Urban_Homage_Kit.zip"},
-            "SP51": {"name": "Party Essentials Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP51/Sims4_DLC_SP51_Party_Essentials_Kit.zip"},
-            "SP52": {"name": "Riviera Retreat Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP52/Sims4_DLC_SP52_Riviera_Retreat_Kit.zip"},
-            "SP53": {"name": "Cozy Bistro Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP53/Sims4_DLC_SP53_Cozy_Bistro_Kit.zip"},
-            "SP54": {"name": "Artist Studio Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP54/Sims4_DLC_SP54_Artist_Studio_Kit.zip"},
-            "SP55": {"name": "Storybook Nursery Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP55/Sims4_DLC_SP55_Storybook_Nursery_Kit.zip"},
-            "SP56": {"name": "Sweet Slumber Party Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP56/Sims4_DLC_SP56_Sweet_Slumber_Party_Kit.zip"},
-            "SP57": {"name": "Cozy Kitsch Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP57/Sims4_DLC_SP57_Cozy_Kitsch_Kit.zip"},
-            "SP58": {"name": "Comfy Gamer Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP58/Sims4_DLC_SP58_Comfy_Gamer_Kit.zip"},
-            "SP59": {"name": "Secret Sanctuary Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP59/Sims4_DLC_SP59_Secret_Sanctuary_Kit.zip"},
-            "SP60": {"name": "Casanova Cave Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP60/Sims4_DLC_SP60_Casanova_Cave_Kit.zip"},
-            "SP61": {"name": "Refined Living Room Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP61/Sims4_DLC_SP61_Refined_Living_Room_Kit.zip"},
-            "SP62": {"name": "Business Chic Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP62/Sims4_DLC_SP62_Business_Chic_Kit.zip"},
-            "SP63": {"name": "Sleek Bathroom Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP63/Sims4_DLC_SP63_Sleek_Bathroom_Kit.zip"},
-            "SP64": {"name": "Sweet Allure Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP64/Sims4_DLC_SP64_Sweet_Allure_Kit.zip"},
-            "SP65": {"name": "Restoration Workshop Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP65/Sims4_DLC_SP65_Restoration_Workshop_Kit.zip"},
-            "SP66": {"name": "Golden Years Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP66/Sims4_DLC_SP66_Golden_Years_Kit.zip"},
-            "SP67": {"name": "Kitchen Clutter Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP67/Sims4_DLC_SP67_Kitchen_Clutter_Kit.zip"},
-            "SP69": {"name": "Autumn Apparel Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP69/Sims4_DLC_SP69_Autumn_Apparel_Kit.zip"},
-            "SP71": {"name": "Grange Mudroom Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP71/Sims4_DLC_SP71_Grange_Mudroom_Kit.zip"},
-            "SP72": {"name": "Essential Glam Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP72/Sims4_DLC_SP72_Essential_Glam_Kit.zip"},
-            "SP73": {"name": "Modern Retreat Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP73/Sims4_DLC_SP73_Modern_Retreat_Kit.zip"},
-            "SP74": {"name": "Garden to Table Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP74/Sims4_DLC_SP74_Garden_to_Table_Kit.zip"},
-            "SP70": {"name": "Spongebob Kid's Room Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP70/SP70.zip"},
-            "SP68": {"name": "Spongebob's House Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP68/SP68.zip"},
-            "SP81": {"name": "Prairie Dreams Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP81/SP81.zip"},
-            "FP01": {"name": "Holiday Celebration Pack", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/FP01/Sims4_DLC_FP01_Holiday_Celebration_Pack.zip"},
-        }
-
-    def all(self):
-        return self.dlc
-
-
 # ================================================================
 #                     SELECT DLC DIALOG - из старого кода
 # ================================================================
@@ -1521,7 +357,7 @@ class DLCSelector(QDialog):
 
         layout = QVBoxLayout(self)
 
-        self.info = QLabel("Select DLC you want to install.\nAlready installed DLC are hidden.")
+        self.info = QLabel("Select DLC you want to install.\nAlready installed DLC are hidden unless you choose to update them.")
         self.info.setWordWrap(True)
         self.info.setStyleSheet("color: white; padding: 10px; background-color: #2a2a2a; border-radius: 4px;")
         layout.addWidget(self.info)
@@ -1531,6 +367,12 @@ class DLCSelector(QDialog):
         self.check_all.checkStateChanged.connect(self.toggle_all)
         layout.addWidget(self.check_all)
 
+        # Установленные DLC можно выбрать для дельта-обновления
+        self.show_installed = QCheckBox("Show installed DLC (update changed files)")
+        self.show_installed.setStyleSheet("color: white; padding: 0 10px 10px 10px;")
+        self.show_installed.checkStateChanged.connect(lambda _: self.populate(self.db, self.installed))
+        layout.addWidget(self.show_installed)
+
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll.setStyleSheet("background-color: #2a2a2a; border: none;")
@@ -1552,6 +394,8 @@ class DLCSelector(QDialog):
         layout.addLayout(bottom)
 
         self.cbs = {}
+        self.db = {}
+        self.installed = set()
 
     def apply_dark_theme(self):
         css = """
@@ -1612,6 +456,10 @@ class DLCSelector(QDialog):
             cb.setChecked(val)
 
     def populate(self, db, installed):
+        self.db = db
+        self.installed = installed
+        updates = self.show_installed.isChecked()
+
         # clear
         for i in reversed(range(self.layout_c.count())):
             item = self.layout_c.itemAt(i)
@@ -1620,14 +468,14 @@ class DLCSelector(QDialog):
 
         self.cbs.clear()
 
-        # Проверяем, есть ли доступные DLC для установки
-        available_dlc = []
-        for dlc_id, info in db.items():
-            if dlc_id.upper() not in installed:
-                available_dlc.append((dlc_id, info))
+        # Группы и порядок внутри них уже посчитаны каталогом
+        categories = {
+            cat: [dlc_id for dlc_id in ids if updates or dlc_id not in installed]
+            for cat, ids in db.categories().items()
+        }
 
         # Если все DLC уже установлены
-        if not available_dlc:
+        if not any(categories.values()):
             no_dlc_label = QLabel("All DLC are already installed.")
             no_dlc_label.setStyleSheet("color: white; padding: 20px; text-align: center; font-size: 12px;")
             no_dlc_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -1637,23 +485,6 @@ class DLCSelector(QDialog):
 
         # Если есть доступные DLC, показываем их как обычно
         self.check_all.setVisible(True)
-        
-        categories = {
-            "Expansion Packs": [],
-            "Game Packs": [],
-            "Stuff Packs": [],
-            "Free Packs": []
-        }
-
-        for dlc_id, info in available_dlc:
-            if dlc_id.startswith("EP"):
-                categories["Expansion Packs"].append((dlc_id, info))
-            elif dlc_id.startswith("GP"):
-                categories["Game Packs"].append((dlc_id, info))
-            elif dlc_id.startswith("FP"):
-                categories["Free Packs"].append((dlc_id, info))
-            else:
-                categories["Stuff Packs"].append((dlc_id, info))
 
         # add items
         for cat, items in categories.items():
@@ -1664,8 +495,11 @@ class DLCSelector(QDialog):
             header.setStyleSheet("font-weight: bold; margin-top: 10px; color: #0078d7; font-size: 12px;")
             self.layout_c.addWidget(header)
 
-            for dlc_id, info in sorted(items):
-                cb = QCheckBox(f"[{dlc_id}] {info['name']}")
+            for dlc_id in items:
+                label = f"[{dlc_id}] {db[dlc_id]['name']}"
+                if dlc_id in installed:
+                    label += "  (installed - update)"
+                cb = QCheckBox(label)
                 cb.setStyleSheet("color: white; font-size: 11px;")
                 self.layout_c.addWidget(cb)
                 self.cbs[dlc_id] = cb
@@ -1684,6 +518,12 @@ class LinuaUI(QMainWindow):
         self.config = config
         self.db = db
 
+        # Общий HTTP-пул для всех загрузок (размер и повторы настраиваются в config)
+        HttpTransport.configure(
+            pool_per_host=int(config.get("http_pool_per_host", HttpTransport.POOL_PER_HOST)),
+            retries=int(config.get("http_retries", HttpTransport.RETRIES)),
+        )
+
         self.setWindowTitle(f"Linua Updater v{APP_VERSION}")
         self.setFixedSize(620, 520)
 
@@ -1691,38 +531,77 @@ class LinuaUI(QMainWindow):
         self.setup_ui()
         self.apply_dark_theme()
 
-        self.logger = Logger(self.log_text)
+        self.logger = Logger(ui=True)
+        self.log_view = LogView(self.logger, self.log_text)
         
         # ===== ИНИЦИАЛИЗАЦИЯ СИСТЕМ =====
         self.thread_manager = ThreadManager()
-        self.controller = AppController(self.logger, self.thread_manager)
-        self.download_manager = DownloadManager(max_workers=2, logger=self.logger)
-        self.rollback_manager = None
+        self.controller = AppController(
+            self.logger, self.thread_manager, cache=self.open_cache(),
+            temp_dir=self.config.get(StagingManager.CONFIG_KEY, "")
+        )
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(500)
+        self.progress_timer.timeout.connect(self.update_download_progress)
         self.offline_mode = OfflineMode(config, self.logger)
         self.external_db = ExternalDatabase(self.logger)
+        # До синхронизации работаем с последней скачанной базой (чтение с диска, без сети)
+        self.db.replace(self.external_db.cached_database())
+        self.db_thread = None
+        self.plan_thread = None
         # Убрали AutoUpdater - больше не проверяем обновления
         # ====================================
 
         self.active_threads = []
         self.progress_total = 0
         self.progress_done = 0
+        self.installing = False
+        self.indexes = {}
+        self.index_thread = None
+        self.full_repair = None
         
         # Load saved path
         saved = self.config.get("game_path", "")
         if saved:
             self.path_input.setText(saved)
             self.logger.log(f"[GAME] Path loaded from config: {saved}")
+            self.refresh_index(saved)
+        self.path_input.editingFinished.connect(lambda: self.refresh_index(self.path_input.text().strip()))
 
-        # Проверка соединения
-        if not self.offline_mode.check_connection():
-            self.logger.log("[OFFLINE] Internet not detected. Some features disabled.")
-        else:
-            self.logger.log("[ONLINE] Internet connection OK.")
-            # Убрали автоматическую проверку обновлений
+        # Проверка соединения - в фоне, после первой отрисовки окна
+        QTimer.singleShot(0, self.check_connection)
 
         # Auto detect game
         QTimer.singleShot(200, self.auto_detect)
 
+    def check_connection(self):
+        self.connection_thread = ConnectionCheckThread()
+        self.connection_thread.done.connect(self.connection_checked)
+        self.thread_manager.add_thread(self.connection_thread)
+        self.connection_thread.start()
+
+    @pyqtSlot(bool)
+    def connection_checked(self, online):
+        if not self.offline_mode.apply(online):
+            self.logger.log("[OFFLINE] Internet not detected. Some features disabled.")
+        else:
+            self.logger.log("[ONLINE] Internet connection OK.")
+            self.db_thread = DatabaseSyncThread(self.external_db)
+            self.db_thread.done.connect(self.database_synced)
+            self.thread_manager.add_thread(self.db_thread)
+            self.db_thread.start()
+
+    @pyqtSlot(object)
+    def database_synced(self, dlc):
+        """Подмена базы новой версией - уже открытые списки используют старую до переоткрытия"""
+        if dlc != self.db.all():
+            self.db.replace(dlc)
+            self.logger.log(f"[DB] Using updated database ({len(dlc)} DLC)")
+
+    def open_cache(self):
+        """Кэш архивов из настроек (cache_dir пустой - кэш выключен)"""
+        return ArchiveCache.from_config(self.config, self.logger)
+
     def setup_ui(self):
         central = QWidget()
         self.setCentralWidget(central)
@@ -1838,6 +717,7 @@ class LinuaUI(QMainWindow):
         if folder:
             self.path_input.setText(folder)
             self.config.set("game_path", folder)
+            self.refresh_index(folder)
             self.logger.log("Folder selected")
 
     def auto_detect(self):
@@ -1861,21 +741,33 @@ class LinuaUI(QMainWindow):
                 if os.path.exists(full_path):
                     self.path_input.setText(full_path)
                     self.config.set("game_path", full_path)
+                    self.refresh_index(full_path)
                     self.logger.log(f"[GAME] Found game: {full_path}")
                     return
 
         self.logger.log("Game not found automatically")
 
+    def installed_index(self, game_path):
+        """Индекс установленных DLC для папки игры (один на папку)"""
+        key = os.path.normcase(os.path.abspath(game_path))
+        if key not in self.indexes:
+            self.indexes[key] = InstalledIndex(game_path)
+        return self.indexes[key]
+
+    def refresh_index(self, game_path):
+        """Фоновое обновление индекса, чтобы выбор DLC открывался мгновенно"""
+        if not game_path or not os.path.isdir(game_path):
+            return
+        if self.index_thread and self.index_thread.isRunning():
+            return
+        self.index_thread = IndexThread(self.installed_index(game_path), self.logger)
+        self.index_thread.done.connect(lambda count: self.logger.log(f"[INDEX] {count} installed DLC indexed"))
+        self.thread_manager.add_thread(self.index_thread)
+        self.index_thread.start()
+
     def detect_installed(self, game_path):
-        """Обнаружение установленных DLC - из старого кода"""
-        installed = set()
-        if not os.path.exists(game_path):
-            return installed
-        for item in os.listdir(game_path):
-            u = item.upper()
-            if u.startswith(("EP", "GP", "SP", "FP")):
-                installed.add(u)
-        return installed
+        """Обнаружение установленных DLC (из индекса, без обхода диска)"""
+        return self.installed_index(game_path).installed()
 
     def log_message(self, message, level="INFO"):
         """Улучшенное логирование с уровнями - из старого кода"""
@@ -1927,24 +819,6 @@ class LinuaUI(QMainWindow):
                 except:
                     self.logger.log("TS4_x64.exe found (size unknown)")
             
-            # Проверка свободного места
-            has_space, free_gb = DiskChecker.check_disk_space(path, required_gb=15)
-            if not has_space:
-                self.logger.log(f"ERROR: Not enough disk space. Only {free_gb:.1f}GB free, need at least 15GB")
-                QMessageBox.critical(
-                    self,
-                    "Low Disk Space",
-                    f"Only {free_gb:.1f}GB free space available.\nNeed at least 15GB for installation.\nPlease free up some space and try again."
-                )
-                return
-            elif free_gb < 25:  # Предупреждение если мало места
-                self.logger.log(f"Warning: Only {free_gb:.1f}GB free space available")
-                QMessageBox.warning(
-                    self,
-                    "Low Disk Space",
-                    f"Warning: Only {free_gb:.1f}GB free space available.\nConsider freeing up more space for optimal performance."
-                )
-            
             # Проверка DLC которые уже установлены
             installed = self.detect_installed(path)
             
@@ -1962,27 +836,61 @@ class LinuaUI(QMainWindow):
                 self.logger.log("No DLC selected.")
                 return
                 
-            # Подтверждение установки
-            confirm_msg = (
-                f"You are about to install {len(selected)} DLC.\n"
-                f"Free space: {free_gb:.1f} GB\n\n"
-                f"Continue with installation?"
-            )
-            
-            reply = QMessageBox.question(
-                self,
-                "Confirm Installation",
-                confirm_msg,
-                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
-            )
-            
-            if reply == QMessageBox.StandardButton.Yes:
-                self.start_install_process(selected, path)
-        
+            # Место проверяется по реальным размерам выбранных DLC
+            self.plan_install(selected, path)
+
         except Exception as e:
             self.logger.log(f"Error in DLC selection: {str(e)}")
             QMessageBox.critical(self, "Error", f"Failed to start installation: {str(e)}")
 
+    def plan_install(self, selected, game_path):
+        """Размеры выбранных DLC в фоне; подтверждение - когда план готов"""
+        db = self.db.all()
+        jobs = [(dlc_id, db[dlc_id]) for dlc_id in selected if dlc_id in db]
+        self.update_btn.setEnabled(False)
+        self.logger.log(f"Checking download sizes for {len(jobs)} DLC...")
+        self.plan_thread = PlanThread(
+            self.controller, jobs, game_path,
+            int(self.config.get("download_slots", 2)),
+            int(self.config.get("extract_slots", 1)),
+            self.installed_index(game_path).sizes()
+        )
+        self.plan_thread.done.connect(lambda plan: self.plan_ready(plan, selected, game_path))
+        self.thread_manager.add_thread(self.plan_thread)
+        self.plan_thread.start()
+
+    def plan_ready(self, plan, selected, game_path):
+        """План готов: запомнить размеры в каталоге, проверить место, спросить подтверждение"""
+        self.update_btn.setEnabled(True)
+        if plan["entries"]:
+            self.db.replace(self.db.all().merged(plan["entries"]))
+        if not plan["ok"]:
+            self.logger.log(f"ERROR: {plan['reason']}")
+            QMessageBox.critical(self, "Low Disk Space", f"{plan['reason']}\nPlease free up some space and try again.")
+            return
+
+        gb = InstallPlanner.gb
+        confirm_msg = (
+            f"You are about to install {len(selected)} DLC.\n"
+            f"Download: {gb(plan['download'])}\n"
+            f"Disk space needed: {gb(plan['final'])} (+ {gb(plan['temp_peak'])} temporary)\n"
+        )
+        if plan["game_free"] is not None:
+            confirm_msg += f"Free space: {gb(plan['game_free'])}\n"
+        if plan["unknown"]:
+            confirm_msg += f"Size unknown for: {', '.join(plan['unknown'])}\n"
+        confirm_msg += "\nContinue with installation?"
+
+        reply = QMessageBox.question(
+            self,
+            "Confirm Installation",
+            confirm_msg,
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+
+        if reply == QMessageBox.StandardButton.Yes:
+            self.start_install_process(selected, game_path)
+
     def start_install_process(self, selected, game_path):
         """Запуск процесса установки"""
         self.logger.log(f"Starting installation with {len(selected)} DLC")
@@ -1990,17 +898,23 @@ class LinuaUI(QMainWindow):
         if not selected:
             self.logger.log("No DLC selected for installation.")
             return
+
+        if self.controller.busy():
+            # После Cancel потоки прошлой очереди ещё дорабатывают текущие DLC
+            self.logger.log("Previous installation is still stopping, try again in a moment.")
+            QMessageBox.information(self, "Please wait", "Previous installation is still stopping.\nTry again in a moment.")
+            return
             
         try:
+            # Один снимок каталога на всю установку - синхронизация может подменить базу
+            db = self.db.all()
             # Проверяем наличие 7-zip для многодольных DLC
-            multipart_dlc = []
-            for dlc in selected:
-                if dlc in self.db.all() and "parts" in self.db.all()[dlc]:
-                    multipart_dlc.append(dlc)
+            multipart_dlc = [dlc for dlc in selected if db.is_multipart(dlc)]
                     
             if multipart_dlc:
                 self.logger.log(f"Multipart DLC found: {multipart_dlc}")
-                seven_finder = SevenZipFinder(self.logger)
+                # Путь и версия 7-Zip запоминаются в конфиге - потоки установки возьмут их из кэша
+                seven_finder = SevenZipFinder(self.logger, self.config)
                 seven_path = seven_finder.find()
                 if not seven_path:
                     self.logger.log("ERROR: 7-zip required for multipart DLC but not found!")
@@ -2012,46 +926,56 @@ class LinuaUI(QMainWindow):
                     msg.exec()
                     return
 
-            self.progress_total = len(selected)
+            jobs = []
+            for dlc_id in selected:
+                if dlc_id not in db:
+                    self.logger.log(f"ERROR: DLC {dlc_id} not found in database")
+                    continue
+                jobs.append((dlc_id, db[dlc_id]))
+
+            if not jobs:
+                self.logger.log("No DLC selected for installation.")
+                return
+
+            self.progress_total = len(jobs)
             self.progress_done = 0
+            self.installing = True
 
             self.progress_bar.setVisible(True)
             self.progress_bar.setMaximum(self.progress_total)
             self.progress_bar.setValue(0)
+            self.progress_label.setText(f"0/{self.progress_total} DLC")
+            self.progress_label.setVisible(True)
+            self.progress_timer.start()
 
             self.update_btn.setEnabled(False)
             self.repair_btn.setEnabled(False)
             # Убрали check_update_btn
             self.cancel_btn.setVisible(True)
 
-            self.logger.log(f"Installing {len(selected)} DLC...")
-
-            self.active_threads = []
+            download_slots = int(self.config.get("download_slots", 2))
+            extract_slots = int(self.config.get("extract_slots", 1))
+            order = self.config.get("install_order", "smallest")
+            self.logger.log(
+                f"Installing {len(jobs)} DLC "
+                f"({download_slots} downloads / {extract_slots} extractions at a time)..."
+            )
 
-            for dlc_id in selected:
-                if dlc_id not in self.db.all():
-                    self.logger.log(f"ERROR: DLC {dlc_id} not found in database")
-                    continue
-                    
-                info = self.db.all()[dlc_id]
-
-                if "parts" in info and info["parts"]:
-                    t = self.controller.install_multipart(
-                        dlc_id, info, game_path,
-                        self.install_done
-                    )
-                else:
-                    t = self.controller.install_zip(
-                        dlc_id, info, game_path,
-                        self.install_done
-                    )
-
-                self.active_threads.append(t)
+            # Очередь с лимитами вместо отдельного потока на каждое DLC
+            self.controller.install_batch(
+                jobs, game_path, self.install_done,
+                download_slots=download_slots,
+                extract_slots=extract_slots,
+                order=order
+            )
                 
         except Exception as e:
+            self.installing = False
             self.logger.log(f"ERROR in start_install_process: {str(e)}")
             self.logger.log(f"ERROR traceback: {traceback.format_exc()}")
+            self.progress_timer.stop()
             self.progress_bar.setVisible(False)
+            self.progress_label.setVisible(False)
             self.update_btn.setEnabled(True)
             self.repair_btn.setEnabled(True)
             # Убрали check_update_btn
@@ -2061,6 +985,9 @@ class LinuaUI(QMainWindow):
     @pyqtSlot(str, bool, str)
     def install_done(self, dlc_id, success, reason):
         """Обработчик завершения установки DLC - из старого кода"""
+        if not self.installing:
+            # Отчёт об отменённой задаче пришёл после Cancel
+            return
         self.progress_done += 1
         self.progress_bar.setValue(self.progress_done)
 
@@ -2072,30 +999,51 @@ class LinuaUI(QMainWindow):
         if self.progress_done == self.progress_total:
             self.finish_install()
 
+    def update_download_progress(self):
+        """Байты, скорость и ETA загрузок - выборка счётчиков по таймеру"""
+        snapshot = self.controller.progress.sample()
+        text = f"{self.progress_done}/{self.progress_total} DLC"
+        if snapshot["total"] or snapshot["done"]:
+            text += " • " + ProgressTracker.describe(snapshot)
+        self.progress_label.setText(text)
+
     def finish_install(self):
         """Завершение процесса установки - из старого кода"""
+        self.installing = False
         self.logger.log("✓ Installation complete.")
+        self.progress_timer.stop()
         self.progress_bar.setVisible(False)
+        self.progress_label.setVisible(False)
+        self.controller.finish_batch()
 
         self.update_btn.setEnabled(True)
         self.repair_btn.setEnabled(True)
         # Убрали check_update_btn
         self.cancel_btn.setVisible(False)
+        self.refresh_index(self.path_input.text().strip())
 
         QMessageBox.information(self, "Done", "All selected DLC were installed.")
 
     def cancel_installation(self):
         """Отмена текущей установки"""
+        if self.full_repair and self.full_repair.isRunning():
+            # Идёт полный ремонт - прерываем только его, отчёт покажется с частичными результатами
+            self.logger.log("Cancelling repair...")
+            self.full_repair.stop()
+            return
+
         self.logger.log("Cancelling installation...")
+        self.installing = False
+        self.progress_timer.stop()
+
+        # Отмена очереди планировщика и текущих загрузок
+        if hasattr(self, 'controller') and self.controller:
+            self.controller.cancel_batch()
         
         # Отмена через thread_manager
         if hasattr(self, 'thread_manager') and self.thread_manager:
             self.thread_manager.cancel_all()
         
-        # Отмена через download_manager
-        if hasattr(self, 'download_manager'):
-            self.download_manager.cancel_all()
-        
         # Остановить активные потоки
         for thread in self.active_threads:
             if thread.isRunning():
@@ -2158,10 +1106,51 @@ class LinuaUI(QMainWindow):
     def enhanced_repair(self, path, dialog):
         dialog.accept()
         self.logger.log("[REPAIR] Starting advanced repair...")
-        
-        repair = AdvancedRepair(path, self.logger)
-        results, report = repair.run_full_repair()
-        
+
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setMaximum(0)
+        self.progress_label.setText("Starting repair...")
+        self.progress_label.setVisible(True)
+        self.update_btn.setEnabled(False)
+        self.repair_btn.setEnabled(False)
+        self.cancel_btn.setVisible(True)
+
+        # Бюджеты этапов в секундах, например {"dlc": 300, "temp": 120}
+        budgets = self.config.get("repair_stage_budgets") or None
+        self.full_repair = FullRepairThread(
+            path, self.installed_index(path), budgets, db=self.db.all(),
+            temp_dir=self.config.get(StagingManager.CONFIG_KEY, "")
+        )
+        self.full_repair.message.connect(self.logger.log)
+        self.full_repair.progress.connect(self.repair_progress)
+        self.full_repair.done.connect(self.full_repair_done)
+        self.thread_manager.add_thread(self.full_repair)
+        self.full_repair.start()
+
+    @pyqtSlot(str, int, int)
+    def repair_progress(self, stage, done, total):
+        """Прогресс этапов полного ремонта"""
+        if total:
+            self.progress_bar.setMaximum(total)
+            self.progress_bar.setValue(done)
+            self.progress_label.setText(f"Repair: {stage} ({done}/{total})")
+        else:
+            self.progress_bar.setMaximum(0)
+            self.progress_label.setText(f"Repair: {stage}...")
+
+    @pyqtSlot(object, str)
+    def full_repair_done(self, results, report):
+        """Завершение полного ремонта - вернуть UI и показать отчёт"""
+        self.progress_bar.setVisible(False)
+        self.progress_label.setVisible(False)
+        self.update_btn.setEnabled(True)
+        self.repair_btn.setEnabled(True)
+        self.cancel_btn.setVisible(False)
+        timings = ", ".join(f"{stage} {t:.1f}s" for stage, t in results.get("timings", {}).items())
+        self.logger.log(f"[REPAIR] Finished ({timings})")
+        self.show_repair_report(report)
+
+    def show_repair_report(self, report):
         # Показать отчет
         result_dialog = QDialog(self)
         result_dialog.setWindowTitle("Repair Report")
@@ -2213,12 +1202,12 @@ class LinuaUI(QMainWindow):
             self.repair_btn.setEnabled(False)
             
             # Остановить все операции
+            if hasattr(self, 'controller') and self.controller:
+                self.controller.cancel_batch()
+
             if hasattr(self, 'thread_manager') and self.thread_manager:
                 self.thread_manager.cancel_all()
                 
-            if hasattr(self, 'download_manager'):
-                self.download_manager.cancel_all()
-                
             # Очистить временные файлы
             self.cleanup_temporary_files()
             
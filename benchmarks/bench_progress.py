@@ -0,0 +1,135 @@
+"""
+Benchmark: cost of progress reporting from download workers.
+
+Simulates a 5 GB download in 8 KB chunks (the chunk size DownloadThread
+used) split across worker threads and compares:
+  * signal   - one cross-thread Qt signal per chunk, as DownloadThread did
+               (needs PyQt6; queued to a receiver in the main thread)
+  * counter  - ProgressTracker byte counters, sampled by the consumer
+               every 500 ms
+  * none     - the bare loop, for reference
+
+    python benchmarks/bench_progress.py
+    python benchmarks/bench_progress.py --gb 1 --threads 8
+"""
+
+import argparse
+import importlib.util
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CHUNK = 8192
+
+
+def load_updater():
+    spec = importlib.util.spec_from_file_location("linua_core", ROOT / "linua_core.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_threads(threads, chunks, work):
+    workers = [threading.Thread(target=work, args=(chunks // threads,)) for _ in range(threads)]
+    began = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return time.perf_counter() - began
+
+
+def bench_none(threads, chunks):
+    def work(n):
+        done = 0
+        for _ in range(n):
+            done += CHUNK
+    return run_threads(threads, chunks, work)
+
+
+def bench_counter(updater, threads, chunks):
+    tracker = updater.ProgressTracker()
+    task = tracker.task("EP01")
+    task.expect("bench", chunks * CHUNK)
+    stop = threading.Event()
+    samples = []
+
+    def sampler():
+        while not stop.wait(0.5):
+            samples.append(tracker.sample())
+
+    def work(n):
+        counter = task.counter()
+        for _ in range(n):
+            counter.add(CHUNK)
+
+    watcher = threading.Thread(target=sampler)
+    watcher.start()
+    elapsed = run_threads(threads, chunks, work)
+    stop.set()
+    watcher.join()
+    assert task.done() == (chunks // threads) * threads * CHUNK
+    return elapsed
+
+
+def bench_signal(threads, chunks):
+    try:
+        from PyQt6.QtCore import QCoreApplication, QObject, pyqtSignal
+    except ImportError:
+        return None
+
+    app = QCoreApplication.instance() or QCoreApplication([])
+
+    class Emitter(QObject):
+        progress = pyqtSignal(int, int)
+
+    received = [0]
+    emitters = [Emitter() for _ in range(threads)]
+    for e in emitters:
+        e.progress.connect(lambda done, total: received.__setitem__(0, received[0] + 1))
+
+    def work(n, emitter):
+        done = 0
+        for _ in range(n):
+            done += CHUNK
+            emitter.progress.emit(done // (1024 * 1024), 5000)
+
+    workers = [threading.Thread(target=work, args=(chunks // threads, e)) for e in emitters]
+    began = time.perf_counter()
+    for w in workers:
+        w.start()
+    # The GUI thread has to deliver every queued signal
+    expected = (chunks // threads) * threads
+    while received[0] < expected:
+        app.processEvents()
+    for w in workers:
+        w.join()
+    return time.perf_counter() - began
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--gb", type=float, default=5)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    updater = load_updater()
+    chunks = int(args.gb * 1024 ** 3) // CHUNK
+    print(f"{chunks} chunks of {CHUNK // 1024} KB across {args.threads} threads")
+
+    base = bench_none(args.threads, chunks)
+    print(f"  {'bare loop':<26} {base:7.2f}s")
+    counter = bench_counter(updater, args.threads, chunks)
+    print(f"  {'counters + 2 Hz sampling':<26} {counter:7.2f}s  (+{(counter - base) * 1e9 / chunks:.0f} ns/chunk)")
+    signal = bench_signal(args.threads, chunks)
+    if signal is None:
+        print("  per-chunk Qt signal         skipped (PyQt6 not installed)")
+    else:
+        print(f"  {'per-chunk Qt signal':<26} {signal:7.2f}s  (+{(signal - base) * 1e9 / chunks:.0f} ns/chunk)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
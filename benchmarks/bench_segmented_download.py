@@ -0,0 +1,137 @@
+"""
+Benchmark: single-stream vs Range-segmented downloads in DownloadEngine.
+
+Starts a local HTTP server that serves an in-memory payload with optional
+Range support and a per-connection bandwidth cap (to mimic a CDN that limits
+each TCP stream), then downloads the payload with different segment counts.
+
+    python benchmarks/bench_segmented_download.py --size-mb 64 --stream-mbps 16
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_updater():
+    spec = importlib.util.spec_from_file_location("linua_core", ROOT / "linua_core.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_handler(payload, stream_bps, ranges):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _headers(self, status, start, end):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/zip")
+            self.send_header("Content-Length", str(end - start + 1))
+            if ranges:
+                self.send_header("Accept-Ranges", "bytes")
+            if status == 206:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(payload)}")
+            self.end_headers()
+
+        def _span(self):
+            header = self.headers.get("Range")
+            if not ranges or not header or not header.startswith("bytes="):
+                return 200, 0, len(payload) - 1
+            first, _, last = header[6:].partition("-")
+            end = min(int(last), len(payload) - 1) if last else len(payload) - 1
+            return 206, int(first), end
+
+        def do_HEAD(self):
+            self._headers(200, 0, len(payload) - 1)
+
+        def do_GET(self):
+            status, start, end = self._span()
+            self._headers(status, start, end)
+            view = memoryview(payload)[start:end + 1]
+            block = 64 * 1024
+            began = time.perf_counter()
+            sent = 0
+            try:
+                while sent < len(view):
+                    self.wfile.write(view[sent:sent + block])
+                    sent += block
+                    # Throttle each connection to stream_bps
+                    ahead = sent / stream_bps - (time.perf_counter() - began)
+                    if ahead > 0:
+                        time.sleep(ahead)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    return Handler
+
+
+def serve(payload, stream_bps, ranges):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(payload, stream_bps, ranges))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(engine_cls, url, out_path, segments, expected):
+    engine = engine_cls(None, segments=segments)
+    # A finished download leaves a journal behind; start every run from scratch
+    engine.discard_partial(out_path)
+    began = time.perf_counter()
+    ok, reason = engine.download(url, out_path)
+    elapsed = time.perf_counter() - began
+    if not ok:
+        raise SystemExit(f"download failed ({segments} segments): {reason}")
+    with open(out_path, "rb") as f:
+        if f.read() != expected:
+            raise SystemExit(f"payload mismatch ({segments} segments)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--stream-mbps", type=float, default=16.0,
+                        help="per-connection cap in MB/s")
+    parser.add_argument("--segments", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    updater = load_updater()
+    payload = os.urandom(args.size_mb * 1024 * 1024)
+    stream_bps = args.stream_mbps * 1024 * 1024
+
+    out_path = os.path.join(tempfile.mkdtemp(prefix="linua_bench_"), "payload.zip")
+    print(f"payload {args.size_mb} MB, per-stream cap {args.stream_mbps} MB/s")
+
+    server = serve(payload, stream_bps, ranges=True)
+    url = f"http://127.0.0.1:{server.server_address[1]}/payload.zip"
+    for segments in args.segments:
+        elapsed = run(updater.DownloadEngine, url, out_path, segments, payload)
+        print(f"  range server, {segments:>2} segment(s): {elapsed:6.2f}s  "
+              f"{args.size_mb / elapsed:7.1f} MB/s")
+    server.shutdown()
+
+    # Server without Range support: segmented mode must fall back to one stream
+    server = serve(payload, stream_bps, ranges=False)
+    url = f"http://127.0.0.1:{server.server_address[1]}/payload.zip"
+    elapsed = run(updater.DownloadEngine, url, out_path, max(args.segments), payload)
+    print(f"  no-range server (fallback):  {elapsed:6.2f}s  {args.size_mb / elapsed:7.1f} MB/s")
+    server.shutdown()
+
+    updater.DownloadEngine.discard_partial(out_path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Benchmark: same-volume staging vs the old cross-volume temp layout.
+
+Simulates the disk side of one install: the "download" writes the archive
+in chunks, the archive is extracted through Extractor.extract_zip and the
+staged tree is committed into the game folder. Three layouts:
+  * same volume   - StagingManager next to the game (downloads and staging
+                    on the game drive, commit is a rename)
+  * temp download - archive in --other (system temp), staging next to the
+                    game, as before: every byte crosses drives once more
+  * all in temp   - --temp-dir on another drive: staging there too, so the
+                    commit copies the extracted tree across drives
+
+--game and --other should be on different drives (e.g. D:\\ and C:\\);
+the script warns when they share a device. Drop the OS file cache between
+runs to see real disk traffic.
+
+    python benchmarks/bench_staging.py --game D:\\tmp --other C:\\tmp --size-mb 1024
+"""
+
+import argparse
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHUNK = 1024 * 256
+
+
+def load_updater():
+    spec = importlib.util.spec_from_file_location("linua_core", ROOT / "linua_core.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_archive(path, size_mb, member_mb):
+    """Members are half random, half repetitive data (~2:1 deflate ratio)."""
+    block = 1024 * 1024
+    members = max(1, size_mb // member_mb)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as z:
+        for i in range(members):
+            with z.open(f"EP99/Data/member_{i:03}.package", "w", force_zip64=True) as f:
+                for j in range(member_mb):
+                    f.write(os.urandom(block // 2) + bytes([j % 256]) * (block // 2))
+
+
+def download(source, target):
+    # Stands in for the network: the archive is written chunk by chunk
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        while True:
+            data = src.read(CHUNK)
+            if not data:
+                break
+            dst.write(data)
+        dst.flush()
+        os.fsync(dst.fileno())
+
+
+def install(updater, source, game, downloads, staging):
+    archive = downloads.partial_path("EP99.zip")
+    download(source, archive)
+    extractor = updater.Extractor(None, staging=staging)
+    ok, reason = extractor.extract_zip(archive, str(game))
+    os.remove(archive)
+    downloads.cleanup()
+    staging.cleanup()
+    if not ok:
+        raise RuntimeError(reason)
+
+
+def measure(label, fn):
+    began = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - began
+    print(f"  {label:<16} {elapsed:7.2f}s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--game", default=None, help="folder on the game drive")
+    parser.add_argument("--other", default=None, help="folder on another drive (default: system temp)")
+    parser.add_argument("--size-mb", type=int, default=512, help="uncompressed archive size")
+    parser.add_argument("--member-mb", type=int, default=64)
+    parser.add_argument("--runs", type=int, default=1)
+    args = parser.parse_args()
+
+    updater = load_updater()
+    work = Path(tempfile.mkdtemp(prefix="linua_bench_", dir=args.game))
+    other = Path(tempfile.mkdtemp(prefix="linua_bench_", dir=args.other))
+    try:
+        if updater.StagingManager.device(work) == updater.StagingManager.device(other):
+            print("warning: --game and --other are on the same device, layouts will look alike")
+
+        source = other / "source.zip"
+        print(f"building {args.size_mb} MB archive ...")
+        build_archive(source, args.size_mb, args.member_mb)
+        print(f"archive size {source.stat().st_size / (1024 * 1024):.0f} MB")
+
+        # (label, where the archive is downloaded, where it is staged); None - next to the game
+        layouts = [
+            ("same volume", None, None),
+            ("temp download", other / "work", None),
+            ("all in temp", other / "work", other / "work"),
+        ]
+        results = {}
+        for run in range(args.runs):
+            for label, download_root, staging_root in layouts:
+                game = work / "game"
+                game.mkdir()
+                downloads = updater.StagingManager(game, download_root)
+                staging = updater.StagingManager(game, staging_root)
+                results.setdefault(label, []).append(
+                    measure(label, lambda: install(updater, source, game, downloads, staging))
+                )
+                shutil.rmtree(game)
+
+        best = {label: min(times) for label, times in results.items()}
+        for label in ("temp download", "all in temp"):
+            print(f"  same volume vs {label}: {best[label] / best['same volume']:.2f}x")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+        shutil.rmtree(other, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Benchmark: cold start of the core engine, the CLI and the GUI window.
+
+Every measurement runs in a fresh interpreter and reports the median:
+  * core import    - `import linua_core` (must not load PyQt6 or requests)
+  * first command  - `linua_cli.py list --json` from launch to exit
+  * main file CLI  - `LinuaUpdater_v4.0.py list --json` (dispatched before Qt)
+  * time to window - GUI launch until the main window is shown and the event
+                     loop runs (offscreen Qt platform unless --onscreen)
+
+With --importtime the slowest top-level imports of each entry point are
+listed, as reported by `python -X importtime`.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --importtime
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CORE_PROBE = r"""
+import sys, time
+began = time.perf_counter()
+import linua_core
+elapsed = time.perf_counter() - began
+heavy = [m for m in ("PyQt6", "requests") if m in sys.modules]
+print(elapsed, ",".join(heavy) or "-")
+"""
+
+WINDOW_PROBE = r"""
+import importlib.util, sys
+sys.path.insert(0, {root!r})
+sys.argv = ["LinuaUpdater"]
+spec = importlib.util.spec_from_file_location("linua_gui", {main!r})
+gui = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(gui)
+app = gui.QApplication(sys.argv)
+window = gui.LinuaUI(gui.ConfigManager(), gui.DLCDatabase())
+window.show()
+
+def shown():
+    print("shown", flush=True)
+    # The background connectivity probe must finish before exiting
+    thread = getattr(window, "connection_thread", None)
+    if thread:
+        thread.wait()
+    app.quit()
+
+gui.QTimer.singleShot(0, shown)
+app.exec()
+"""
+
+
+def run_core():
+    out = subprocess.run(
+        [sys.executable, "-c", CORE_PROBE], cwd=ROOT,
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(out[0]), out[1]
+
+
+def run_command(args):
+    began = time.perf_counter()
+    subprocess.run(
+        [sys.executable, *args], cwd=ROOT,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True
+    )
+    return time.perf_counter() - began
+
+
+def run_window(env):
+    code = WINDOW_PROBE.format(root=str(ROOT), main=str(ROOT / "LinuaUpdater_v4.0.py"))
+    began = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", code], cwd=ROOT, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    line = proc.stdout.readline()
+    elapsed = time.perf_counter() - began
+    proc.wait()
+    if line.strip() != "shown":
+        raise SystemExit("GUI did not start (is PyQt6 installed?)")
+    return elapsed
+
+
+def importtime(statement, top):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement], cwd=ROOT,
+        capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # importtime indents nested imports by two spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth <= 1:
+            rows.append((int(cumulative), "  " * depth + name.strip()))
+    print(f"  slowest imports for `{statement}` (cumulative):")
+    for cumulative, name in sorted(rows, reverse=True)[:top]:
+        print(f"    {cumulative / 1000:8.1f} ms  {name}")
+
+
+def median_ms(samples):
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--onscreen", action="store_true", help="use the real Qt platform")
+    parser.add_argument("--no-gui", action="store_true", help="skip the time-to-window run")
+    parser.add_argument("--importtime", action="store_true", help="list the slowest imports")
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if not args.onscreen:
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    core = [run_core() for _ in range(args.runs)]
+    print(f"core import      {median_ms([c[0] for c in core]):8.1f} ms"
+          f"   (heavy modules loaded: {core[0][1]})")
+
+    cli = [run_command(["linua_cli.py", "list", "--json", "-q"]) for _ in range(args.runs)]
+    print(f"first command    {median_ms(cli):8.1f} ms   (linua_cli.py list)")
+
+    main_cli = [run_command(["LinuaUpdater_v4.0.py", "list", "--json", "-q"]) for _ in range(args.runs)]
+    print(f"main file CLI    {median_ms(main_cli):8.1f} ms   (LinuaUpdater_v4.0.py list)")
+
+    if not args.no_gui:
+        window = [run_window(env) for _ in range(args.runs)]
+        print(f"time to window   {median_ms(window):8.1f} ms")
+
+    if args.importtime:
+        importtime("import linua_cli", args.top)
+        if not args.no_gui:
+            importtime("import PyQt6.QtWidgets", args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
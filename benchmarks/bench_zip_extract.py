@@ -0,0 +1,100 @@
+"""
+Benchmark: legacy testzip() + extract loop vs single-pass verified extraction
+(sequential and with one worker per CPU core).
+
+Builds a synthetic ZIP (deflate, partially compressible members similar to
+.package files) and extracts it both ways, reporting wall and CPU time.
+
+    python benchmarks/bench_zip_extract.py --size-mb 512
+    python benchmarks/bench_zip_extract.py --size-mb 4096 --member-mb 256
+"""
+
+import argparse
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_updater():
+    spec = importlib.util.spec_from_file_location("linua_core", ROOT / "linua_core.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_archive(path, size_mb, member_mb):
+    """Members are half random, half repetitive data (~2:1 deflate ratio)."""
+    block = 1024 * 1024
+    members = max(1, size_mb // member_mb)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as z:
+        for i in range(members):
+            with z.open(f"EP99/Data/member_{i:03}.package", "w", force_zip64=True) as f:
+                for j in range(member_mb):
+                    f.write(os.urandom(block // 2) + bytes([j % 256]) * (block // 2))
+
+
+def legacy_extract(archive, out_dir):
+    with zipfile.ZipFile(archive, "r") as z:
+        if z.testzip():
+            raise RuntimeError("corrupted")
+        for member in z.infolist():
+            z.extract(member, out_dir)
+
+
+def measure(label, fn):
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    fn()
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+    print(f"  {label:<30} wall {wall:7.2f}s   cpu {cpu:7.2f}s")
+    return cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=512, help="uncompressed archive size")
+    parser.add_argument("--member-mb", type=int, default=64)
+    parser.add_argument("--workdir", default=None, help="where to build and extract")
+    args = parser.parse_args()
+
+    updater = load_updater()
+    work = Path(tempfile.mkdtemp(prefix="linua_bench_", dir=args.workdir))
+    try:
+        archive = work / "synthetic.zip"
+        print(f"building {args.size_mb} MB archive in {work} ...")
+        build_archive(archive, args.size_mb, args.member_mb)
+        print(f"archive size {archive.stat().st_size / (1024 * 1024):.0f} MB")
+
+        legacy_out = work / "legacy"
+        legacy = measure("testzip + extract", lambda: legacy_extract(archive, legacy_out))
+        shutil.rmtree(legacy_out)
+
+        single = None
+        for workers in sorted({1, os.cpu_count() or 1}):
+            extractor = updater.Extractor(None, workers=workers)
+            out = work / f"single_{workers}"
+
+            def single_pass():
+                ok, reason = extractor.extract_zip(str(archive), str(out))
+                if not ok:
+                    raise RuntimeError(reason)
+
+            cpu = measure(f"single-pass, {workers} worker(s)", single_pass)
+            single = cpu if single is None else single
+            shutil.rmtree(out)
+        print(f"  cpu time saved by single pass: {(1 - single / legacy) * 100:.0f}%")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
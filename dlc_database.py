@@ -1,112 +1,118 @@
 # dlc_database.py
-class DLCDatabase:
-    def __init__(self):
-        self.dlc = {
-            "EP01": {"name": "Get to Work", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP01/Sims4_DLC_EP01_Get_to_Work.zip"},
-            "EP02": {"name": "Get Together", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP02/Sims4_DLC_EP02_Get_Together.zip"},
-            "EP04": {"name": "Cats and Dogs", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP04/Sims4_DLC_EP04_Cats_and_Dogs.zip"},
-            "EP05": {"name": "Seasons", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP05/Sims4_DLC_EP05_Seasons.zip"},
-            "EP07": {"name": "Island Living", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP07/Sims4_DLC_EP07_Island_Living.zip"},
-            "EP08": {"name": "Discover University", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP08/Sims4_DLC_EP08_Discover_University.zip"},
-            "EP09": {"name": "Eco Lifestyle", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP09/Sims4_DLC_EP09_Eco_Lifestyle.zip"},
-            "EP10": {"name": "Snowy Escape", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP10/Sims4_DLC_EP10_Snowy_Escape.zip"},
-            "EP11": {"name": "Cottage Living", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP11/Sims4_DLC_EP11_Cottage_Living.zip"},
-            "EP12": {"name": "High School Years", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP12/Sims4_DLC_EP12_High_School_Years.zip"},
-            "EP13": {"name": "Growing Together", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP13/Sims4_DLC_EP13_Growing_Together.zip"},
-            "EP14": {"name": "Horse Ranch", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP14/Sims4_DLC_EP14_Horse_Ranch.zip"},
-            "EP15": {"name": "For Rent", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP15/Sims4_DLC_EP15_For_Rent.zip"},
-            "EP16": {"name": "Lovestruck", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP16/Sims4_DLC_EP16_Lovestruck.zip"},
-            "EP17": {"name": "Life and Death", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP17/Sims4_DLC_EP17_Life_and_Death.zip"},
-            "EP18": {"name": "Businesses and Hobbies", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP18/Sims4_DLC_EP18_Businesses_and_Hobbies.zip"},
-            "EP19": {"name": "Enchanted by Nature", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP19/Sims4_DLC_EP19_Enchanted_by_Nature_Expansion_Pack.zip"},
-            "EP20": {"name": "Adventure Awaits", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/EP20/Sims4_DLC_EP20_Adventure_Awaits_Expansion_Pack.zip"},
-            "GP01": {"name": "Outdoor Retreat", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP01/Sims4_DLC_GP01_Outdoor_Retreat.zip"},
-            "GP02": {"name": "Spa Day", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP02/Sims4_DLC_GP02_Spa_Day.zip"},
-            "GP03": {"name": "Dine Out", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP03/Sims4_DLC_GP03_Dine_Out.zip"},
-            "GP04": {"name": "Vampires", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP04/Sims4_DLC_GP04_Vampires.zip"},
-            "GP05": {"name": "Parenthood", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP05/Sims4_DLC_GP05_Parenthood.zip"},
-            "GP06": {"name": "Jungle Adventure", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP06/Sims4_DLC_GP06_Jungle_Adventure.zip"},
-            "GP07": {"name": "StrangerVille", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP07/Sims4_DLC_GP07_StrangerVille.zip"},
-            "GP08": {"name": "Realm of Magic", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP08/Sims4_DLC_GP08_Realm_of_Magic.zip"},
-            "GP09": {"name": "Star Wars: Journey to Batuu", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP09/Sims4_DLC_GP09_Star_Wars_Journey_to_Batuu.zip"},
-            "GP10": {"name": "Dream Home Decorator", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP10/Sims4_DLC_GP10_Dream_Home_Decorator.zip"},
-            "GP11": {"name": "My Wedding Stories", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP11/Sims4_DLC_GP11_My_Wedding_Stories.zip"},
-            "GP12": {"name": "Werewolves", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/GP12/Sims4_DLC_GP12_Werewolves.zip"},
-            "SP01": {"name": "Luxury Party Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP01/Sims4_DLC_SP01_Luxury_Party_Stuff.zip"},
-            "SP02": {"name": "Perfect Patio Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP02/Sims4_DLC_SP02_Perfect_Patio_Stuff.zip"},
-            "SP03": {"name": "Cool Kitchen Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP03/Sims4_DLC_SP03_Cool_Kitchen_Stuff.zip"},
-            "SP04": {"name": "Spooky Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP04/Sims4_DLC_SP04_Spooky_Stuff.zip"},
-            "SP05": {"name": "Movie Hangout Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP05/Sims4_DLC_SP05_Movie_Hangout_Stuff.zip"},
-            "SP06": {"name": "Romantic Garden Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP06/Sims4_DLC_SP06_Romantic_Garden_Stuff.zip"},
-            "SP07": {"name": "Kids Room Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP07/Sims4_DLC_SP07_Kids_Room_Stuff.zip"},
-            "SP08": {"name": "Backyard Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP08/Sims4_DLC_SP08_Backyard_Stuff.zip"},
-            "SP09": {"name": "Vintage Glamour Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP09/Sims4_DLC_SP09_Vintage_Glamour_Stuff.zip"},
-            "SP10": {"name": "Bowling Night Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP10/Sims4_DLC_SP10_Bowling_Night_Stuff.zip"},
-            "SP11": {"name": "Fitness Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP11/Sims4_DLC_SP11_Fitness_Stuff.zip"},
-            "SP12": {"name": "Toddler Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP12/Sims4_DLC_SP12_Toddler_Stuff.zip"},
-            "SP13": {"name": "Laundry Day Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP13/Sims4_DLC_SP13_Laundry_Day_Stuff.zip"},
-            "SP14": {"name": "My First Pet Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP14/Sims4_DLC_SP14_My_First_Pet_Stuff.zip"},
-            "SP15": {"name": "Moschino Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP15/Sims4_DLC_SP15_Moschino_Stuff.zip"},
-            "SP16": {"name": "Tiny Living Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP16/Sims4_DLC_SP16_Tiny_Living_Stuff_Pack.zip"},
-            "SP17": {"name": "Nifty Knitting", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP17/Sims4_DLC_SP17_Nifty_Knitting.zip"},
-            "SP18": {"name": "Paranormal Stuff", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP18/Sims4_DLC_SP18_Paranormal_Stuff_Pack.zip"},
-            "SP20": {"name": "Throwback Fit Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP20/Sims4_DLC_SP20_Throwback_Fit_Kit.zip"},
-            "SP21": {"name": "Country Kitchen Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP21/Sims4_DLC_SP21_Country_Kitchen_Kit.zip"},
-            "SP22": {"name": "Bust the Dust Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP22/Sims4_DLC_SP22_Bust_the_Dust_Kit.zip"},
-            "SP23": {"name": "Courtyard Oasis Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP23/Sims4_DLC_SP23_Courtyard_Oasis_Kit.zip"},
-            "SP24": {"name": "Fashion Street Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP24/Sims4_DLC_SP24_Fashion_Street_Kit.zip"},
-            "SP25": {"name": "Industrial Loft Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP25/Sims4_DLC_SP25_Industrial_Loft_Kit.zip"},
-            "SP26": {"name": "Incheon Arrivals Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP26/Sims4_DLC_SP26_Incheon_Arrivals_Kit.zip"},
-            "SP28": {"name": "Modern Menswear Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP28/Sims4_DLC_SP28_Modern_Menswear_Kit.zip"},
-            "SP29": {"name": "Blooming Rooms Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP29/Sims4_DLC_SP29_Blooming_Rooms_Kit.zip"},
-            "SP30": {"name": "Carnaval Streetwear Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP30/Sims4_DLC_SP30_Carnaval_Streetwear_Kit.zip"},
-            "SP31": {"name": "Decor to the Max Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP31/Sims4_DLC_SP31_Decor_to_the_Max_Kit.zip"},
-            "SP32": {"name": "Moonlight Chic Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP32/Sims4_DLC_SP32_Moonlight_Chic_Kit.zip"},
-            "SP33": {"name": "Little Campers Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP33/Sims4_DLC_SP33_Little_Campers_Kit.zip"},
-            "SP34": {"name": "First Fits Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP34/Sims4_DLC_SP34_First_Fits_Kit.zip"},
-            "SP35": {"name": "Desert Luxe Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP35/Sims4_DLC_SP35_Desert_Luxe_Kit.zip"},
-            "SP36": {"name": "Pastel Pop Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP36/Sims4_DLC_SP36_Pastel_Pop_Kit.zip"},
-            "SP37": {"name": "Everyday Clutter Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP37/Sims4_DLC_SP37_Everyday_Clutter_Kit.zip"},
-            "SP38": {"name": "Simtimates Collection Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP38/Sims4_DLC_SP38_Simtimates_Collection_Kit.zip"},
-            "SP39": {"name": "Bathroom Clutter Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP39/Sims4_DLC_SP39_Bathroom_Clutter_Kit.zip"},
-            "SP40": {"name": "Greenhouse Haven Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP40/Sims4_DLC_SP40_Greenhouse_Haven_Kit.zip"},
-            "SP41": {"name": "Basement Treasures Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP41/Sims4_DLC_SP41_Basement_Treasures_Kit.zip"},
-            "SP42": {"name": "Grunge Revival Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP42/Sims4_DLC_SP42_Grunge_Revival_Kit.zip"},
-            "SP43": {"name": "Book Nook Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP43/Sims4_DLC_SP43_Book_Nook_Kit.zip"},
-            "SP44": {"name": "Poolside Splash Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP44/Sims4_DLC_SP44_Poolside_Splash_Kit.zip"},
-            "SP45": {"name": "Modern Luxe Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP45/Sims4_DLC_SP45_Modern_Luxe_Kit.zip"},
-            "SP46": {"name": "Home Chef Hustle Stuff Pack", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP46/Sims4_DLC_SP46_Home_Chef_Hustle_Stuff_Pack.zip"},
-            "SP47": {"name": "Castle Estate Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP47/Sims4_DLC_SP47_Castle_Estate_Kit.zip"},
-            "SP48": {"name": "Goth Galore Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP48/Sims4_DLC_SP48_Goth_Galore_Kit.zip"},
-            "SP49": {"name": "Crystal Creations Stuff Pack", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP49/Sims4_DLC_SP49_Crystal_Creations_Stuff_Pack.zip"},
-            "SP50": {"name": "Urban Homage Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP50/Sims4_DLC_SP50_Urban_Homage_Kit.zip"},
-            "SP51": {"name": "Party Essentials Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP51/Sims4_DLC_SP51_Party_Essentials_Kit.zip"},
-            "SP52": {"name": "Riviera Retreat Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP52/Sims4_DLC_SP52_Riviera_Retreat_Kit.zip"},
-            "SP53": {"name": "Cozy Bistro Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP53/Sims4_DLC_SP53_Cozy_Bistro_Kit.zip"},
-            "SP54": {"name": "Artist Studio Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP54/Sims4_DLC_SP54_Artist_Studio_Kit.zip"},
-            "SP55": {"name": "Storybook Nursery Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP55/Sims4_DLC_SP55_Storybook_Nursery_Kit.zip"},
-            "SP56": {"name": "Sweet Slumber Party Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP56/Sims4_DLC_SP56_Sweet_Slumber_Party_Kit.zip"},
-            "SP57": {"name": "Cozy Kitsch Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP57/Sims4_DLC_SP57_Cozy_Kitsch_Kit.zip"},
-            "SP58": {"name": "Comfy Gamer Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP58/Sims4_DLC_SP58_Comfy_Gamer_Kit.zip"},
-            "SP59": {"name": "Secret Sanctuary Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP59/Sims4_DLC_SP59_Secret_Sanctuary_Kit.zip"},
-            "SP60": {"name": "Casanova Cave Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP60/Sims4_DLC_SP60_Casanova_Cave_Kit.zip"},
-            "SP61": {"name": "Refined Living Room Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP61/Sims4_DLC_SP61_Refined_Living_Room_Kit.zip"},
-            "SP62": {"name": "Business Chic Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP62/Sims4_DLC_SP62_Business_Chic_Kit.zip"},
-            "SP63": {"name": "Sleek Bathroom Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP63/Sims4_DLC_SP63_Sleek_Bathroom_Kit.zip"},
-            "SP64": {"name": "Sweet Allure Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP64/Sims4_DLC_SP64_Sweet_Allure_Kit.zip"},
-            "SP65": {"name": "Restoration Workshop Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP65/Sims4_DLC_SP65_Restoration_Workshop_Kit.zip"},
-            "SP66": {"name": "Golden Years Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP66/Sims4_DLC_SP66_Golden_Years_Kit.zip"},
-            "SP67": {"name": "Kitchen Clutter Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP67/Sims4_DLC_SP67_Kitchen_Clutter_Kit.zip"},
-            "SP69": {"name": "Autumn Apparel Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP69/Sims4_DLC_SP69_Autumn_Apparel_Kit.zip"},
-            "SP71": {"name": "Grange Mudroom Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP71/Sims4_DLC_SP71_Grange_Mudroom_Kit.zip"},
-            "SP72": {"name": "Essential Glam Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP72/Sims4_DLC_SP72_Essential_Glam_Kit.zip"},
-            "SP73": {"name": "Modern Retreat Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP73/Sims4_DLC_SP73_Modern_Retreat_Kit.zip"},
-            "SP74": {"name": "Garden to Table Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP74/Sims4_DLC_SP74_Garden_to_Table_Kit.zip"},
-            "SP70": {"name": "Spongebob Kid's Room Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP70/SP70.zip"},
-            "SP68": {"name": "Spongebob's House Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP68/SP68.zip"},
-            "SP81": {"name": "Prairie Dreams Kit", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/SP81/SP81.zip"},
-            "FP01": {"name": "Holiday Celebration Pack", "url": "https://github.com/l1ntol/lunia-dlc/releases/download/FP01/Sims4_DLC_FP01_Holiday_Celebration_Pack.zip"},
-        }
+# Встроенный каталог DLC в компактной форме - из него DLCCatalog.builtin()
+# (linua_core.py) один раз строит общий для всего приложения каталог.
+# Строка: (ID, название, файл); ссылка = BASE_URL + ID + "/" + файл.
+# Необязательные данные (parts, size, sha256, requires) - в EXTRA по ID.
 
-    def all(self):
-        return self.dlc
\ No newline at end of file
+SCHEMA = 1
+VERSION = 0
+BASE_URL = "https://github.com/l1ntol/lunia-dlc/releases/download/"
+
+ROWS = (
+    ("EP01", "Get to Work", "Sims4_DLC_EP01_Get_to_Work.zip"),
+    ("EP02", "Get Together", "Sims4_DLC_EP02_Get_Together.zip"),
+    ("EP04", "Cats and Dogs", "Sims4_DLC_EP04_Cats_and_Dogs.zip"),
+    ("EP05", "Seasons", "Sims4_DLC_EP05_Seasons.zip"),
+    ("EP07", "Island Living", "Sims4_DLC_EP07_Island_Living.zip"),
+    ("EP08", "Discover University", "Sims4_DLC_EP08_Discover_University.zip"),
+    ("EP09", "Eco Lifestyle", "Sims4_DLC_EP09_Eco_Lifestyle.zip"),
+    ("EP10", "Snowy Escape", "Sims4_DLC_EP10_Snowy_Escape.zip"),
+    ("EP11", "Cottage Living", "Sims4_DLC_EP11_Cottage_Living.zip"),
+    ("EP12", "High School Years", "Sims4_DLC_EP12_High_School_Years.zip"),
+    ("EP13", "Growing Together", "Sims4_DLC_EP13_Growing_Together.zip"),
+    ("EP14", "Horse Ranch", "Sims4_DLC_EP14_Horse_Ranch.zip"),
+    ("EP15", "For Rent", "Sims4_DLC_EP15_For_Rent.zip"),
+    ("EP16", "Lovestruck", "Sims4_DLC_EP16_Lovestruck.zip"),
+    ("EP17", "Life and Death", "Sims4_DLC_EP17_Life_and_Death.zip"),
+    ("EP18", "Businesses and Hobbies", "Sims4_DLC_EP18_Businesses_and_Hobbies.zip"),
+    ("EP19", "Enchanted by Nature", "Sims4_DLC_EP19_Enchanted_by_Nature_Expansion_Pack.zip"),
+    ("EP20", "Adventure Awaits", "Sims4_DLC_EP20_Adventure_Awaits_Expansion_Pack.zip"),
+    ("GP01", "Outdoor Retreat", "Sims4_DLC_GP01_Outdoor_Retreat.zip"),
+    ("GP02", "Spa Day", "Sims4_DLC_GP02_Spa_Day.zip"),
+    ("GP03", "Dine Out", "Sims4_DLC_GP03_Dine_Out.zip"),
+    ("GP04", "Vampires", "Sims4_DLC_GP04_Vampires.zip"),
+    ("GP05", "Parenthood", "Sims4_DLC_GP05_Parenthood.zip"),
+    ("GP06", "Jungle Adventure", "Sims4_DLC_GP06_Jungle_Adventure.zip"),
+    ("GP07", "StrangerVille", "Sims4_DLC_GP07_StrangerVille.zip"),
+    ("GP08", "Realm of Magic", "Sims4_DLC_GP08_Realm_of_Magic.zip"),
+    ("GP09", "Star Wars: Journey to Batuu", "Sims4_DLC_GP09_Star_Wars_Journey_to_Batuu.zip"),
+    ("GP10", "Dream Home Decorator", "Sims4_DLC_GP10_Dream_Home_Decorator.zip"),
+    ("GP11", "My Wedding Stories", "Sims4_DLC_GP11_My_Wedding_Stories.zip"),
+    ("GP12", "Werewolves", "Sims4_DLC_GP12_Werewolves.zip"),
+    ("SP01", "Luxury Party Stuff", "Sims4_DLC_SP01_Luxury_Party_Stuff.zip"),
+    ("SP02", "Perfect Patio Stuff", "Sims4_DLC_SP02_Perfect_Patio_Stuff.zip"),
+    ("SP03", "Cool Kitchen Stuff", "Sims4_DLC_SP03_Cool_Kitchen_Stuff.zip"),
+    ("SP04", "Spooky Stuff", "Sims4_DLC_SP04_Spooky_Stuff.zip"),
+    ("SP05", "Movie Hangout Stuff", "Sims4_DLC_SP05_Movie_Hangout_Stuff.zip"),
+    ("SP06", "Romantic Garden Stuff", "Sims4_DLC_SP06_Romantic_Garden_Stuff.zip"),
+    ("SP07", "Kids Room Stuff", "Sims4_DLC_SP07_Kids_Room_Stuff.zip"),
+    ("SP08", "Backyard Stuff", "Sims4_DLC_SP08_Backyard_Stuff.zip"),
+    ("SP09", "Vintage Glamour Stuff", "Sims4_DLC_SP09_Vintage_Glamour_Stuff.zip"),
+    ("SP10", "Bowling Night Stuff", "Sims4_DLC_SP10_Bowling_Night_Stuff.zip"),
+    ("SP11", "Fitness Stuff", "Sims4_DLC_SP11_Fitness_Stuff.zip"),
+    ("SP12", "Toddler Stuff", "Sims4_DLC_SP12_Toddler_Stuff.zip"),
+    ("SP13", "Laundry Day Stuff", "Sims4_DLC_SP13_Laundry_Day_Stuff.zip"),
+    ("SP14", "My First Pet Stuff", "Sims4_DLC_SP14_My_First_Pet_Stuff.zip"),
+    ("SP15", "Moschino Stuff", "Sims4_DLC_SP15_Moschino_Stuff.zip"),
+    ("SP16", "Tiny Living Stuff", "Sims4_DLC_SP16_Tiny_Living_Stuff_Pack.zip"),
+    ("SP17", "Nifty Knitting", "Sims4_DLC_SP17_Nifty_Knitting.zip"),
+    ("SP18", "Paranormal Stuff", "Sims4_DLC_SP18_Paranormal_Stuff_Pack.zip"),
+    ("SP20", "Throwback Fit Kit", "Sims4_DLC_SP20_Throwback_Fit_Kit.zip"),
+    ("SP21", "Country Kitchen Kit", "Sims4_DLC_SP21_Country_Kitchen_Kit.zip"),
+    ("SP22", "Bust the Dust Kit", "Sims4_DLC_SP22_Bust_the_Dust_Kit.zip"),
+    ("SP23", "Courtyard Oasis Kit", "Sims4_DLC_SP23_Courtyard_Oasis_Kit.zip"),
+    ("SP24", "Fashion Street Kit", "Sims4_DLC_SP24_Fashion_Street_Kit.zip"),
+    ("SP25", "Industrial Loft Kit", "Sims4_DLC_SP25_Industrial_Loft_Kit.zip"),
+    ("SP26", "Incheon Arrivals Kit", "Sims4_DLC_SP26_Incheon_Arrivals_Kit.zip"),
+    ("SP28", "Modern Menswear Kit", "Sims4_DLC_SP28_Modern_Menswear_Kit.zip"),
+    ("SP29", "Blooming Rooms Kit", "Sims4_DLC_SP29_Blooming_Rooms_Kit.zip"),
+    ("SP30", "Carnaval Streetwear Kit", "Sims4_DLC_SP30_Carnaval_Streetwear_Kit.zip"),
+    ("SP31", "Decor to the Max Kit", "Sims4_DLC_SP31_Decor_to_the_Max_Kit.zip"),
+    ("SP32", "Moonlight Chic Kit", "Sims4_DLC_SP32_Moonlight_Chic_Kit.zip"),
+    ("SP33", "Little Campers Kit", "Sims4_DLC_SP33_Little_Campers_Kit.zip"),
+    ("SP34", "First Fits Kit", "Sims4_DLC_SP34_First_Fits_Kit.zip"),
+    ("SP35", "Desert Luxe Kit", "Sims4_DLC_SP35_Desert_Luxe_Kit.zip"),
+    ("SP36", "Pastel Pop Kit", "Sims4_DLC_SP36_Pastel_Pop_Kit.zip"),
+    ("SP37", "Everyday Clutter Kit", "Sims4_DLC_SP37_Everyday_Clutter_Kit.zip"),
+    ("SP38", "Simtimates Collection Kit", "Sims4_DLC_SP38_Simtimates_Collection_Kit.zip"),
+    ("SP39", "Bathroom Clutter Kit", "Sims4_DLC_SP39_Bathroom_Clutter_Kit.zip"),
+    ("SP40", "Greenhouse Haven Kit", "Sims4_DLC_SP40_Greenhouse_Haven_Kit.zip"),
+    ("SP41", "Basement Treasures Kit", "Sims4_DLC_SP41_Basement_Treasures_Kit.zip"),
+    ("SP42", "Grunge Revival Kit", "Sims4_DLC_SP42_Grunge_Revival_Kit.zip"),
+    ("SP43", "Book Nook Kit", "Sims4_DLC_SP43_Book_Nook_Kit.zip"),
+    ("SP44", "Poolside Splash Kit", "Sims4_DLC_SP44_Poolside_Splash_Kit.zip"),
+    ("SP45", "Modern Luxe Kit", "Sims4_DLC_SP45_Modern_Luxe_Kit.zip"),
+    ("SP46", "Home Chef Hustle Stuff Pack", "Sims4_DLC_SP46_Home_Chef_Hustle_Stuff_Pack.zip"),
+    ("SP47", "Castle Estate Kit", "Sims4_DLC_SP47_Castle_Estate_Kit.zip"),
+    ("SP48", "Goth Galore Kit", "Sims4_DLC_SP48_Goth_Galore_Kit.zip"),
+    ("SP49", "Crystal Creations Stuff Pack", "Sims4_DLC_SP49_Crystal_Creations_Stuff_Pack.zip"),
+    ("SP50", "Urban Homage Kit", "Sims4_DLC_SP50_Urban_Homage_Kit.zip"),
+    ("SP51", "Party Essentials Kit", "Sims4_DLC_SP51_Party_Essentials_Kit.zip"),
+    ("SP52", "Riviera Retreat Kit", "Sims4_DLC_SP52_Riviera_Retreat_Kit.zip"),
+    ("SP53", "Cozy Bistro Kit", "Sims4_DLC_SP53_Cozy_Bistro_Kit.zip"),
+    ("SP54", "Artist Studio Kit", "Sims4_DLC_SP54_Artist_Studio_Kit.zip"),
+    ("SP55", "Storybook Nursery Kit", "Sims4_DLC_SP55_Storybook_Nursery_Kit.zip"),
+    ("SP56", "Sweet Slumber Party Kit", "Sims4_DLC_SP56_Sweet_Slumber_Party_Kit.zip"),
+    ("SP57", "Cozy Kitsch Kit", "Sims4_DLC_SP57_Cozy_Kitsch_Kit.zip"),
+    ("SP58", "Comfy Gamer Kit", "Sims4_DLC_SP58_Comfy_Gamer_Kit.zip"),
+    ("SP59", "Secret Sanctuary Kit", "Sims4_DLC_SP59_Secret_Sanctuary_Kit.zip"),
+    ("SP60", "Casanova Cave Kit", "Sims4_DLC_SP60_Casanova_Cave_Kit.zip"),
+    ("SP61", "Refined Living Room Kit", "Sims4_DLC_SP61_Refined_Living_Room_Kit.zip"),
+    ("SP62", "Business Chic Kit", "Sims4_DLC_SP62_Business_Chic_Kit.zip"),
+    ("SP63", "Sleek Bathroom Kit", "Sims4_DLC_SP63_Sleek_Bathroom_Kit.zip"),
+    ("SP64", "Sweet Allure Kit", "Sims4_DLC_SP64_Sweet_Allure_Kit.zip"),
+    ("SP65", "Restoration Workshop Kit", "Sims4_DLC_SP65_Restoration_Workshop_Kit.zip"),
+    ("SP66", "Golden Years Kit", "Sims4_DLC_SP66_Golden_Years_Kit.zip"),
+    ("SP67", "Kitchen Clutter Kit", "Sims4_DLC_SP67_Kitchen_Clutter_Kit.zip"),
+    ("SP69", "Autumn Apparel Kit", "Sims4_DLC_SP69_Autumn_Apparel_Kit.zip"),
+    ("SP71", "Grange Mudroom Kit", "Sims4_DLC_SP71_Grange_Mudroom_Kit.zip"),
+    ("SP72", "Essential Glam Kit", "Sims4_DLC_SP72_Essential_Glam_Kit.zip"),
+    ("SP73", "Modern Retreat Kit", "Sims4_DLC_SP73_Modern_Retreat_Kit.zip"),
+    ("SP74", "Garden to Table Kit", "Sims4_DLC_SP74_Garden_to_Table_Kit.zip"),
+    ("SP70", "Spongebob Kid's Room Kit", "SP70.zip"),
+    ("SP68", "Spongebob's House Kit", "SP68.zip"),
+    ("SP81", "Prairie Dreams Kit", "SP81.zip"),
+    ("FP01", "Holiday Celebration Pack", "Sims4_DLC_FP01_Holiday_Celebration_Pack.zip"),
+)
+
+EXTRA = {}
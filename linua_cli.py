@@ -0,0 +1,368 @@
+# ================================================================
+#                       LINUA UPDATER v4.0
+#           Headless CLI • By l1ntol / Linua Project
+# ================================================================
+#
+#   python linua_cli.py list    [--game PATH] [--installed | --available]
+#   python linua_cli.py install [DLC ...] [--all] [--game PATH] [--seed DIR]
+#   python linua_cli.py verify  [DLC ...] [--game PATH] [--integrity [--deep]]
+#   python linua_cli.py repair  [--game PATH] [--quick] [--no-integrity]
+#
+# Все команды понимают --json (результат в stdout, лог в stderr).
+# Коды выхода: 0 - успех, 1 - ошибка операции, 2 - неверные аргументы,
+# 3 - неверная папка игры, 130 - прервано пользователем.
+
+import os
+import sys
+import json
+import time
+import argparse
+
+from linua_core import (
+    APP_VERSION, SevenZipFinder, HttpTransport, ArchiveCache, InstallService, InstallScheduler,
+    ProgressTracker, StagingManager, InstallTransaction, DownloadEngine, Extractor, RepairEngine, Logger, ConfigManager,
+    DLCValidator, GameValidator, InstalledIndex, IntegrityVerifier, AdvancedRepair, ExternalDatabase
+)
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_BAD_GAME = 3
+EXIT_INTERRUPTED = 130
+
+PROGRESS_INTERVAL = 5       # секунд между строками прогресса в логе
+
+
+# ================================================================
+#                       CONSOLE LOGGER
+# ================================================================
+class ConsoleLogger(Logger):
+    """Лог в файл (как в GUI) и в stderr, чтобы stdout оставался для --json"""
+
+    def __init__(self, quiet=False):
+        super().__init__()
+        self.quiet = quiet
+
+    def log(self, text):
+        super().log(text)
+        if not self.quiet:
+            print(f"{time.strftime('[%H:%M:%S]')} {text}", file=sys.stderr, flush=True)
+
+
+# ================================================================
+#                            HELPERS
+# ================================================================
+def emit(args, data, text):
+    """Результат команды: JSON для скриптов или строки для человека"""
+    if args.json:
+        print(json.dumps(data, indent=2, ensure_ascii=False))
+    elif text:
+        print(text)
+
+
+def resolve_game(args, config):
+    """Папка игры из аргументов или из config.json GUI"""
+    path = args.game or config.get("game_path", "")
+    if not path or not os.path.isdir(path):
+        return None
+    return path
+
+
+def load_db(args, logger):
+    """База DLC: синхронизированная с GitHub (условный запрос) или из кэша с --no-sync"""
+    external = ExternalDatabase(logger)
+    return external.cached_database() if args.no_sync else external.get_database()
+
+
+def select_dlc(args, db, installed, parser):
+    """Список DLC из аргументов; неизвестные ID - ошибка использования"""
+    if getattr(args, "all", False):
+        return [dlc_id for dlc_id in db if dlc_id.upper() not in installed]
+    unknown = [d for d in args.dlc if d.upper() not in db]
+    if unknown:
+        parser.error(f"unknown DLC: {', '.join(unknown)}")
+    return [d.upper() for d in args.dlc]
+
+
+# ================================================================
+#                           COMMANDS
+# ================================================================
+def cmd_list(args, config, logger, parser):
+    db = load_db(args, logger)
+    game = resolve_game(args, config)
+    installed = InstalledIndex(game).installed() if game else set()
+
+    ids = db.search(args.search) if args.search else sorted(db)
+    rows = []
+    for dlc_id in ids:
+        info = db[dlc_id]
+        is_installed = dlc_id.upper() in installed
+        if args.installed and not is_installed:
+            continue
+        if args.available and is_installed:
+            continue
+        rows.append({
+            "id": dlc_id,
+            "name": info["name"],
+            "category": db.category(dlc_id),
+            "installed": is_installed,
+            "multipart": db.is_multipart(dlc_id),
+        })
+
+    text = "\n".join(
+        f"{'*' if r['installed'] else ' '} [{r['id']}] {r['name']}" for r in rows
+    )
+    emit(args, {"game_path": game, "dlc": rows}, text)
+    return EXIT_OK
+
+
+def cmd_install(args, config, logger, parser):
+    game = resolve_game(args, config)
+    if not game:
+        logger.log("ERROR: Invalid game folder")
+        return EXIT_BAD_GAME
+
+    db = load_db(args, logger)
+    index = InstalledIndex(game)
+    installed = index.installed()
+    selected = select_dlc(args, db, installed, parser)
+    if not selected:
+        emit(args, {"game_path": game, "results": []}, "Nothing to install.")
+        return EXIT_OK
+
+    HttpTransport.configure(
+        pool_per_host=args.http_pool or int(config.get("http_pool_per_host", HttpTransport.POOL_PER_HOST)),
+        retries=args.retries if args.retries is not None else int(config.get("http_retries", HttpTransport.RETRIES)),
+    )
+    if any(db.is_multipart(dlc_id) for dlc_id in selected) and not SevenZipFinder(logger, config).find():
+        logger.log("ERROR: 7-zip required for multipart DLC but not found!")
+        return EXIT_FAILED
+    cache = None if args.no_cache else ArchiveCache.from_config(config, logger, cache_dir=args.cache_dir)
+    if args.seed:
+        # Архивы, скачанные заранее (флешка, другая машина) - установка без сети
+        if not cache:
+            logger.log("ERROR: --seed needs an archive cache (--cache-dir or \"cache_dir\" in config.json)")
+            return EXIT_USAGE
+        if not os.path.isdir(args.seed):
+            logger.log(f"ERROR: Seed folder not found: {args.seed}")
+            return EXIT_USAGE
+        cache.seed(args.seed, db)
+    service = InstallService(
+        logger, cache=cache, segments=args.segments, workers=args.workers,
+        temp_dir=args.temp_dir or config.get(StagingManager.CONFIG_KEY, "")
+    )
+
+    download_slots = args.download_slots or int(config.get("download_slots", 2))
+    extract_slots = args.extract_slots or int(config.get("extract_slots", 1))
+    order = args.order or config.get("install_order", "smallest")
+
+    # Размеры всех архивов заранее: место проверяется до начала, очередь знает размеры
+    plan = service.plan(
+        [(dlc_id, db[dlc_id]) for dlc_id in selected], game,
+        download_slots=download_slots, extract_slots=extract_slots,
+        installed=index.sizes()
+    )
+    db = db.merged(plan["entries"])
+    if not plan["ok"] and not args.force:
+        logger.log(f"ERROR: {plan['reason']}")
+        return EXIT_FAILED
+    logger.log(
+        f"Installing {len(selected)} DLC "
+        f"({download_slots} downloads / {extract_slots} extractions at a time)..."
+    )
+
+    results = {}
+    began = time.time()
+
+    def on_done(dlc_id, ok, reason):
+        results[dlc_id] = (ok, reason)
+        logger.log(f"{'✓' if ok else '✗'} {dlc_id}: {reason}")
+
+    scheduler = service.install_batch(
+        [(dlc_id, db[dlc_id]) for dlc_id in selected], game, on_done,
+        download_slots=download_slots, extract_slots=extract_slots, order=order
+    )
+    try:
+        # Короткий таймаут, чтобы Ctrl+C обрабатывался и на Windows
+        next_report = time.time() + PROGRESS_INTERVAL
+        while not scheduler.wait(0.5):
+            snapshot = service.progress.sample()
+            if time.time() >= next_report and snapshot["items"]:
+                next_report = time.time() + PROGRESS_INTERVAL
+                logger.log(f"Progress: {len(results)}/{len(selected)} DLC • {ProgressTracker.describe(snapshot)}")
+    except KeyboardInterrupt:
+        logger.log("Cancelling installation...")
+        service.cancel_batch()
+        scheduler.wait()
+        return EXIT_INTERRUPTED
+    finally:
+        service.finish_batch()
+
+    rows = [
+        {"id": dlc_id, "ok": results.get(dlc_id, (False, "No result"))[0],
+         "reason": results.get(dlc_id, (False, "No result"))[1]}
+        for dlc_id in selected
+    ]
+    failed = [r for r in rows if not r["ok"]]
+    text = "\n".join(f"{'OK  ' if r['ok'] else 'FAIL'} {r['id']}: {r['reason']}" for r in rows)
+    emit(args, {
+        "game_path": game,
+        "elapsed": round(time.time() - began, 2),
+        "plan": {key: plan[key] for key in ("download", "final", "temp_peak", "unknown")},
+        "results": rows,
+    }, text)
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+def cmd_verify(args, config, logger, parser):
+    game = resolve_game(args, config)
+    if not game:
+        logger.log("ERROR: Invalid game folder")
+        return EXIT_BAD_GAME
+
+    # Прерванная сбоем установка доводится или откатывается до проверки
+    InstallTransaction.recover(game, logger)
+    game_ok, issues = GameValidator.validate_game_path(game, logger)
+    entries = InstalledIndex(game, logger).refresh()
+    targets = [d.upper() for d in args.dlc] if args.dlc else sorted(entries)
+
+    db = load_db(args, logger) if args.integrity else {}
+    verifier = IntegrityVerifier(game, logger, DownloadEngine(logger)) if args.integrity else None
+
+    rows = []
+    for dlc_id in targets:
+        entry = entries.get(dlc_id)
+        valid, reason = DLCValidator.validate_entry(entry) if entry else (False, "Path doesn't exist")
+        row = {"id": dlc_id, "valid": valid, "reason": reason,
+               "files": entry["files"] if entry else 0,
+               "size": entry["size"] if entry else 0}
+        if verifier and valid and dlc_id in db:
+            result = verifier.verify(dlc_id, db[dlc_id], deep=args.deep)
+            if result is not None:
+                broken = result["damaged"] + result["missing"]
+                row.update(damaged=result["damaged"], missing=result["missing"],
+                           unreadable=result["unreadable"], hashed=result["hashed"])
+                if broken:
+                    row.update(valid=False, reason=f"{len(broken)} damaged or missing file(s)")
+                elif result["unreadable"]:
+                    row.update(valid=False, reason=f"{len(result['unreadable'])} file(s) could not be read")
+        rows.append(row)
+
+    lines = [f"Game: {'OK' if game_ok else 'ISSUES'}"] + [f"  - {i}" for i in issues]
+    for r in rows:
+        lines.append(f"{'OK  ' if r['valid'] else 'FAIL'} {r['id']}: {r['reason']}")
+        lines += [f"       damaged: {name}" for name in r.get("damaged", [])]
+        lines += [f"       missing: {name}" for name in r.get("missing", [])]
+        lines += [f"       unreadable: {name}" for name in r.get("unreadable", [])]
+    emit(args, {"game_path": game, "game_ok": game_ok, "issues": issues, "dlc": rows}, "\n".join(lines))
+    return EXIT_OK if game_ok and all(r["valid"] for r in rows) else EXIT_FAILED
+
+
+def cmd_repair(args, config, logger, parser):
+    game = resolve_game(args, config)
+    if not game:
+        logger.log("ERROR: Invalid game folder")
+        return EXIT_BAD_GAME
+
+    InstallTransaction.recover(game, logger)
+    if args.quick:
+        ok = RepairEngine(game, logger, config.get(StagingManager.CONFIG_KEY, "")).run()
+        emit(args, {"game_path": game, "ok": ok}, "Repair finished." if ok else "Repair failed.")
+        return EXIT_OK if ok else EXIT_FAILED
+
+    budgets = dict(config.get("repair_stage_budgets") or {})
+    for item in args.budget or []:
+        stage, _, seconds = item.partition("=")
+        if stage not in AdvancedRepair.BUDGETS or not seconds.replace(".", "", 1).isdigit():
+            parser.error(f"bad --budget {item!r} (stages: {', '.join(AdvancedRepair.BUDGETS)})")
+        budgets[stage] = float(seconds)
+
+    def progress(stage, done, total):
+        if not total:
+            logger.log(f"[REPAIR] Stage: {stage}")
+
+    integrity = None if args.no_integrity else IntegrityVerifier(
+        game, logger, DownloadEngine(logger), Extractor(logger)
+    )
+    repair = AdvancedRepair(
+        game, logger, budgets=budgets, integrity=integrity, db=load_db(args, logger),
+        temp_dir=config.get(StagingManager.CONFIG_KEY, "")
+    )
+    results, report = repair.run_full_repair(progress)
+    emit(args, dict(results, game_path=game), report)
+    return EXIT_FAILED if results["errors"] else EXIT_OK
+
+
+# ================================================================
+#                           ARGUMENTS
+# ================================================================
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--game", help="The Sims 4 folder (default: path saved by the GUI)")
+    common.add_argument("--json", action="store_true", help="machine-readable output on stdout")
+    common.add_argument("-q", "--quiet", action="store_true", help="do not print the log to stderr")
+    common.add_argument("--no-sync", action="store_true",
+                        help="use the cached DLC database, do not contact GitHub")
+
+    parser = argparse.ArgumentParser(
+        prog="linua_cli",
+        description=f"Linua Updater v{APP_VERSION} - headless DLC installer",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", parents=[common], help="list DLC from the database")
+    group = p.add_mutually_exclusive_group()
+    group.add_argument("--installed", action="store_true", help="only installed DLC")
+    group.add_argument("--available", action="store_true", help="only DLC not installed yet")
+    p.add_argument("--search", metavar="TEXT", help="only DLC whose id or name matches every word")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("install", parents=[common], help="install or update DLC")
+    p.add_argument("dlc", nargs="*", help="DLC ids, e.g. EP01 GP02")
+    p.add_argument("--all", action="store_true", help="install every DLC that is not installed")
+    p.add_argument("--download-slots", type=int, help="parallel downloads")
+    p.add_argument("--extract-slots", type=int, help="parallel extractions")
+    p.add_argument("--order", choices=InstallScheduler.ORDERS, help="queue order")
+    p.add_argument("--segments", type=int, help=f"connections per download (default {DownloadEngine.SEGMENTS})")
+    p.add_argument("--workers", type=int, help="extraction threads per archive (default: CPU count)")
+    p.add_argument("--http-pool", type=int, help="pooled connections per host")
+    p.add_argument("--retries", type=int, help="HTTP retries per request")
+    p.add_argument("--temp-dir", help="where to download and unpack (default: next to the game, same drive)")
+    p.add_argument("--cache-dir", help="archive cache folder (overrides config)")
+    p.add_argument("--no-cache", action="store_true", help="do not use the archive cache")
+    p.add_argument("--seed", metavar="DIR", help="add the archives in DIR to the cache before installing")
+    p.add_argument("--force", action="store_true", help="install even when disk space looks low")
+    p.set_defaults(func=cmd_install)
+
+    p = sub.add_parser("verify", parents=[common], help="validate game folder and installed DLC")
+    p.add_argument("dlc", nargs="*", help="DLC ids to check (default: all installed)")
+    p.add_argument("--integrity", action="store_true", help="also compare file hashes with the published archive")
+    p.add_argument("--deep", action="store_true", help="re-hash every file, ignoring cached results")
+    p.set_defaults(func=cmd_verify)
+
+    p = sub.add_parser("repair", parents=[common], help="run the repair checks")
+    p.add_argument("--quick", action="store_true", help="basic repair instead of the full report")
+    p.add_argument("--budget", action="append", metavar="STAGE=SECONDS",
+                   help="time budget for a full-repair stage (repeatable)")
+    p.add_argument("--no-integrity", action="store_true", help="skip the file hash check and re-download")
+    p.set_defaults(func=cmd_repair)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "install" and not args.dlc and not args.all:
+        parser.error("install: give DLC ids or --all")
+
+    config = ConfigManager()
+    logger = ConsoleLogger(quiet=args.quiet)
+    try:
+        return args.func(args, config, logger, parser)
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4489 @@
+# ================================================================
+#                       LINUA UPDATER v4.0
+#        Core engine (без Qt) • By l1ntol / Linua Project
+# ================================================================
+
+import os
+import sys
+import time
+import json
+import atexit
+import errno
+import queue
+import collections
+import shutil
+import struct
+import zlib
+import zipfile
+import tempfile
+import subprocess
+import socket
+import fnmatch
+import hashlib
+import heapq
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from datetime import datetime
+from types import MappingProxyType
+
+APP_VERSION = "4.0"
+
+# ================================================================
+#                   7ZIP DETECTOR (HYBRID) - из старого кода
+# ================================================================
+class SevenZipFinder:
+    """
+    Поиск 7-Zip. Найденный путь, версия и поддержка -mmt запоминаются на
+    процесс и в config.json (ключ "seven_zip") и проверяются по mtime файла,
+    так что повторные вызовы не трогают диск и не запускают процессы
+    """
+
+    POSSIBLE_LOCATIONS = [
+        "7z.exe",
+        "7za.exe",
+        r"C:\Program Files\7-Zip\7z.exe",
+        r"C:\Program Files\7-Zip\7za.exe",
+        r"C:\Program Files (x86)\7-Zip\7z.exe",
+        r"C:\Program Files (x86)\7-Zip\7za.exe",
+    ]
+    # Имена в PATH: полный 7-Zip, standalone-версия и 7-Zip для Linux/macOS
+    PATH_NAMES = ["7z", "7za", "7zz"]
+    CONFIG_KEY = "seven_zip"
+
+    _found = None           # {"path", "mtime", "version", "mmt"}
+    _lock = threading.Lock()
+
+    def __init__(self, logger, config=None):
+        self.logger = logger
+        self.config = config
+
+    def log(self, text):
+        if self.logger:
+            self.logger.log(text)
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    @classmethod
+    def _valid(cls, entry):
+        return bool(entry and entry.get("path") and cls._mtime(entry["path"]) == entry.get("mtime"))
+
+    def find(self):
+        with self._lock:
+            cls = type(self)
+            if self._valid(cls._found):
+                return cls._found["path"]
+
+            saved = self.config.get(self.CONFIG_KEY) if self.config is not None else None
+            if self._valid(saved):
+                cls._found = saved
+                return saved["path"]
+
+            path = self.discover()
+            if not path:
+                cls._found = None
+                return None
+
+            cls._found = dict(self.probe(path), path=path, mtime=self._mtime(path))
+            self.log(f"7-Zip {cls._found['version'] or '(unknown version)'}"
+                     f"{', multithreaded' if cls._found['mmt'] else ''}: {path}")
+            if self.config is not None:
+                self.config.set(self.CONFIG_KEY, cls._found)
+            return path
+
+    def discover(self):
+        # 1) check local directory (same folder as EXE)
+        exe_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
+        local = os.path.join(exe_dir, "7z.exe")
+        if os.path.exists(local):
+            self.log("Using local 7z.exe")
+            return local
+
+        # 2) check system locations
+        for p in self.POSSIBLE_LOCATIONS:
+            if os.path.exists(p):
+                self.log(f"Found 7zip at: {p}")
+                return os.path.abspath(p)
+
+        # 3) check via PATH (без запуска where/which)
+        for name in self.PATH_NAMES:
+            path = shutil.which(name)
+            if path:
+                self.log(f"Found 7zip via PATH: {path}")
+                return path
+
+        # 4) 7zip not found
+        self.log("7z.exe not found. Multipart DLC will not extract.")
+        return None
+
+    @staticmethod
+    def probe(path):
+        """Версия из заголовка 7z ("7-Zip 23.01 (x64)", "p7zip Version 16.02") и поддержка -mmt"""
+        version = ""
+        try:
+            result = subprocess.run(
+                [path], capture_output=True, text=True, timeout=10,
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0)
+            )
+            for token in result.stdout.replace("(", " ").split():
+                head = token.split(".")
+                if len(head) >= 2 and head[0].isdigit() and head[1][:2].isdigit():
+                    version = token
+                    break
+        except Exception:
+            pass
+        try:
+            major, minor = (int(x[:2]) for x in version.split(".")[:2])
+        except ValueError:
+            major, minor = 0, 0
+        # -mmt при распаковке принимается начиная с 9.20
+        return {"version": version, "mmt": (major, minor) >= (9, 20)}
+
+    @classmethod
+    def threads(cls, path, wanted):
+        """Значение для -mmt или None, если этот 7z ключ не поддерживает"""
+        found = cls._found
+        if not (found and found.get("path") == path):
+            found = cls.probe(path)
+        return max(1, wanted) if found["mmt"] else None
+
+
+# ================================================================
+#                HTTP TRANSPORT (общий пул соединений)
+# ================================================================
+class HttpTransport:
+    """
+    Единый HTTP-слой для всех загрузок: общий пул keep-alive соединений
+    с лимитом на хост и повторами с backoff. Каждый поток получает свою
+    Session (cookies/заголовки не делятся), но адаптер и его пулы общие,
+    поэтому соединения переиспользуются между потоками.
+    """
+
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    POOL_HOSTS = 8          # сколько хостов держать в пуле (GitHub редиректит на CDN)
+    POOL_PER_HOST = 16      # соединений на хост
+    RETRIES = 3
+    BACKOFF = 0.5           # 0.5s, 1s, 2s ...
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    _shared = None
+    _shared_options = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, pool_hosts=None, pool_per_host=None, retries=None, backoff=None):
+        # requests/urllib3 грузятся только при первом сетевом запросе (быстрый старт)
+        import urllib3
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        # Отключаем предупреждения SSL (только для локального использования)
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+        retries = self.RETRIES if retries is None else retries
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=self.BACKOFF if backoff is None else backoff,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset({"HEAD", "GET"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        # pool_block: при нехватке соединений поток ждёт, а не открывает лишнее
+        self.adapter = HTTPAdapter(
+            pool_connections=pool_hosts or self.POOL_HOSTS,
+            pool_maxsize=pool_per_host or self.POOL_PER_HOST,
+            max_retries=retry,
+            pool_block=True,
+        )
+        self._local = threading.local()
+
+    @classmethod
+    def shared(cls):
+        """Общий экземпляр на процесс"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(**cls._shared_options)
+            return cls._shared
+
+    @classmethod
+    def configure(cls, **options):
+        """Задать параметры пула; общий экземпляр создаётся при первом запросе"""
+        with cls._shared_lock:
+            cls._shared_options = options
+            cls._shared = None
+
+    def session(self):
+        """Session для текущего потока (создаётся один раз на поток)"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests
+            session = requests.Session()
+            session.headers.update({'User-Agent': self.USER_AGENT})
+            session.mount("https://", self.adapter)
+            session.mount("http://", self.adapter)
+            self._local.session = session
+        return session
+
+
+# ================================================================
+#               DOWNLOAD JOURNAL (докачка после обрыва)
+# ================================================================
+class DownloadJournal:
+    """
+    Sidecar-журнал частичной загрузки: <file>.journal рядом с файлом.
+    Хранит URL, валидаторы (ETag/Last-Modified), ожидаемый размер и
+    список уже скачанных диапазонов [start, end).
+    """
+
+    SAVE_INTERVAL = 1.0  # не чаще раза в секунду
+
+    def __init__(self, out_path):
+        self.path = out_path + ".journal"
+        self.lock = threading.Lock()
+        self.url = ""
+        self.etag = ""
+        self.last_modified = ""
+        self.total = 0
+        self.done = []
+        self._saved_at = 0.0
+
+    def load(self):
+        """Загрузить журнал с диска. False если журнала нет или он битый"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.url = data.get("url", "")
+            self.etag = data.get("etag", "")
+            self.last_modified = data.get("last_modified", "")
+            self.total = int(data.get("total", 0))
+            self.done = [(int(a), int(b)) for a, b in data.get("done", [])]
+            return True
+        except Exception:
+            return False
+
+    def save(self, force=True):
+        """Атомарно сохранить журнал (tmp + os.replace)"""
+        with self.lock:
+            now = time.time()
+            if not force and now - self._saved_at < self.SAVE_INTERVAL:
+                return
+            self._saved_at = now
+            data = {
+                "url": self.url,
+                "etag": self.etag,
+                "last_modified": self.last_modified,
+                "total": self.total,
+                "done": [list(r) for r in self.done],
+            }
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
+
+    def reset(self, url, etag, last_modified, total):
+        with self.lock:
+            self.url = url
+            self.etag = etag or ""
+            self.last_modified = last_modified or ""
+            self.total = total
+            self.done = []
+
+    def matches(self, url, etag, last_modified, total):
+        """Можно ли продолжать: тот же URL, размер и валидатор"""
+        if self.url != url or self.total != total or total <= 0:
+            return False
+        if self.etag or etag:
+            return self.etag == (etag or "")
+        return self.last_modified == (last_modified or "")
+
+    def validator(self):
+        """Значение для заголовка If-Range"""
+        return self.etag or self.last_modified
+
+    def add(self, start, end):
+        """Отметить диапазон [start, end) как скачанный (с объединением)"""
+        if end <= start:
+            return
+        with self.lock:
+            ranges = sorted(self.done + [(start, end)])
+            merged = [ranges[0]]
+            for a, b in ranges[1:]:
+                if a <= merged[-1][1]:
+                    merged[-1] = (merged[-1][0], max(merged[-1][1], b))
+                else:
+                    merged.append((a, b))
+            self.done = merged
+
+    def completed(self):
+        with self.lock:
+            return sum(b - a for a, b in self.done)
+
+    def prefix(self):
+        """Сколько байт от начала файла скачано без пропусков"""
+        with self.lock:
+            return self.done[0][1] if self.done and self.done[0][0] == 0 else 0
+
+    def missing(self):
+        """Недостающие диапазоны [start, end)"""
+        with self.lock:
+            gaps = []
+            pos = 0
+            for a, b in self.done:
+                if a > pos:
+                    gaps.append((pos, a))
+                pos = max(pos, b)
+            if pos < self.total:
+                gaps.append((pos, self.total))
+            return gaps
+
+    def discard(self):
+        for p in (self.path, self.path + ".tmp"):
+            try:
+                if os.path.exists(p):
+                    os.remove(p)
+            except Exception:
+                pass
+
+
+# ================================================================
+#              DOWNLOAD PROGRESS (счётчики + выборка по таймеру)
+# ================================================================
+class _ByteCounter:
+    """Счётчик с единственным писателем (один поток загрузки) - блокировки не нужны"""
+    __slots__ = ("value",)
+
+    def __init__(self, value=0):
+        self.value = value
+
+    def add(self, n):
+        self.value += n
+
+
+class ProgressTask:
+    """Прогресс одного DLC: ожидаемый размер и счётчики всех его потоков загрузки"""
+
+    def __init__(self, key):
+        self.key = key
+        # Запись в dict и list.append атомарны - потоки только добавляют свои данные
+        self.files = {}         # файл/URL -> (размер, байт уже на диске до начала)
+        self.counters = []      # (файл/URL, счётчик)
+        self.discarded = 0      # скачано, но выброшено reset() - идёт только в скорость
+        self.lock = threading.Lock()
+
+    def expect(self, source, size, present=0):
+        """Загрузка source начата: size байт всего, present из них скачано раньше (докачка)"""
+        self.files[source] = (size, present)
+
+    def counter(self, source=None):
+        c = _ByteCounter()
+        with self.lock:
+            self.counters.append((source, c))
+        return c
+
+    def reset(self, source=None):
+        """Загрузка source (или всё DLC) начинается заново - прежние байты больше не прогресс"""
+        with self.lock:
+            dropped = [c for s, c in self.counters if source is None or s == source]
+            self.counters = [(s, c) for s, c in self.counters if not (source is None or s == source)]
+            self.discarded += sum(c.value for c in dropped)
+            if source is None:
+                self.files = {}
+            else:
+                self.files.pop(source, None)
+
+    def received(self):
+        return sum(c.value for _, c in list(self.counters))
+
+    def transferred(self):
+        return self.discarded + self.received()
+
+    def done(self):
+        return sum(present for _, present in list(self.files.values())) + self.received()
+
+    def total(self):
+        return sum(size for size, _ in list(self.files.values()))
+
+
+class ProgressTracker:
+    """
+    Прогресс загрузок: рабочие потоки только увеличивают свои счётчики,
+    а один потребитель (таймер GUI, цикл CLI) вызывает sample() с нужной
+    частотой и получает байты, мгновенную и сглаженную скорость и ETA
+    по каждому DLC и в сумме
+    """
+
+    SMOOTHING = 0.3         # вес нового замера в скользящем среднем скорости
+
+    def __init__(self):
+        self.tasks = {}
+        self.finished = {"done": 0, "total": 0, "transferred": 0}
+        self.lock = threading.Lock()
+        self.last = {}          # key -> (time, transferred, smoothed)
+
+    def task(self, key):
+        with self.lock:
+            if key not in self.tasks:
+                self.tasks[key] = ProgressTask(key)
+            return self.tasks[key]
+
+    def finish(self, key):
+        """DLC готово - его байты остаются в общей сумме"""
+        with self.lock:
+            task = self.tasks.pop(key, None)
+            if task:
+                self.finished["done"] += task.done()
+                self.finished["total"] += max(task.total(), task.done())
+                self.finished["transferred"] += task.transferred()
+
+    def reset(self):
+        with self.lock:
+            self.tasks.clear()
+            self.finished = {"done": 0, "total": 0, "transferred": 0}
+            self.last.clear()
+
+    def _rate(self, key, now, transferred):
+        prev = self.last.get(key)
+        if prev is None or now <= prev[0]:
+            speed, smoothed = 0.0, None
+        else:
+            speed = max(0.0, (transferred - prev[1]) / (now - prev[0]))
+            smoothed = speed if prev[2] is None else prev[2] + self.SMOOTHING * (speed - prev[2])
+        self.last[key] = (now, transferred, smoothed)
+        return speed, smoothed or 0.0
+
+    @staticmethod
+    def _eta(done, total, smoothed):
+        if total <= 0 or smoothed <= 0:
+            return None
+        return max(0.0, (total - done) / smoothed)
+
+    def sample(self):
+        """Снимок прогресса; вызывать из одного потока"""
+        now = time.monotonic()
+        with self.lock:
+            tasks = list(self.tasks.values())
+            finished = dict(self.finished)
+
+        items = {}
+        agg = {"done": finished["done"], "total": finished["total"], "transferred": finished["transferred"]}
+        for task in tasks:
+            done, total, transferred = task.done(), task.total(), task.transferred()
+            speed, smoothed = self._rate(task.key, now, transferred)
+            items[task.key] = {"done": done, "total": total, "speed": speed,
+                               "smoothed": smoothed, "eta": self._eta(done, total, smoothed)}
+            agg["done"] += done
+            agg["total"] += max(total, done)
+            agg["transferred"] += transferred
+
+        # Сглаживание по ушедшим DLC больше не нужно
+        for key in [k for k in self.last if k not in items and k is not None]:
+            del self.last[key]
+        speed, smoothed = self._rate(None, now, agg["transferred"])
+        return {"done": agg["done"], "total": agg["total"], "speed": speed, "smoothed": smoothed,
+                "eta": self._eta(agg["done"], agg["total"], smoothed), "items": items}
+
+    @staticmethod
+    def describe(snapshot):
+        """'1.2/3.4 GB • 25.3 MB/s • ETA 2:13'"""
+        def size(n):
+            return f"{n / 1024 ** 3:.2f} GB" if n >= 1024 ** 3 else f"{n / 1024 ** 2:.0f} MB"
+
+        parts = [f"{size(snapshot['done'])}/{size(snapshot['total'])}" if snapshot["total"] else size(snapshot["done"])]
+        if snapshot["smoothed"] > 0:
+            parts.append(f"{snapshot['smoothed'] / 1024 ** 2:.1f} MB/s")
+        if snapshot["eta"] is not None:
+            minutes, seconds = divmod(int(snapshot["eta"]), 60)
+            hours, minutes = divmod(minutes, 60)
+            parts.append(f"ETA {hours}:{minutes:02d}:{seconds:02d}" if hours else f"ETA {minutes}:{seconds:02d}")
+        return " • ".join(parts)
+
+
+# ================================================================
+#             STAGING (рабочие папки на томе игры)
+# ================================================================
+class StagingManager:
+    """
+    Рабочие папки установки: недокачанные архивы (downloads) и staging
+    распаковки (staging). По умолчанию лежат в папке игры, то есть на том
+    же томе: архив не копируется между дисками, а распакованное дерево
+    переносится на место через os.replace. Место можно задать явно
+    (config "temp_dir" / --temp-dir)
+    """
+
+    DIR_NAME = "_linua_work"
+    CONFIG_KEY = "temp_dir"
+    # Запасное место, если рядом с игрой писать нельзя
+    FALLBACK_ROOT = Path(tempfile.gettempdir()) / "linua_work"
+    STAGING_AGE = 24 * 3600         # брошенные staging-папки старше суток удаляются
+
+    def __init__(self, game_path, root=None, logger=None):
+        self.game = game_path
+        self.root = Path(root) if root else Path(game_path) / self.DIR_NAME
+        self.downloads = self.root / "downloads"
+        self.staging = self.root / "staging"
+        self.logger = logger
+
+    @classmethod
+    def from_config(cls, config, game_path, logger=None, root=None):
+        """Папка из аргумента, иначе из настроек, иначе в папке игры"""
+        return cls(game_path, root or (config.get(cls.CONFIG_KEY, "") if config else ""), logger)
+
+    def log(self, text):
+        if self.logger:
+            self.logger.log(f"[STAGING] {text}")
+
+    def prepare(self):
+        """Создать папки; False если в выбранном месте нельзя писать"""
+        try:
+            self.downloads.mkdir(parents=True, exist_ok=True)
+            self.staging.mkdir(parents=True, exist_ok=True)
+            return True
+        except OSError as e:
+            self.log(f"Cannot create {self.root}: {e}")
+            return False
+
+    def partial_path(self, name):
+        self.downloads.mkdir(parents=True, exist_ok=True)
+        return str(self.downloads / name)
+
+    def make_staging(self):
+        self.staging.mkdir(parents=True, exist_ok=True)
+        return tempfile.mkdtemp(prefix="dlc_", dir=self.staging)
+
+    @staticmethod
+    def device(path):
+        """st_dev ближайшей существующей папки (сама папка может быть ещё не создана)"""
+        path = os.path.abspath(path)
+        while True:
+            try:
+                return os.stat(path).st_dev
+            except OSError:
+                parent = os.path.dirname(path)
+                if parent == path:
+                    return None
+                path = parent
+
+    def same_volume(self):
+        device = self.device(self.root)
+        return device is not None and device == self.device(self.game)
+
+    @staticmethod
+    def move(src, dest):
+        """os.replace, а между томами (заданная вручную папка) - копированием"""
+        try:
+            os.replace(src, dest)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(src, dest)
+
+    @classmethod
+    def commit(cls, staging, out_dir):
+        """
+        Перенести дерево из staging в out_dir: папка, которой ещё нет на
+        месте, переносится одним rename, существующие - пофайлово
+        """
+        def merge(src, dest):
+            os.makedirs(dest, exist_ok=True)
+            with os.scandir(src) as it:
+                entries = list(it)
+            for entry in entries:
+                target = os.path.join(dest, entry.name)
+                if entry.is_dir(follow_symlinks=False) and os.path.isdir(target):
+                    merge(entry.path, target)
+                else:
+                    cls.move(entry.path, target)
+
+        merge(staging, out_dir)
+        shutil.rmtree(staging, ignore_errors=True)
+
+    @classmethod
+    def roots(cls, game_path, root=None):
+        """Все места, где могли остаться рабочие файлы установок в game_path"""
+        found = [Path(game_path) / cls.DIR_NAME, cls.FALLBACK_ROOT]
+        if root and Path(root) not in found:
+            found.insert(0, Path(root))
+        return found
+
+    @classmethod
+    def prune_all(cls, game_path, root=None, max_age_days=7):
+        """prune() для папки игры, заданной temp_dir и запасной во временной папке системы"""
+        return sum(cls(game_path, folder).prune(max_age_days) for folder in cls.roots(game_path, root))
+
+    def prune(self, max_age_days=7):
+        """Удалить брошенные staging-папки и старые недокачанные файлы"""
+        cleaned = 0
+        now = time.time()
+        for folder, limit in ((self.staging, self.STAGING_AGE), (self.downloads, max_age_days * 86400)):
+            try:
+                entries = list(os.scandir(folder))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.stat(follow_symlinks=False).st_mtime >= now - limit:
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path, ignore_errors=True)
+                    else:
+                        os.unlink(entry.path)
+                    cleaned += 1
+                except OSError:
+                    pass
+        self.cleanup()
+        return cleaned
+
+    def cleanup(self):
+        """Убрать пустые рабочие папки (недокачанное остаётся для докачки)"""
+        for folder in (self.staging, self.downloads, self.root):
+            try:
+                folder.rmdir()
+            except OSError:
+                pass
+
+
+# ================================================================
+#                  ADVANCED DOWNLOAD ENGINE - из старого кода
+# ================================================================
+class RangeNotSupported(Exception):
+    """Сервер проигнорировал Range-запрос (ответил 200 вместо 206)"""
+
+
+class DownloadCancelled(Exception):
+    """Загрузка остановлена через DownloadEngine.cancel()"""
+
+
+class StreamHasher:
+    """
+    sha256 файла по мере записи. Данные, идущие подряд от начала файла,
+    хэшируются сразу из сетевых кусков; то, что уже записано другими
+    сегментами или лежало на диске (докачка), дочитывается из кэша ОС
+    по мере того, как непрерывное начало файла растёт (advance)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.pos = 0
+        self.sha = hashlib.sha256()
+        self.lock = threading.Lock()
+
+    def feed(self, offset, data):
+        with self.lock:
+            if offset == self.pos:
+                self.sha.update(data)
+                self.pos += len(data)
+
+    def reset(self):
+        """Файл перекачивается с нуля - уже посчитанные байты недействительны"""
+        with self.lock:
+            self.pos = 0
+            self.sha = hashlib.sha256()
+
+    def advance(self, until):
+        """Дохэшировать уже записанные байты до until; занятый хэшер не ждём"""
+        if until > self.pos and self.lock.acquire(blocking=False):
+            try:
+                self._read(until)
+            finally:
+                self.lock.release()
+
+    def hexdigest(self, total):
+        with self.lock:
+            self._read(total)
+            return self.sha.hexdigest()
+
+    def _read(self, until, buffer=4 * 1024 * 1024):
+        if self.pos >= until:
+            return
+        buf = bytearray(buffer)
+        view = memoryview(buf)
+        with open(self.path, "rb", buffering=0) as f:
+            f.seek(self.pos)
+            while self.pos < until:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                n = min(n, until - self.pos)
+                self.sha.update(view[:n])
+                self.pos += n
+
+
+class DownloadEngine:
+    """
+    Stable downloader - direct downloads only
+    Большие файлы качаются параллельно по HTTP Range сегментам,
+    прерванные загрузки докачиваются по журналу
+    """
+
+    SEGMENTS = 4                            # количество параллельных соединений
+    MIN_SEGMENT_SIZE = 8 * 1024 * 1024      # мелкие файлы не дробим
+    SEGMENT_RETRIES = 2
+    CHECKPOINT_BYTES = 4 * 1024 * 1024      # как часто фиксировать прогресс в журнале
+    CHUNK_SIZE = 1024 * 256
+    MAX_SIZE = 10 * 1024 * 1024 * 1024      # 10GB
+
+    def __init__(self, logger, segments=None, transport=None, progress=None):
+        self.logger = logger
+        self.segments = max(1, segments or self.SEGMENTS)
+        self.cancelled = threading.Event()
+        self.transport = transport or HttpTransport.shared()
+        # ProgressTracker: загрузки считают байты по DLC (см. task())
+        self.progress = progress
+        # Куда качать; InstallService переносит на том игры (StagingManager)
+        self.partial_dir = StagingManager.FALLBACK_ROOT / "downloads"
+
+    def task(self, key):
+        """Счётчики прогресса для DLC key или None без трекера"""
+        return self.progress.task(key) if self.progress else None
+
+    @property
+    def session(self):
+        """Сессия текущего потока поверх общего пула соединений"""
+        return self.transport.session()
+
+    def log(self, text):
+        if self.logger:
+            self.logger.log(text)
+
+    def cancel(self):
+        """Остановить все текущие загрузки этого движка"""
+        self.cancelled.set()
+
+    def reset_cancel(self):
+        self.cancelled.clear()
+
+    def partial_path(self, name):
+        """Стабильный путь для загрузки (переживает отмену и перезапуск)"""
+        self.partial_dir.mkdir(parents=True, exist_ok=True)
+        return str(self.partial_dir / name)
+
+    @staticmethod
+    def discard_partial(out_path):
+        """Удалить скачанный файл вместе с журналом"""
+        DownloadJournal(out_path).discard()
+        try:
+            if os.path.exists(out_path):
+                os.remove(out_path)
+        except Exception:
+            pass
+
+    def download(self, url, out_path, dlc_name=None, size=0, sha256="", task=None):
+        """
+        Основной метод скачивания. size и sha256 из базы DLC (если известны):
+        файл другой длины или с другим хэшем отбрасывается до распаковки
+        """
+        try:
+            # Показываем название DLC вместо ссылки
+            display_text = dlc_name if dlc_name else url
+            self.log(f"Downloading: {display_text}")
+
+            # Для ВСЕХ ссылок используем прямой download
+            hasher = StreamHasher(out_path) if sha256 else None
+            ok, reason = self.download_direct(url, out_path, hasher=hasher, task=task)
+            if ok:
+                ok, reason = self.verify_download(out_path, hasher, size, sha256)
+            return ok, reason
+
+        except Exception as e:
+            return False, f"Download error: {str(e)}"
+
+    def probe(self, url):
+        """HEAD-запрос: размер, поддержка Range, валидаторы и URL после редиректов"""
+        meta = {"total": 0, "ranges": False, "url": url, "etag": "", "last_modified": ""}
+        try:
+            r = self.session.head(url, allow_redirects=True, timeout=15, verify=False)
+            if r.status_code != 200:
+                return meta
+            meta["total"] = int(r.headers.get("content-length", 0) or 0)
+            meta["ranges"] = r.headers.get("accept-ranges", "").lower() == "bytes"
+            meta["url"] = r.url or url
+            meta["etag"] = r.headers.get("etag", "")
+            meta["last_modified"] = r.headers.get("last-modified", "")
+        except Exception:
+            pass
+        return meta
+
+    @staticmethod
+    def split_ranges(ranges, parts, min_size):
+        """
+        Разбить диапазоны [start, end) на не более чем parts кусков,
+        деля самый большой пополам пока куски не меньше min_size
+        """
+        pieces = sorted(ranges, key=lambda r: r[1] - r[0])
+        while pieces and len(pieces) < parts:
+            start, end = pieces[-1]
+            if end - start < min_size * 2:
+                break
+            mid = start + (end - start) // 2
+            pieces = sorted(pieces[:-1] + [(start, mid), (mid, end)], key=lambda r: r[1] - r[0])
+        return sorted(pieces)
+
+    def verify_download(self, out_path, hasher, size=0, sha256=""):
+        """Точная длина и sha256 скачанного файла; при несовпадении файл удаляется"""
+        actual = os.path.getsize(out_path)
+        if size and actual != size:
+            self.discard_partial(out_path)
+            return False, f"Size mismatch ({actual}/{size} bytes)"
+        if hasher:
+            digest = hasher.hexdigest(actual)
+            if digest != sha256.lower():
+                self.discard_partial(out_path)
+                self.log(f"SHA-256 mismatch: expected {sha256.lower()}, got {digest}")
+                return False, "Checksum mismatch - download corrupted"
+        return True, "OK"
+
+    def download_direct(self, url, out_path, _retry=True, hasher=None, task=None):
+        """Прямое скачивание: по диапазонам с докачкой если сервер умеет Range, иначе одним потоком"""
+        import requests
+
+        journal = DownloadJournal(out_path)
+        try:
+            # Создаем родительскую директорию если нужно
+            os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+
+            meta = self.probe(url)
+            total = meta["total"]
+            if total > self.MAX_SIZE:
+                return False, "File too large (max 10GB)"
+
+            if not (meta["ranges"] and total > 0):
+                journal.discard()
+                return self.download_single(url, out_path, journal, hasher, task)
+
+            resumed = (
+                journal.load()
+                and journal.matches(url, meta["etag"], meta["last_modified"], total)
+                and os.path.exists(out_path)
+                and os.path.getsize(out_path) == total
+            )
+            if not resumed:
+                if journal.url:
+                    self.log("Remote file changed, discarding partial download")
+                journal.reset(url, meta["etag"], meta["last_modified"], total)
+                # Предвыделяем файл, чтобы каждый сегмент писал сразу на своё место
+                with open(out_path, "wb") as f:
+                    f.truncate(total)
+                journal.save()
+            elif journal.completed():
+                self.log(f"Resuming download: {journal.completed() / (1024 * 1024):.1f}/"
+                         f"{total / (1024 * 1024):.1f} MB already on disk")
+
+            if task:
+                task.expect(out_path, total, journal.completed())
+            try:
+                return self.download_ranges(meta["url"], out_path, journal, hasher, task)
+            except RangeNotSupported:
+                journal.save()
+                if self.cancelled.is_set():
+                    return False, "Cancelled by user"
+                if resumed and _retry:
+                    # If-Range не совпал: файл на сервере изменился
+                    self.log("Remote file changed, restarting download")
+                    self.discard_partial(out_path)
+                    if hasher:
+                        hasher.reset()
+                    if task:
+                        task.reset(out_path)
+                    return self.download_direct(url, out_path, _retry=False, hasher=hasher, task=task)
+                self.log("Server ignored Range requests, falling back to single stream")
+                return self.download_single(url, out_path, journal, hasher, task)
+
+        except DownloadCancelled:
+            journal.save()
+            return False, "Cancelled by user"
+        except requests.exceptions.Timeout:
+            journal.save()
+            return False, "Connection timeout"
+        except requests.exceptions.ConnectionError:
+            journal.save()
+            return False, "Connection error"
+        except Exception as e:
+            journal.save()
+            return False, f"Direct download error: {str(e)}"
+
+    def download_ranges(self, url, out_path, journal, hasher=None, task=None):
+        """Докачать недостающие диапазоны параллельно в заранее выделенный файл"""
+        missing = journal.missing()
+        if not missing:
+            return True, "OK"
+
+        pieces = self.split_ranges(missing, self.segments, self.MIN_SEGMENT_SIZE)
+        if len(pieces) > 1:
+            left = sum(b - a for a, b in missing)
+            self.log(f"Segmented download: {len(pieces)} connections, {left / (1024 * 1024):.1f} MB")
+
+        stop = threading.Event()
+        with ThreadPoolExecutor(max_workers=len(pieces)) as pool:
+            futures = [
+                pool.submit(self._fetch_range, url, out_path, start, end, journal, stop, hasher,
+                            task.counter(out_path) if task else None)
+                for start, end in pieces
+            ]
+            try:
+                for fut in as_completed(futures):
+                    fut.result()
+            except Exception:
+                # Останавливаем остальные сегменты и пробрасываем первую ошибку
+                stop.set()
+                raise
+            finally:
+                journal.save()
+
+        return True, "OK"
+
+    def _fetch_range(self, url, out_path, start, end, journal, stop, hasher=None, counter=None):
+        """Скачать байты [start, end) и записать их по смещению start"""
+        pos = start
+        attempt = 0
+        while True:
+            checkpoint = pos
+            try:
+                headers = {"Range": f"bytes={pos}-{end - 1}"}
+                if journal.validator():
+                    headers["If-Range"] = journal.validator()
+                with self.session.get(url, headers=headers, stream=True, timeout=30, verify=False) as r:
+                    r.raise_for_status()
+                    if r.status_code != 206:
+                        raise RangeNotSupported(f"HTTP {r.status_code} for range request")
+
+                    with open(out_path, "r+b") as f:
+                        f.seek(pos)
+                        try:
+                            for chunk in r.iter_content(chunk_size=self.CHUNK_SIZE):
+                                if stop.is_set() or self.cancelled.is_set():
+                                    break
+                                if not chunk:
+                                    continue
+                                # Не пишем за пределы своего сегмента
+                                chunk = chunk[:end - pos]
+                                f.write(chunk)
+                                if hasher:
+                                    hasher.feed(pos, chunk)
+                                if counter:
+                                    counter.add(len(chunk))
+                                pos += len(chunk)
+                                if pos - checkpoint >= self.CHECKPOINT_BYTES:
+                                    f.flush()
+                                    journal.add(checkpoint, pos)
+                                    journal.save(force=False)
+                                    checkpoint = pos
+                                    if hasher:
+                                        hasher.advance(journal.prefix())
+                                if pos >= end:
+                                    break
+                        finally:
+                            # Записанное до обрыва - тоже в журнал, иначе в prefix() останется дыра
+                            f.flush()
+                            journal.add(checkpoint, pos)
+                            journal.save(force=False)
+                    if hasher:
+                        hasher.advance(journal.prefix())
+
+                if self.cancelled.is_set():
+                    raise DownloadCancelled()
+                if pos >= end or stop.is_set():
+                    return
+                raise IOError(f"Segment {start}-{end} incomplete ({pos - start}/{end - start})")
+
+            except (RangeNotSupported, DownloadCancelled):
+                raise
+            except Exception:
+                attempt += 1
+                if attempt > self.SEGMENT_RETRIES or stop.is_set():
+                    raise
+                self.log(f"Segment {start}-{end} interrupted, retrying from byte {pos}")
+
+    def fetch_zip_index(self, url, tail_size=1024 * 1024):
+        """
+        Получить central directory ZIP-архива Range-запросом к хвосту файла.
+        Возвращает (meta, [ZipInfo]) или (meta, None) если сервер не умеет Range
+        """
+        meta = self.probe(url)
+        total = meta["total"]
+        if not (meta["ranges"] and total > 0):
+            return meta, None
+
+        start = max(0, total - tail_size)
+        while True:
+            headers = {"Range": f"bytes={start}-{total - 1}"}
+            r = self.session.get(meta["url"], headers=headers, timeout=30, verify=False)
+            r.raise_for_status()
+            if r.status_code != 206:
+                return meta, None
+            try:
+                with zipfile.ZipFile(_TailFile(total, start, r.content)) as z:
+                    return meta, z.infolist()
+            except _NeedMoreTail as e:
+                # Central directory больше хвоста - дочитываем от его начала
+                if e.offset >= start:
+                    raise zipfile.BadZipFile("Invalid central directory offset")
+                start = e.offset
+
+    def iter_stream(self, url, start=0, end=None, depth=64, task=None):
+        """
+        Поток байтов файла [start, end). Сеть читается в отдельном потоке
+        в ограниченную очередь, чтобы запись на диск не тормозила приём
+        """
+        chunks = queue.Queue(maxsize=depth)
+        stop = threading.Event()
+        done = object()
+        counter = task.counter(url) if task else None
+
+        def pump():
+            try:
+                ranged = start or end is not None
+                headers = {"Range": f"bytes={start}-{'' if end is None else end - 1}"} if ranged else {}
+                with self.session.get(url, headers=headers, stream=True, timeout=30, verify=False) as r:
+                    r.raise_for_status()
+                    if ranged and r.status_code != 206:
+                        raise RangeNotSupported(f"HTTP {r.status_code} for range request")
+                    for chunk in r.iter_content(chunk_size=self.CHUNK_SIZE):
+                        if stop.is_set():
+                            return
+                        if self.cancelled.is_set():
+                            raise DownloadCancelled()
+                        if chunk:
+                            chunks.put(chunk)
+                            if counter:
+                                counter.add(len(chunk))
+                chunks.put(done)
+            except Exception as e:
+                chunks.put(e)
+
+        worker = threading.Thread(target=pump, daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = chunks.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            # Освобождаем pump, если он ждёт места в очереди
+            while worker.is_alive():
+                try:
+                    chunks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+
+    def download_single(self, url, out_path, journal=None, hasher=None, task=None):
+        """Скачивание одним потоком (сервер без поддержки Range)"""
+        with self.session.get(url, stream=True, timeout=30, verify=False) as r:
+            r.raise_for_status()
+
+            if r.status_code != 200:
+                return False, f"HTTP {r.status_code}"
+
+            # Проверка content-type для безопасности
+            content_type = r.headers.get('content-type', '')
+            valid_types = ['application/zip', 'application/octet-stream',
+                          'application/x-zip-compressed', 'application/x-7z-compressed']
+
+            if not any(ct in content_type for ct in valid_types):
+                self.log(f"Warning: Unexpected content type: {content_type}")
+
+            total = int(r.headers.get("content-length", 0))
+            # УВЕЛИЧИЛИ ЛИМИТ ДО 10GB ДЛЯ КРУПНЫХ DLC
+            if total > self.MAX_SIZE:
+                return False, "File too large (max 10GB)"
+
+            downloaded = 0
+            counter = None
+            if hasher:
+                # Файл пишется с начала, даже если сегменты успели что-то посчитать
+                hasher.reset()
+            if task:
+                # Сегменты, успевшие что-то скачать, не в счёт - файл пишется с начала
+                task.reset(out_path)
+                task.expect(out_path, total)
+                counter = task.counter(out_path)
+            with open(out_path, "wb") as f:
+                for chunk in r.iter_content(chunk_size=self.CHUNK_SIZE):
+                    if self.cancelled.is_set():
+                        raise DownloadCancelled()
+                    if chunk:
+                        f.write(chunk)
+                        if hasher:
+                            hasher.feed(downloaded, chunk)
+                        if counter:
+                            counter.add(len(chunk))
+                        downloaded += len(chunk)
+
+            # Проверить что файл не пустой
+            if downloaded == 0:
+                return False, "Empty file downloaded"
+
+            # Обрыв соединения даёт укороченный файл - длина должна совпасть точно
+            if total > 0 and downloaded != total:
+                return False, f"File incomplete ({downloaded}/{total})"
+
+            # Фиксируем завершённую загрузку, чтобы повторный запуск её не качал
+            if journal:
+                journal.reset(url, r.headers.get("etag", ""), r.headers.get("last-modified", ""), downloaded)
+                journal.add(0, downloaded)
+                journal.save()
+
+            return True, "OK"
+
+
+# ================================================================
+#             ARCHIVE CACHE (кэш архивов между установками)
+# ================================================================
+class ArchiveCache:
+    """
+    Необязательный кэш скачанных архивов, общий для переустановок и
+    нескольких машин (папка может лежать на сетевом диске).
+    Объекты адресуются ключом sha256(url|etag|size), index.json хранит
+    метаданные и время последнего использования для LRU-вытеснения.
+    """
+
+    INDEX = "index.json"
+
+    def __init__(self, root, max_bytes=50 * 1024 ** 3, logger=None):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.max_bytes = max_bytes
+        self.logger = logger
+        self.lock = threading.Lock()
+        self.objects.mkdir(parents=True, exist_ok=True)
+
+    def log(self, text):
+        if self.logger:
+            self.logger.log(f"[CACHE] {text}")
+
+    @classmethod
+    def from_config(cls, config, logger=None, cache_dir=None):
+        """Кэш из настроек (cache_dir пустой - кэш выключен)"""
+        cache_dir = cache_dir or config.get("cache_dir", "")
+        if not cache_dir:
+            return None
+        try:
+            max_gb = float(config.get("cache_max_gb", 50))
+            cache = cls(cache_dir, int(max_gb * 1024 ** 3), logger)
+            cache.log(f"Using archive cache: {cache_dir}")
+            return cache
+        except Exception as e:
+            if logger:
+                logger.log(f"[CACHE] Cache disabled: {e}")
+            return None
+
+    @staticmethod
+    def key(url, etag="", size=0):
+        return hashlib.sha256(f"{url}|{etag}|{size}".encode("utf-8")).hexdigest()
+
+    def _load(self):
+        try:
+            with open(self.root / self.INDEX, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _save(self, index):
+        # Уникальное имя tmp: в папку могут писать несколько машин
+        tmp = self.root / f"{self.INDEX}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=1)
+        os.replace(tmp, self.root / self.INDEX)
+
+    def lookup(self, url, size=0, sha256="", probe=None):
+        """
+        Найти архив по URL. Если в базе DLC известны размер или sha256,
+        кэшированная копия должна с ними совпадать. Копия без совпавшего
+        sha256 сверяется с ETag/Content-Length сервера через probe(url)
+        (HEAD): архив могли перевыложить под тем же URL. Без сети копия
+        отдаётся как есть
+        """
+        with self.lock:
+            index = self._load()
+            candidates = []
+            for key, entry in sorted(
+                ((k, e) for k, e in index.items() if e.get("url") == url),
+                key=lambda item: item[1].get("last_used", 0),
+                reverse=True
+            ):
+                try:
+                    actual = (self.objects / key).stat().st_size
+                except OSError:
+                    continue
+                if actual != entry.get("size") or (size and actual != size):
+                    continue
+                if sha256 and entry.get("sha256") and entry["sha256"] != sha256.lower():
+                    continue
+                candidates.append((key, entry))
+
+        remote = None
+        for key, entry in candidates:
+            trusted = sha256 and entry.get("sha256") == sha256.lower()
+            if not trusted and probe:
+                if remote is None:
+                    # Сеть - вне блокировки индекса
+                    remote = probe(url)
+                if not self.current(entry, remote):
+                    continue
+            with self.lock:
+                index = self._load()
+                if key in index:
+                    index[key]["last_used"] = time.time()
+                    self._save(index)
+            return str(self.objects / key)
+        if remote is not None and candidates:
+            self.log(f"{url.rsplit('/', 1)[-1]} changed on the server, cached copy skipped")
+        return None
+
+    @staticmethod
+    def current(entry, remote):
+        """Копия совпадает с тем, что сейчас отдаёт сервер (нет ответа - считаем офлайн)"""
+        if not (remote.get("total") or remote.get("etag")):
+            return True
+        if remote.get("total") and remote["total"] != entry.get("size"):
+            return False
+        if remote.get("etag") and entry.get("etag") and remote["etag"] != entry["etag"]:
+            return False
+        return True
+
+    def store(self, url, src_path, etag="", sha256="", move=False):
+        """Положить проверенный архив в кэш (перемещением, если тот же диск)"""
+        try:
+            size = os.path.getsize(src_path)
+            key = self.key(url, etag, size)
+            dest = self.objects / key
+            if not dest.exists():
+                tmp = self.objects / f"{key}.{os.getpid()}.tmp"
+                try:
+                    if not move:
+                        raise OSError("copy requested")
+                    os.replace(src_path, tmp)
+                except OSError:
+                    shutil.copyfile(src_path, tmp)
+                os.replace(tmp, dest)
+
+            with self.lock:
+                index = self._load()
+                index[key] = {
+                    "url": url,
+                    "etag": etag,
+                    "size": size,
+                    "sha256": (sha256 or index.get(key, {}).get("sha256", "")).lower(),
+                    "last_used": time.time(),
+                }
+                self._evict(index)
+                self._save(index)
+            return str(dest)
+        except Exception as e:
+            self.log(f"Failed to store {os.path.basename(src_path)}: {e}")
+            return None
+
+    def _evict(self, index):
+        """LRU: удаляем давно не использованные архивы, пока не влезем в лимит"""
+        total = sum(e.get("size", 0) for e in index.values())
+        for key, entry in sorted(index.items(), key=lambda item: item[1].get("last_used", 0)):
+            if total <= self.max_bytes:
+                break
+            try:
+                (self.objects / key).unlink()
+            except OSError:
+                pass
+            total -= entry.get("size", 0)
+            del index[key]
+            self.log(f"Evicted {os.path.basename(entry.get('url', key))}")
+
+    def materialize(self, cached_path, out_path):
+        """Выложить архив из кэша под нужным именем (жёсткая ссылка или копия)"""
+        if os.path.exists(out_path):
+            os.remove(out_path)
+        try:
+            os.link(cached_path, out_path)
+        except OSError:
+            shutil.copyfile(cached_path, out_path)
+        return out_path
+
+    def seed(self, directory, db):
+        """
+        Заполнить кэш из папки с архивами для полностью офлайн-установки:
+        файлы сопоставляются с базой DLC по имени файла из URL
+        """
+        by_name = {}
+        for info in db.values():
+            for url in [info.get("url")] + list(info.get("parts", [])):
+                if url:
+                    by_name[url.rsplit("/", 1)[-1].lower()] = url
+
+        added = 0
+        for f in Path(directory).iterdir():
+            url = by_name.get(f.name.lower())
+            if url and f.is_file() and self.store(url, str(f)):
+                added += 1
+        self.log(f"Seeded {added} archives from {directory}")
+        return added
+
+
+# ================================================================
+#                     ZIP / 7Z SAFE EXTRACTOR - из старого кода
+# ================================================================
+class Extractor:
+    COPY_BUFFER = 1024 * 1024
+    SEVEN_IDLE_TIMEOUT = 300                # 7z без прогресса дольше - считаем зависшим
+    SEVEN_MIN_RATE = 2 * 1024 * 1024        # байт/с: общий лимит 7z растёт с размером архива
+
+    def __init__(self, logger, workers=None, staging=None):
+        self.logger = logger
+        # По умолчанию - по потоку на ядро (zlib отпускает GIL при распаковке)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        # StagingManager; без него staging - в out_dir/_linua_work (см. make_staging)
+        self.staging = staging
+
+    def log(self, text):
+        if self.logger:
+            self.logger.log(text)
+
+    def extract_zip(self, file, out_dir, progress=None):
+        """
+        Распаковать ZIP за один проход: CRC каждого элемента проверяется при
+        записи в staging-папку, в out_dir всё переносится только если
+        проверку прошли все элементы. Элементы распаковываются параллельно,
+        progress(done_bytes, total_bytes) вызывается по мере готовности
+        """
+        staging = None
+        try:
+            # Создаем директорию для распаковки
+            os.makedirs(out_dir, exist_ok=True)
+            staging = self.make_staging(out_dir)
+
+            with zipfile.ZipFile(file, "r") as z:
+                members = z.infolist()
+
+            # Все папки создаём заранее, один раз на уникальный путь
+            jobs = []
+            folders = set()
+            for member in members:
+                target = self.member_path(staging, member.filename)
+                if target is None:
+                    continue
+                if member.is_dir():
+                    folders.add(target)
+                else:
+                    folders.add(os.path.dirname(target))
+                    jobs.append((member, target))
+            for folder in sorted(folders):
+                os.makedirs(folder, exist_ok=True)
+
+            shards = self.shard(jobs, self.workers)
+            tracker = _ExtractProgress(sum(m.file_size for m, _ in jobs), progress)
+            stop = threading.Event()
+
+            if len(shards) <= 1:
+                for shard in shards:
+                    self._extract_shard(file, shard, tracker, stop)
+            else:
+                with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+                    futures = [pool.submit(self._extract_shard, file, shard, tracker, stop) for shard in shards]
+                    try:
+                        for fut in as_completed(futures):
+                            fut.result()
+                    except Exception:
+                        stop.set()
+                        raise
+
+            self.commit_staging(staging, out_dir)
+            staging = None
+            self.log(f"Extracted {len(jobs)} files from ZIP")
+            return True, "OK"
+        except zipfile.BadZipFile as e:
+            return False, f"Invalid or corrupted ZIP file: {e}"
+        except Exception as e:
+            return False, f"ZIP extraction error: {str(e)}"
+        finally:
+            self.drop_staging(staging, out_dir)
+
+    @staticmethod
+    def shard(jobs, count):
+        """Разложить элементы по count группам примерно равного объёма (крупные первыми)"""
+        shards = [[] for _ in range(max(1, min(count, len(jobs))))]
+        loads = [0] * len(shards)
+        for job in sorted(jobs, key=lambda j: j[0].file_size, reverse=True):
+            i = loads.index(min(loads))
+            shards[i].append(job)
+            loads[i] += job[0].file_size
+        return [s for s in shards if s]
+
+    def _extract_shard(self, file, shard, tracker, stop):
+        """Распаковать группу элементов через собственный дескриптор ZipFile"""
+        with zipfile.ZipFile(file, "r") as z:
+            for member, target in shard:
+                if stop.is_set():
+                    return
+                # ZipExtFile сам сверяет CRC в конце чтения
+                with z.open(member) as src, open(target, "wb") as dst:
+                    while True:
+                        data = src.read(self.COPY_BUFFER)
+                        if not data:
+                            break
+                        dst.write(data)
+                        tracker.add(len(data))
+
+    def make_staging(self, out_dir):
+        """
+        Staging-папка на томе out_dir (перенос через rename). Без заданного
+        StagingManager - в out_dir/_linua_work, где брошенные папки найдёт prune_all
+        """
+        return (self.staging or StagingManager(out_dir)).make_staging()
+
+    def drop_staging(self, staging, out_dir):
+        """Удалить staging-папку (если перенос не состоялся) и пустые рабочие папки в out_dir"""
+        if staging:
+            shutil.rmtree(staging, ignore_errors=True)
+        if not self.staging:
+            StagingManager(out_dir).cleanup()
+
+    def commit_staging(self, staging, out_dir, merge=False):
+        """
+        Перенести проверенные файлы из staging в out_dir: папки DLC - транзакцией
+        (InstallTransaction), с merge - пофайлово поверх установленных (дельта)
+        """
+        if merge:
+            StagingManager.commit(staging, out_dir)
+        else:
+            InstallTransaction(out_dir, staging, self.logger).commit()
+
+    @staticmethod
+    def member_path(out_dir, filename):
+        """Безопасный путь для элемента архива (как в zipfile: без диска, '..' и '.')"""
+        arcname = filename.replace('/', os.path.sep)
+        if os.path.altsep:
+            arcname = arcname.replace(os.path.altsep, os.path.sep)
+        arcname = os.path.splitdrive(arcname)[1]
+        parts = [x for x in arcname.split(os.path.sep) if x not in ('', os.path.curdir, os.path.pardir)]
+        return os.path.normpath(os.path.join(out_dir, *parts)) if parts else None
+
+    def extract_zip_stream(self, chunks, members, out_dir, start=0, merge=False):
+        """
+        Распаковать ZIP прямо из сетевого потока (поток начинается со смещения
+        start): элементы идут по порядку смещений, размеры и CRC берутся из
+        central directory. merge - только часть элементов (дельта): файлы
+        кладутся поверх установленных, а не заменяют папку DLC
+        """
+        staging = None
+        try:
+            os.makedirs(out_dir, exist_ok=True)
+            staging = self.make_staging(out_dir)
+            reader = _ChunkReader(chunks, start)
+            extracted = 0
+
+            for member in sorted(members, key=lambda m: m.header_offset):
+                target = self.member_path(staging, member.filename)
+                if target is None:
+                    continue
+
+                reader.skip(member.header_offset - reader.pos)
+                header = reader.read_exact(zipfile.sizeFileHeader)
+                fields = struct.unpack(zipfile.structFileHeader, header)
+                if fields[0] != zipfile.stringFileHeader:
+                    return False, f"Bad local header: {member.filename}"
+                name_len, extra_len = fields[-2:]
+                reader.skip(name_len + extra_len)
+
+                if member.is_dir():
+                    os.makedirs(target, exist_ok=True)
+                    continue
+
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                if member.flag_bits & 0x1:
+                    return False, f"Encrypted ZIP member: {member.filename}"
+                if member.compress_type == zipfile.ZIP_DEFLATED:
+                    inflater = zlib.decompressobj(-15)
+                elif member.compress_type == zipfile.ZIP_STORED:
+                    inflater = None
+                else:
+                    return False, f"Unsupported compression for streaming: {member.filename}"
+
+                crc = 0
+                size = 0
+                left = member.compress_size
+                with open(target, "wb") as f:
+                    while left > 0:
+                        data = reader.read(min(left, self.COPY_BUFFER))
+                        left -= len(data)
+                        if inflater:
+                            data = inflater.decompress(data)
+                        f.write(data)
+                        crc = zlib.crc32(data, crc)
+                        size += len(data)
+                    if inflater:
+                        data = inflater.flush()
+                        f.write(data)
+                        crc = zlib.crc32(data, crc)
+                        size += len(data)
+
+                if crc != member.CRC or size != member.file_size:
+                    return False, f"Corrupted ZIP file: {member.filename}"
+                extracted += 1
+
+            self.commit_staging(staging, out_dir, merge)
+            staging = None
+            self.log(f"Extracted {extracted} files from ZIP stream")
+            return True, "OK"
+        except EOFError:
+            return False, "Download interrupted during extraction"
+        except Exception as e:
+            return False, f"ZIP stream extraction error: {str(e)}"
+        finally:
+            self.drop_staging(staging, out_dir)
+
+    @staticmethod
+    def volume_size(archive_path):
+        """Размер архива; для многотомного (.7z.001) - сумма всех томов"""
+        base, ext = os.path.splitext(archive_path)
+        if not ext[1:].isdigit():
+            return os.path.getsize(archive_path)
+        total = 0
+        index = int(ext[1:])
+        while os.path.exists(f"{base}.{str(index).zfill(len(ext) - 1)}"):
+            total += os.path.getsize(f"{base}.{str(index).zfill(len(ext) - 1)}")
+            index += 1
+        return total
+
+    def extract_7z(self, seven, archive_path, out_dir, progress=None, stop=None, threads=None):
+        """
+        Распаковать 7z архив (многотомный - по первой части), threads - значение -mmt.
+        7z запускается через Popen, прогресс -bsp1 читается по мере вывода
+        и передаётся в progress(percent, 100). Процесс снимается, если
+        долго нет прогресса или общий лимит (растёт с размером архива)
+        исчерпан, а также по stop (threading.Event)
+        """
+        proc = None
+        staging = None
+        finished = threading.Event()
+        try:
+            # Проверяем существование 7z
+            if not os.path.exists(seven):
+                return False, "7z.exe not found"
+                
+            # Проверяем существование архива
+            if not os.path.exists(archive_path):
+                return False, "Archive file not found"
+                
+            # Распаковываем в staging - на место попадает только целиком распакованное дерево
+            os.makedirs(out_dir, exist_ok=True)
+            staging = self.make_staging(out_dir)
+
+            size = self.volume_size(archive_path)
+            limit = max(self.SEVEN_IDLE_TIMEOUT, size / self.SEVEN_MIN_RATE)
+            
+            cmd = [
+                seven,
+                "x",
+                archive_path,
+                f"-o{staging}",
+                "-y",
+                "-bsp1",    # прогресс в stdout
+                "-bse1",    # ошибки туда же - один канал, без риска зависнуть на заполненном pipe
+                "-bb0"
+            ]
+            if threads:
+                cmd.append(f"-mmt{threads}")
+            
+            self.log(f"Running: {' '.join(cmd)}")
+            proc = subprocess.Popen(
+                cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0)
+            )
+
+            state = {"last": time.time(), "percent": -1, "killed": None}
+            began = time.time()
+
+            def watchdog():
+                while not finished.wait(0.5):
+                    now = time.time()
+                    if stop is not None and stop.is_set():
+                        state["killed"] = "Cancelled by user"
+                    elif now - state["last"] > self.SEVEN_IDLE_TIMEOUT:
+                        state["killed"] = f"7z extraction stalled (no progress for {self.SEVEN_IDLE_TIMEOUT}s)"
+                    elif now - began > limit:
+                        state["killed"] = f"7z extraction timeout ({limit:.0f}s)"
+                    if state["killed"]:
+                        proc.kill()
+                        return
+
+            guard = threading.Thread(target=watchdog, daemon=True)
+            guard.start()
+
+            # 7z перерисовывает строку прогресса через \b и \r - режем по ним
+            messages = []
+            pending = b""
+            while True:
+                data = proc.stdout.read1(4096)
+                if not data:
+                    break
+                pending += data.replace(b"\b", b"\n").replace(b"\r", b"\n")
+                *lines, pending = pending.split(b"\n")
+                for line in lines:
+                    text = line.decode("utf-8", "replace").strip()
+                    if not text:
+                        continue
+                    head = text.split("%", 1)[0].strip()
+                    if "%" in text and head.isdigit():
+                        state["last"] = time.time()
+                        percent = int(head)
+                        if percent != state["percent"]:
+                            state["percent"] = percent
+                            if progress:
+                                progress(percent, 100)
+                    else:
+                        messages = (messages + [text])[-20:]
+
+            proc.wait()
+            finished.set()
+            guard.join()
+
+            if state["killed"]:
+                return False, state["killed"]
+            if proc.returncode != 0:
+                errors = [m for m in messages if "error" in m.lower()] or messages[-3:]
+                return False, f"7z error: {' | '.join(errors) or f'exit code {proc.returncode}'}"
+            self.log(f"7z output: {' | '.join(messages[-3:])[:200]}")
+            self.commit_staging(staging, out_dir)
+            staging = None
+            return True, "OK"
+
+        except FileNotFoundError:
+            return False, "7z.exe not found in PATH"
+        except Exception as e:
+            return False, f"7z error: {str(e)}"
+        finally:
+            finished.set()
+            if proc and proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            self.drop_staging(staging, out_dir)
+
+
+class _ExtractProgress:
+    """Суммирует прогресс от нескольких потоков распаковки"""
+
+    def __init__(self, total, callback):
+        self.total = total
+        self.callback = callback
+        self.done = 0
+        self.lock = threading.Lock()
+
+    def add(self, n):
+        if not self.callback:
+            return
+        with self.lock:
+            self.done += n
+            done = self.done
+        self.callback(done, self.total)
+
+
+# ================================================================
+#            STREAMING ZIP (скачивание + распаковка одновременно)
+# ================================================================
+class _NeedMoreTail(Exception):
+    """zipfile попросил байты левее скачанного хвоста"""
+
+    def __init__(self, offset):
+        super().__init__(offset)
+        self.offset = offset
+
+
+class _TailFile:
+    """Файлоподобный объект размера total, у которого есть только хвост с offset"""
+
+    def __init__(self, total, offset, data):
+        self.total = total
+        self.offset = offset
+        self.data = data
+        self.pos = 0
+
+    def seek(self, pos, whence=0):
+        if whence == 1:
+            pos += self.pos
+        elif whence == 2:
+            pos += self.total
+        self.pos = pos
+        return self.pos
+
+    def tell(self):
+        return self.pos
+
+    def read(self, n=-1):
+        if self.pos < self.offset:
+            raise _NeedMoreTail(self.pos)
+        start = self.pos - self.offset
+        end = len(self.data) if n is None or n < 0 else start + n
+        chunk = self.data[start:end]
+        self.pos += len(chunk)
+        return chunk
+
+    def close(self):
+        pass
+
+
+class _ChunkReader:
+    """Последовательное чтение из итератора чанков с учётом абсолютной позиции"""
+
+    def __init__(self, chunks, pos=0):
+        self.chunks = iter(chunks)
+        self.buf = b""
+        self.at = 0
+        self.pos = pos
+
+    def _fill(self):
+        if self.at >= len(self.buf):
+            self.buf = next(self.chunks, b"")
+            self.at = 0
+            if not self.buf:
+                raise EOFError("Unexpected end of stream")
+
+    def read(self, n):
+        """Прочитать от 1 до n байт"""
+        self._fill()
+        data = self.buf[self.at:self.at + n]
+        self.at += len(data)
+        self.pos += len(data)
+        return data
+
+    def read_exact(self, n):
+        parts = []
+        while n > 0:
+            data = self.read(n)
+            parts.append(data)
+            n -= len(data)
+        return b"".join(parts)
+
+    def skip(self, n):
+        if n < 0:
+            raise ValueError("Overlapping ZIP members")
+        while n > 0:
+            n -= len(self.read(n))
+
+
+
+# ================================================================
+#                    DLC INSTALL ENGINE - из старого кода
+# ================================================================
+class SingleDLCInstaller:
+    """Установка одиночных DLC"""
+
+    STREAMABLE = (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+
+    def __init__(self, dlc_id, info, game_path, downloader, extractor, logger,
+                 streaming=True, slots=None, cache=None, delta=True):
+        self.dlc = dlc_id
+        self.info = info
+        self.game = game_path
+        self.dl = downloader
+        self.ex = extractor
+        self.logger = logger
+        self.cache = cache
+        # С кэшем качаем в файл, чтобы положить архив в кэш
+        self.streaming = streaming and cache is None
+        # Лимиты планировщика (сеть / распаковка); без планировщика - без ограничений
+        self.slots = slots or InstallSlots.unlimited()
+        # Уже установленное DLC обновляем только изменёнными файлами
+        self.delta = delta
+
+    def log(self, t):
+        if self.logger:
+            self.logger.log(f"[{self.dlc}] {t}")
+
+    def completed(self, url, members):
+        """Запомнить установленное состояние (для будущих дельта-обновлений)"""
+        InstalledManifest(self.game, self.dlc).record(url, members)
+        self.log("Installation completed successfully")
+        return True, "OK"
+
+    def run_streaming(self, url):
+        """
+        Конвейерная установка без временного файла: central directory берём
+        Range-запросом к хвосту, затем распаковываем элементы по мере скачивания.
+        Возвращает None если сервер/архив не подходят для этого режима
+        """
+        meta, members = self.dl.fetch_zip_index(url)
+        if not members:
+            return None
+        if any(m.compress_type not in self.STREAMABLE or m.flag_bits & 0x1 for m in members):
+            return None
+
+        self.log("Downloading and extracting (streaming)...")
+        start = min(m.header_offset for m in members)
+        task = self.dl.task(self.dlc)
+        if task:
+            task.expect(meta["url"], meta["total"] - start)
+        chunks = self.dl.iter_stream(meta["url"], start, task=task)
+        try:
+            ok, reason = self.ex.extract_zip_stream(chunks, members, self.game, start)
+        finally:
+            chunks.close()
+        return self.completed(url, members) if ok else (ok, reason)
+
+    def run(self):
+        temp = None
+        keep_partial = False
+        try:
+            url = self.info.get("url")
+            if not url:
+                return False, "URL missing"
+
+            # Сначала кэш архивов - без обращения к сети
+            if self.cache:
+                cached = self.cache.lookup(
+                    url, self.info.get("size", 0), self.info.get("sha256", ""), probe=self.dl.probe
+                )
+                if cached:
+                    self.log("Using cached archive")
+                    with self.slots.extract():
+                        ok, reason = self.ex.extract_zip(cached, self.game)
+                    if ok:
+                        with zipfile.ZipFile(cached) as z:
+                            return self.completed(url, z.infolist())
+                    self.log(f"Cached archive unusable ({reason}), downloading")
+
+            # DLC уже стоит - пробуем докачать только изменившиеся файлы
+            if self.delta and os.path.isdir(os.path.join(self.game, self.dlc)):
+                updater = DeltaUpdater(self.dlc, self.info, self.game, self.dl, self.ex, self.logger, self.slots)
+                result = updater.run()
+                if result is not None:
+                    return result
+
+            # Стабильный путь для DLC: недокачанный файл продолжится при повторе
+            temp = self.dl.partial_path(f"{self.dlc}.zip")
+
+            # Потоковый режим, если нет начатой загрузки, которую можно докачать.
+            # С известным sha256 архив сначала проверяется целиком, потом распаковывается
+            if self.streaming and not self.info.get("sha256") and not os.path.exists(DownloadJournal(temp).path):
+                try:
+                    # Распаковка идёт со скоростью сети - занимаем только сетевой слот
+                    with self.slots.download():
+                        result = self.run_streaming(url)
+                except Exception as e:
+                    result = (False, str(e))
+                if result is not None:
+                    ok, reason = result
+                    if ok:
+                        return True, "OK"
+                    if self.dl.cancelled.is_set():
+                        return False, "Cancelled by user"
+                    # Повторяем обычным путём: файл + докачка по журналу; байты потока не в счёт
+                    self.log(f"Streaming install failed ({reason}), retrying via temp file")
+                    task = self.dl.task(self.dlc)
+                    if task:
+                        task.reset()
+
+            self.log("Downloading...")
+            # Передаем название DLC для красивого логирования
+            dlc_name = f"{self.dlc} - {self.info.get('name', 'Unknown DLC')}"
+            with self.slots.download():
+                ok, reason = self.dl.download(
+                    url, temp, dlc_name,
+                    size=int(self.info.get("size", 0) or 0), sha256=self.info.get("sha256", ""),
+                    task=self.dl.task(self.dlc)
+                )
+            if not ok:
+                # Битый файл уже удалён проверкой, недокачанный - оставляем для докачки
+                keep_partial = os.path.exists(temp)
+                return False, reason
+
+            # Проверяем размер файла
+            if os.path.getsize(temp) == 0:
+                return False, "Downloaded file is empty"
+
+            self.log("Extracting...")
+            with self.slots.extract():
+                ok, reason = self.ex.extract_zip(temp, self.game)
+            if not ok:
+                return False, reason
+
+            with zipfile.ZipFile(temp) as z:
+                members = z.infolist()
+
+            # В кэш попадают только архивы, прошедшие проверку CRC
+            if self.cache:
+                journal = DownloadJournal(temp)
+                journal.load()
+                self.cache.store(url, temp, etag=journal.etag, sha256=self.info.get("sha256", ""), move=True)
+
+            return self.completed(url, members)
+
+        except Exception as e:
+            return False, f"Installation error: {str(e)}"
+        finally:
+            # Cleanup временного файла (недокачанный оставляем для докачки)
+            if temp and not keep_partial:
+                self.dl.discard_partial(temp)
+
+
+# ================================================================
+#            DELTA UPDATES (обновление только изменённых файлов)
+# ================================================================
+def crc32_file(path, buffer=1024 * 1024):
+    """CRC32 файла (тот же алгоритм, что в ZIP central directory)"""
+    return digest_file(path, "crc32", buffer)
+
+
+def digest_file(path, algo="crc32", buffer=4 * 1024 * 1024):
+    """
+    CRC32 (int) или sha256 (hex) файла. Читаем большими блоками в один
+    переиспользуемый буфер; zlib и hashlib отпускают GIL, поэтому
+    несколько файлов хэшируются параллельно на разных ядрах
+    """
+    buf = bytearray(buffer)
+    view = memoryview(buf)
+    crc = 0
+    sha = hashlib.sha256() if algo == "sha256" else None
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            if sha:
+                sha.update(view[:n])
+            else:
+                crc = zlib.crc32(view[:n], crc)
+    return sha.hexdigest() if sha else crc
+
+
+def game_key(game_path):
+    """Короткий ключ папки игры для файлов состояния в AppData"""
+    return hashlib.sha1(os.path.normcase(os.path.abspath(game_path)).encode("utf-8")).hexdigest()[:12]
+
+
+class InstalledManifest:
+    """
+    Состояние установленного DLC: для каждого файла из архива - размер,
+    CRC32 и mtime на момент установки. Хранится в AppData, по папке на игру
+    """
+
+    ROOT = Path.home() / "AppData" / "Local" / "LinuaUpdater" / "manifests"
+
+    def __init__(self, game_path, dlc_id):
+        self.game = game_path
+        self.path = self.ROOT / game_key(game_path) / f"{dlc_id}.json"
+        self.url = ""
+        self.files = {}
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.url = data.get("url", "")
+            self.files = data.get("files", {})
+            return True
+        except Exception:
+            return False
+
+    def save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"url": self.url, "files": self.files}, f)
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
+
+    def record(self, url, members):
+        """Снять состояние после установки из списка элементов архива"""
+        self.url = url
+        self.files = {}
+        for m in members:
+            if m.is_dir():
+                continue
+            target = Extractor.member_path(self.game, m.filename)
+            try:
+                st = os.stat(target)
+            except OSError:
+                continue
+            self.files[m.filename] = {"size": m.file_size, "crc32": m.CRC, "mtime_ns": st.st_mtime_ns}
+        self.save()
+
+    def current_crc(self, filename, target, st):
+        """CRC установленного файла: из манифеста, если файл не трогали, иначе пересчёт"""
+        entry = self.files.get(filename)
+        if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+            return entry.get("crc32")
+        return crc32_file(target)
+
+
+class DeltaUpdater:
+    """
+    Обновление уже установленного DLC: сравниваем установленные файлы с
+    central directory опубликованного архива и скачиваем Range-запросами
+    только изменённые элементы ZIP. Неизменённые файлы не трогаем.
+    Сравнение с диском (CRC всех файлов без манифеста) идёт в слоте
+    распаковки, слот загрузки занимается только на Range-запросы.
+    """
+
+    MAX_GAP = 1024 * 1024  # соседние изменённые элементы качаем одним запросом
+
+    def __init__(self, dlc_id, info, game_path, downloader, extractor, logger, slots=None):
+        self.dlc = dlc_id
+        self.info = info
+        self.game = game_path
+        self.dl = downloader
+        self.ex = extractor
+        self.logger = logger
+        self.slots = slots or InstallSlots.unlimited()
+
+    def log(self, t):
+        if self.logger:
+            self.logger.log(f"[{self.dlc}] {t}")
+
+    def changed_members(self, members, manifest):
+        """Элементы архива, которые отсутствуют или отличаются на диске"""
+        changed = []
+        for m in members:
+            if m.is_dir():
+                continue
+            target = Extractor.member_path(self.game, m.filename)
+            if target is None:
+                continue
+            try:
+                st = os.stat(target)
+            except OSError:
+                changed.append(m)
+                continue
+            if st.st_size != m.file_size or manifest.current_crc(m.filename, target, st) != m.CRC:
+                changed.append(m)
+        return changed
+
+    def plan_ranges(self, members, changed, total):
+        """Сгруппировать изменённые элементы в диапазоны [start, end) для Range-запросов"""
+        ordered = sorted(members, key=lambda m: m.header_offset)
+        next_offset = {}
+        for cur, nxt in zip(ordered, ordered[1:]):
+            next_offset[cur.header_offset] = nxt.header_offset
+
+        groups = []
+        for m in sorted(changed, key=lambda m: m.header_offset):
+            # Конец элемента: начало следующего (или оценка сверху для последнего)
+            end = next_offset.get(
+                m.header_offset,
+                min(total, m.header_offset + zipfile.sizeFileHeader + 0xFFFF * 2 + m.compress_size)
+            )
+            if groups and m.header_offset - groups[-1][1] <= self.MAX_GAP:
+                groups[-1][1] = end
+                groups[-1][2].append(m)
+            else:
+                groups.append([m.header_offset, end, [m]])
+        return groups
+
+    def run(self, only=None):
+        """
+        (ok, reason) после обновления или None, если дельта невозможна
+        (сервер без Range, архив не ZIP/не deflate).
+        only - скачать заново именно эти элементы (повреждённые файлы), без сравнения
+        """
+        url = self.info.get("url")
+        try:
+            meta, members = self.dl.fetch_zip_index(url)
+        except Exception as e:
+            self.log(f"Delta update unavailable: {e}")
+            return None
+        if not members:
+            return None
+        if any(m.compress_type not in SingleDLCInstaller.STREAMABLE or m.flag_bits & 0x1 for m in members):
+            return None
+
+        manifest = InstalledManifest(self.game, self.dlc)
+        manifest.load()
+
+        if only is not None:
+            changed = [m for m in members if m.filename in only]
+            removed = []
+        else:
+            self.log("Checking installed files against published archive...")
+            with self.slots.extract():
+                changed = self.changed_members(members, manifest)
+
+            # Файлы, которые мы ставили раньше, но которых больше нет в архиве
+            published = {m.filename for m in members}
+            removed = [name for name in manifest.files if name not in published]
+
+        if not changed and not removed:
+            manifest.record(url, members)
+            self.log("Already up to date")
+            return True, "Up to date"
+
+        size = sum(m.compress_size for m in changed)
+        self.log(f"Delta update: {len(changed)} changed files, {size / (1024 * 1024):.1f} MB to download")
+
+        groups = self.plan_ranges(members, changed, meta["total"])
+        # Диапазоны идут в прогресс этого DLC, как и полная загрузка
+        task = self.dl.task(self.dlc)
+        if task:
+            task.expect(meta["url"], sum(end - start for start, end, _ in groups))
+        for start, end, group in groups:
+            # Распаковка идёт со скоростью сети - как и потоковая установка, в слоте загрузки
+            with self.slots.download():
+                chunks = self.dl.iter_stream(meta["url"], start, end, task=task)
+                try:
+                    ok, reason = self.ex.extract_zip_stream(chunks, group, self.game, start, merge=True)
+                finally:
+                    chunks.close()
+            if not ok:
+                return False, reason
+
+        for name in removed:
+            target = Extractor.member_path(self.game, name)
+            try:
+                if target and os.path.isfile(target):
+                    os.remove(target)
+            except OSError:
+                pass
+        if removed:
+            self.log(f"Removed {len(removed)} files no longer in the archive")
+
+        manifest.record(url, members)
+        self.log("Delta update completed successfully")
+        return True, "OK"
+
+
+# ================================================================
+#                 INTEGRITY VERIFICATION (хэши файлов)
+# ================================================================
+class IntegrityVerifier:
+    """
+    Проверка установленных файлов по хэшам. Эталон - опубликованный
+    sha256-манифест DLC (ключ "manifest" в базе), иначе CRC32 и размеры из
+    central directory архива (записаны в InstalledManifest при установке
+    или запрашиваются с сервера). Файл, совпавший с эталоном, запоминается
+    с (size, mtime): повторная проверка без изменений - только stat.
+    """
+
+    def __init__(self, game_path, logger=None, downloader=None, extractor=None, workers=None):
+        self.game = game_path
+        self.logger = logger
+        self.dl = downloader
+        self.ex = extractor
+        self.workers = workers or os.cpu_count() or 4
+
+    def log(self, text):
+        if self.logger:
+            self.logger.log(f"[VERIFY] {text}")
+
+    def reference(self, dlc_id, info):
+        """(manifest, {имя: {size, crc32|sha256}}, algo) или (manifest, None, None)"""
+        manifest = InstalledManifest(self.game, dlc_id)
+        manifest.load()
+
+        if info.get("manifest") and self.dl:
+            try:
+                r = self.dl.session.get(info["manifest"], timeout=30, verify=False)
+                r.raise_for_status()
+                files = r.json()["files"]
+                return manifest, {name: {"size": e["size"], "sha256": e["sha256"]} for name, e in files.items()}, "sha256"
+            except Exception as e:
+                self.log(f"[{dlc_id}] Manifest unavailable ({e}), falling back to CRC32")
+
+        if manifest.files:
+            return manifest, {name: {"size": e["size"], "crc32": e["crc32"]} for name, e in manifest.files.items()}, "crc32"
+
+        if info.get("url") and not info.get("parts") and self.dl:
+            try:
+                _, members = self.dl.fetch_zip_index(info["url"])
+            except Exception as e:
+                self.log(f"[{dlc_id}] Archive index unavailable: {e}")
+                members = None
+            if members:
+                manifest.url = info["url"]
+                expected = {m.filename: {"size": m.file_size, "crc32": m.CRC} for m in members if not m.is_dir()}
+                return manifest, expected, "crc32"
+
+        return manifest, None, None
+
+    def verify(self, dlc_id, info, deep=False, stop=None):
+        """
+        Проверить DLC. deep - хэшировать всё заново, не доверяя (size, mtime).
+        Возвращает dict (damaged/missing/unreadable - имена элементов архива) или None без эталона.
+        unreadable - файл не удалось прочитать (занят игрой, нет прав, ошибка диска)
+        """
+        manifest, expected, algo = self.reference(dlc_id, info)
+        if expected is None:
+            return None
+
+        result = {"dlc": dlc_id, "algo": algo, "files": len(expected), "hashed": 0,
+                  "hashed_bytes": 0, "damaged": [], "missing": [], "unreadable": []}
+        to_hash = []
+        for name, ref in expected.items():
+            target = Extractor.member_path(self.game, name)
+            if target is None:
+                continue
+            try:
+                st = os.stat(target)
+            except OSError:
+                result["missing"].append(name)
+                continue
+            if st.st_size != ref["size"]:
+                result["damaged"].append(name)
+                continue
+            known = manifest.files.get(name, {})
+            if (not deep and known.get("size") == st.st_size
+                    and known.get("mtime_ns") == st.st_mtime_ns and known.get(algo) == ref[algo]):
+                continue  # не менялся с последней проверки
+            to_hash.append((name, target, st, ref))
+
+        def check(item):
+            name, target, st, ref = item
+            if stop and stop():
+                return name, st, None, None
+            try:
+                return name, st, digest_file(target, algo), None
+            except OSError as e:
+                return name, st, None, e
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(to_hash) or 1))) as pool:
+            for name, st, digest, error in pool.map(check, to_hash):
+                if error is not None:
+                    self.log(f"[{dlc_id}] Cannot read {name}: {error}")
+                    result["unreadable"].append(name)
+                    continue
+                if digest is None:
+                    continue
+                result["hashed"] += 1
+                result["hashed_bytes"] += st.st_size
+                if digest == expected[name][algo]:
+                    entry = manifest.files.setdefault(name, {})
+                    entry.update({"size": st.st_size, "mtime_ns": st.st_mtime_ns, algo: digest})
+                else:
+                    result["damaged"].append(name)
+
+        if result["hashed"]:
+            manifest.save()
+        self.log(f"[{dlc_id}] {result['files']} files, {result['hashed']} hashed "
+                 f"({result['hashed_bytes'] / (1024 * 1024):.0f} MB), "
+                 f"{len(result['damaged'])} damaged, {len(result['missing'])} missing"
+                 + (f", {len(result['unreadable'])} unreadable" if result["unreadable"] else ""))
+        return result
+
+    def repair(self, dlc_id, info, names):
+        """Скачать заново только повреждённые/отсутствующие файлы (Range-запросами по элементам ZIP)"""
+        if not (self.dl and self.ex) or info.get("parts"):
+            return False, "Re-download of single files is not possible for this DLC"
+        result = DeltaUpdater(dlc_id, info, self.game, self.dl, self.ex, self.logger).run(only=set(names))
+        if result is None:
+            return False, "Server does not support partial downloads"
+        return result
+
+
+# ================================================================
+#               MULTIPART DLC INSTALLER - из старого кода
+# ================================================================
+class MultiPartInstaller:
+    """Установка многодольных DLC"""
+
+    # Сколько частей качается одновременно (каждая - своими сегментами)
+    PART_WORKERS = 3
+
+    def __init__(self, dlc_id, info, game_path, downloader, extractor, seven_path, logger,
+                 slots=None, cache=None):
+        self.dlc = dlc_id
+        self.info = info
+        self.game = game_path
+        self.dl = downloader
+        self.ex = extractor
+        self.seven = seven_path
+        self.logger = logger
+        self.slots = slots or InstallSlots.unlimited()
+        self.cache = cache
+
+    def log(self, t):
+        if self.logger:
+            self.logger.log(f"[{self.dlc}] {t}")
+
+    def run(self):
+        downloaded_files = []
+        fetched = []
+        keep_partial = False
+        try:
+            if not self.seven or not os.path.exists(self.seven):
+                return False, "7z.exe not found"
+
+            parts = self.info.get("parts", [])
+            if not parts:
+                return False, "No parts defined"
+            # Необязательные sha256 частей в том же порядке
+            part_hashes = self.info.get("parts_sha256", [])
+
+            # Скачиваем все части (готовые части и недокачанные хвосты
+            # сохраняются между попытками - журнал не даст качать их заново).
+            # 7z-архив нельзя распаковывать из потока (заголовок в конце
+            # последнего тома), поэтому ускоряем загрузку: части качаются
+            # параллельно в одном слоте загрузки
+            pending = []
+            for i, url in enumerate(parts):
+                name = f"{self.dlc}.7z.{str(i+1).zfill(3)}"
+                out = self.dl.partial_path(name)
+                downloaded_files.append(out)
+
+                part_sha = part_hashes[i] if i < len(part_hashes) else ""
+                cached = self.cache.lookup(url, sha256=part_sha, probe=self.dl.probe) if self.cache else None
+                if cached:
+                    self.log(f"Using cached part {i+1}/{len(parts)}")
+                    self.cache.materialize(cached, out)
+                    continue
+                pending.append((i, url, out, part_sha))
+
+            def fetch(job):
+                i, url, out, part_sha = job
+                self.log(f"Downloading part {i+1}/{len(parts)}...")
+                # Передаем название DLC для красивого логирования
+                dlc_name = f"{self.dlc} - {self.info.get('name', 'Unknown DLC')} [Part {i+1}]"
+                return self.dl.download(url, out, dlc_name, sha256=part_sha, task=self.dl.task(self.dlc))
+
+            if pending:
+                with self.slots.download(), ThreadPoolExecutor(
+                        max_workers=min(self.PART_WORKERS, len(pending))) as pool:
+                    futures = {pool.submit(fetch, job): job for job in pending}
+                    failure = None
+                    for fut in as_completed(futures):
+                        ok, reason = fut.result()
+                        if ok:
+                            i, url, out, part_sha = futures[fut]
+                            fetched.append((url, out, part_sha))
+                        elif failure is None:
+                            # Остальные части докачаются при следующей попытке
+                            failure = reason
+                            for other in futures:
+                                other.cancel()
+                if failure:
+                    keep_partial = True
+                    return False, failure
+
+            # Проверяем что первая часть существует
+            if not downloaded_files or not os.path.exists(downloaded_files[0]):
+                return False, "First part not found"
+
+            # Извлекаем через 7-Zip
+            part1 = downloaded_files[0]
+            self.log("Extracting multipart archive...")
+
+            reported = [-10]
+
+            def progress(percent, total):
+                if percent >= reported[0] + 10:
+                    reported[0] = percent - percent % 10
+                    self.log(f"Extracting: {percent}%")
+
+            with self.slots.extract():
+                ok, reason = self.ex.extract_7z(
+                    self.seven, part1, self.game, progress, stop=self.dl.cancelled,
+                    threads=SevenZipFinder.threads(self.seven, self.ex.workers)
+                )
+            if not ok:
+                return False, reason
+
+            if self.cache:
+                for url, path, sha256 in fetched:
+                    journal = DownloadJournal(path)
+                    journal.load()
+                    self.cache.store(url, path, etag=journal.etag, sha256=sha256, move=True)
+
+            self.log("Installation completed successfully")
+            return True, "OK"
+
+        except Exception as e:
+            return False, f"Multipart installation error: {str(e)}"
+        finally:
+            # Очищаем временные файлы (при обрыве загрузки оставляем для докачки)
+            if not keep_partial:
+                for f in downloaded_files:
+                    self.dl.discard_partial(f)
+
+
+# ================================================================
+#              INSTALL SCHEDULER (очередь с лимитами)
+# ================================================================
+class InstallSlots:
+    """Раздельные лимиты: слоты загрузки (сеть) и слоты распаковки (CPU/диск)"""
+
+    def __init__(self, download_slots=None, extract_slots=None):
+        self._download = threading.BoundedSemaphore(download_slots) if download_slots else None
+        self._extract = threading.BoundedSemaphore(extract_slots) if extract_slots else None
+
+    @classmethod
+    def unlimited(cls):
+        return cls()
+
+    @staticmethod
+    @contextmanager
+    def _hold(sem):
+        if sem is None:
+            yield
+            return
+        with sem:
+            yield
+
+    def download(self):
+        return self._hold(self._download)
+
+    def extract(self):
+        return self._hold(self._extract)
+
+
+class JobSlots:
+    """
+    Слоты одной задачи планировщика (семафоры общие). Резерв места задачи
+    снимается, как только она впервые заняла слот: дальше её файлы (архив
+    выделяется сразу целиком) уже видны в свободном месте и второй раз не считаются
+    """
+
+    def __init__(self, slots, release):
+        self.slots = slots
+        self.release = release
+
+    @contextmanager
+    def _claim(self, hold):
+        with hold():
+            self.release()
+            yield
+
+    def download(self):
+        return self._claim(self.slots.download)
+
+    def extract(self):
+        return self._claim(self.slots.extract)
+
+
+class InstallScheduler:
+    """
+    Очередь установки DLC без привязки к Qt.
+    run_job(dlc_id, info, slots) -> (ok, reason) выполняется в пуле потоков,
+    on_done(dlc_id, ok, reason) вызывается из рабочего потока.
+    Загрузки ограничены download_slots, распаковки - extract_slots,
+    новые загрузки ждут, пока во временной папке хватит места: размер
+    архива резервируется до первого слота задачи (JobSlots).
+    """
+
+    ORDERS = ("smallest", "user")
+
+    def __init__(self, run_job, download_slots=2, extract_slots=1, order="smallest",
+                 temp_dir=None, reserve_bytes=1024 ** 3, logger=None):
+        self.run_job = run_job
+        self.download_slots = max(1, download_slots)
+        self.extract_slots = max(1, extract_slots)
+        self.order = order if order in self.ORDERS else "smallest"
+        self.temp_dir = temp_dir or tempfile.gettempdir()
+        self.reserve_bytes = reserve_bytes
+        self.logger = logger
+        self.slots = InstallSlots(self.download_slots, self.extract_slots)
+
+        self._queue = []
+        self._seq = 0
+        self._reserved = 0
+        self._running = 0
+        self._cond = threading.Condition()
+        self._cancelled = False
+        self._workers = []
+        self.on_done = None
+
+    def log(self, text):
+        if self.logger:
+            self.logger.log(text)
+
+    def submit(self, dlc_id, info):
+        """Поставить DLC в очередь (до или после start)"""
+        size = DLCCatalog.archive_size(info)
+        with self._cond:
+            if self.order == "smallest":
+                # Неизвестный размер - в конец очереди
+                key = (size if size else float("inf"), self._seq)
+            else:
+                key = (self._seq,)
+            heapq.heappush(self._queue, (key, self._seq, dlc_id, info, size))
+            self._seq += 1
+            self._cond.notify()
+
+    def start(self, on_done=None):
+        """Запустить рабочие потоки: каждый слот загрузки и распаковки может быть занят"""
+        self.on_done = on_done
+        count = self.download_slots + self.extract_slots
+        for i in range(count):
+            t = threading.Thread(target=self._worker, name=f"linua-install-{i}", daemon=True)
+            self._workers.append(t)
+            t.start()
+
+    def cancel(self):
+        """Отменить ещё не начатые установки"""
+        with self._cond:
+            self._cancelled = True
+            pending = [(item[2]) for item in self._queue]
+            self._queue.clear()
+            self._cond.notify_all()
+        for dlc_id in pending:
+            self._report(dlc_id, False, "Cancelled by user")
+
+    def wait(self, timeout=None):
+        """Дождаться завершения очереди (для headless-режима)"""
+        deadline = time.time() + timeout if timeout is not None else None
+        for t in self._workers:
+            t.join(None if deadline is None else max(0, deadline - time.time()))
+        return not any(t.is_alive() for t in self._workers)
+
+    def free_temp_bytes(self):
+        try:
+            return shutil.disk_usage(self.temp_dir).free
+        except Exception:
+            return float("inf")
+
+    def _next_job(self):
+        """Взять следующую задачу, дождавшись места во временной папке"""
+        with self._cond:
+            if self._cancelled or not self._queue:
+                return None
+            _, _, dlc_id, info, size = heapq.heappop(self._queue)
+
+            warned = False
+            while not self._cancelled and size:
+                if self.free_temp_bytes() - self._reserved >= size + self.reserve_bytes:
+                    break
+                if not self._running:
+                    # Ждать нечего - никто не освободит место
+                    return dlc_id, info, size, "Not enough free temp space"
+                if not warned:
+                    self.log(f"[{dlc_id}] Waiting for free temp space...")
+                    warned = True
+                self._cond.wait(1.0)
+
+            if self._cancelled:
+                return dlc_id, info, 0, "Cancelled by user"
+            self._reserved += size
+            self._running += 1
+            return dlc_id, info, size, None
+
+    def _release(self, reservation):
+        """Снять резерв задачи (один раз: при первом слоте или по её завершении)"""
+        with self._cond:
+            self._reserved -= reservation.pop("size", 0)
+            self._cond.notify_all()
+
+    def _worker(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            dlc_id, info, size, error = job
+            if error:
+                self._report(dlc_id, False, error)
+                continue
+            reservation = {"size": size}
+            try:
+                slots = JobSlots(self.slots, lambda: self._release(reservation))
+                ok, reason = self.run_job(dlc_id, info, slots)
+            except Exception as e:
+                ok, reason = False, f"Installation error: {str(e)}"
+            finally:
+                self._release(reservation)
+                with self._cond:
+                    self._running -= 1
+                    self._cond.notify_all()
+            self._report(dlc_id, ok, reason)
+
+    def _report(self, dlc_id, ok, reason):
+        on_done = self.on_done
+        if on_done:
+            try:
+                on_done(dlc_id, ok, reason)
+            except Exception as e:
+                self.log(f"[{dlc_id}] Scheduler callback error: {e}")
+
+
+# ================================================================
+#             INSTALL PLANNER (место на дисках до старта)
+# ================================================================
+class InstallPlanner:
+    """
+    Предварительный расчёт места для пачки DLC. Размеры архивов и частей
+    берутся HEAD-запросами (параллельно, через общий пул соединений),
+    размер после распаковки ZIP - из central directory (Range к хвосту).
+    Пик временной папки считается для числа одновременных установок
+    планировщика, затем оба диска проверяются через shutil.disk_usage
+    """
+
+    WORKERS = 8
+    TAIL_SIZE = 64 * 1024           # central directory DLC обычно меньше
+    RESERVE_BYTES = 1024 ** 3       # запас, как у InstallScheduler
+
+    def __init__(self, downloader, logger=None, workers=None, temp_dir=None):
+        self.dl = downloader
+        self.logger = logger
+        self.workers = max(1, workers or self.WORKERS)
+        self.temp_dir = temp_dir or tempfile.gettempdir()
+
+    def log(self, text):
+        if self.logger:
+            self.logger.log(f"[PLAN] {text}")
+
+    @staticmethod
+    def measured(info):
+        """Размеры уже известны (из базы или прошлого планирования)"""
+        return bool(DLCCatalog.archive_size(info) and info.get("installed_size"))
+
+    def measure_one(self, url, multipart):
+        """(размер архива, размер после распаковки) одного URL; 0 - неизвестно"""
+        if multipart:
+            # 7z-тома: заголовок в конце последнего тома, оцениваем по размеру архива
+            total = self.dl.probe(url)["total"]
+            return total, total
+        try:
+            meta, members = self.dl.fetch_zip_index(url, tail_size=self.TAIL_SIZE)
+        except Exception:
+            return self.dl.probe(url)["total"], 0
+        total = meta["total"]
+        return total, (sum(m.file_size for m in members) if members else total)
+
+    def measure(self, jobs):
+        """
+        Недостающие размеры для [(dlc_id, info)] одним пулом запросов.
+        Возвращает {dlc_id: info с size/parts_size и installed_size}
+        """
+        urls = []
+        for dlc_id, info in jobs:
+            if self.measured(info):
+                continue
+            if info.get("parts"):
+                urls.extend((dlc_id, i, url) for i, url in enumerate(info["parts"]))
+            elif info.get("url"):
+                urls.append((dlc_id, None, info["url"]))
+        if not urls:
+            return {}
+
+        began = time.time()
+        sizes = {}
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(urls))) as pool:
+            futures = {pool.submit(self.measure_one, url, part is not None): (dlc_id, part)
+                       for dlc_id, part, url in urls}
+            for future in as_completed(futures):
+                sizes[futures[future]] = future.result()
+
+        updated = {}
+        for dlc_id, info in jobs:
+            entry = dict(info)
+            if info.get("parts"):
+                parts = [sizes.get((dlc_id, i)) for i in range(len(info["parts"]))]
+                if None in parts:
+                    continue
+                if all(total for total, _ in parts):
+                    entry["parts_size"] = [total for total, _ in parts]
+                    entry["installed_size"] = sum(unpacked for _, unpacked in parts)
+            elif (dlc_id, None) in sizes:
+                total, unpacked = sizes[(dlc_id, None)]
+                if total:
+                    entry["size"] = total
+                if unpacked:
+                    entry["installed_size"] = unpacked
+            if entry != info:
+                updated[dlc_id] = entry
+        self.log(f"Sized {len(urls)} URL(s) for {len(updated)} DLC in {time.time() - began:.1f}s")
+        return updated
+
+    @staticmethod
+    def free_bytes(path):
+        try:
+            return shutil.disk_usage(path).free
+        except Exception:
+            return None
+
+    @staticmethod
+    def same_volume(a, b):
+        try:
+            return os.stat(a).st_dev == os.stat(b).st_dev
+        except OSError:
+            return False
+
+    def plan(self, jobs, game_path, download_slots=2, extract_slots=1, installed=None):
+        """
+        План установки [(dlc_id, info)]: объём загрузки, итоговый прирост
+        на диске игры и пик временной папки. installed - {dlc_id: байт}
+        уже установленных DLC (обновление заменяет их файлы).
+        Результат - dict; ok=False и reason, если места не хватит
+        """
+        updated = self.measure(jobs)
+        jobs = [(dlc_id, updated.get(dlc_id, info)) for dlc_id, info in jobs]
+        installed = installed or {}
+
+        unknown = []
+        archives = []
+        final = 0
+        for dlc_id, info in jobs:
+            archive = DLCCatalog.archive_size(info)
+            unpacked = int(info.get("installed_size", 0) or 0)
+            if not archive:
+                unknown.append(dlc_id)
+            archives.append(archive)
+            final += max(0, (unpacked or archive) - int(installed.get(dlc_id, 0) or 0))
+
+        # Архив лежит во временной папке от начала загрузки до конца распаковки,
+        # а одновременно заняты не больше download_slots + extract_slots установок
+        slots = max(1, download_slots) + max(1, extract_slots)
+        temp_peak = sum(sorted(archives, reverse=True)[:slots])
+
+        temp_free = self.free_bytes(self.temp_dir)
+        game_free = self.free_bytes(game_path)
+        same = self.same_volume(self.temp_dir, game_path)
+        result = {
+            "dlc": len(jobs),
+            "download": sum(archives),
+            "final": final,
+            "temp_peak": temp_peak,
+            "temp_free": temp_free,
+            "game_free": game_free,
+            "same_volume": same,
+            "unknown": unknown,
+            "entries": updated,
+            "ok": True,
+            "reason": "OK",
+        }
+
+        if same:
+            need = final + temp_peak + self.RESERVE_BYTES
+            if game_free is not None and game_free < need:
+                result.update(ok=False, reason=(
+                    f"Not enough disk space: need {self.gb(need)} "
+                    f"(install {self.gb(final)} + temp {self.gb(temp_peak)}), {self.gb(game_free)} free"))
+        else:
+            if temp_free is not None and temp_free < temp_peak + self.RESERVE_BYTES:
+                result.update(ok=False, reason=(
+                    f"Not enough space for downloads in {self.temp_dir}: "
+                    f"need {self.gb(temp_peak + self.RESERVE_BYTES)}, {self.gb(temp_free)} free"))
+            elif game_free is not None and game_free < final + self.RESERVE_BYTES:
+                result.update(ok=False, reason=(
+                    f"Not enough space in the game folder: "
+                    f"need {self.gb(final + self.RESERVE_BYTES)}, {self.gb(game_free)} free"))
+
+        self.log(self.describe(result))
+        return result
+
+    @staticmethod
+    def gb(size):
+        return f"{size / 1024 ** 3:.1f} GB"
+
+    @classmethod
+    def describe(cls, plan):
+        """Одна строка с итогами плана"""
+        text = (f"{plan['dlc']} DLC: download {cls.gb(plan['download'])}, "
+                f"install {cls.gb(plan['final'])}, temp peak {cls.gb(plan['temp_peak'])}")
+        if plan["unknown"]:
+            text += f", size unknown for {len(plan['unknown'])}"
+        return text
+
+
+# ================================================================
+#                  INSTALL SERVICE (общий для GUI и CLI)
+# ================================================================
+class InstallService:
+    """Установка DLC без привязки к Qt: выбор установщика и очередь планировщика"""
+
+    def __init__(self, logger, cache=None, segments=None, workers=None, temp_dir=None):
+        self.logger = logger
+        # Прогресс загрузок всей очереди - читается по таймеру (GUI) или в цикле ожидания (CLI)
+        self.progress = ProgressTracker()
+        self.downloader = DownloadEngine(logger, segments=segments, progress=self.progress)
+        self.extractor = Extractor(logger, workers=workers)
+        self.planner = InstallPlanner(self.downloader, logger)
+        self.cache = cache
+        self.scheduler = None
+        # Рабочие папки: заданная вручную или (по умолчанию) на томе игры
+        self.temp_dir = temp_dir or None
+        self.staging = None
+
+    def stage(self, game_path):
+        """Направить загрузки, staging распаковки и расчёт места в рабочую папку для game_path"""
+        # Установка, прерванная сбоем, доводится или откатывается до начала новой
+        InstallTransaction.recover(game_path, self.logger)
+        staging = StagingManager(game_path, self.temp_dir, self.logger)
+        if not staging.prepare():
+            # Нет прав на запись рядом с игрой - остаёмся во временной папке системы
+            staging = StagingManager(game_path, StagingManager.FALLBACK_ROOT, self.logger)
+            staging.prepare()
+        if not staging.same_volume():
+            self.logger.log(f"[STAGING] {staging.root} is on another drive than the game - files will be copied")
+        self.staging = staging
+        self.downloader.partial_dir = staging.downloads
+        self.extractor.staging = staging
+        self.planner.temp_dir = str(staging.root)
+        return staging
+
+    def plan(self, jobs, game_path, download_slots=2, extract_slots=1, installed=None):
+        """План места (InstallPlanner) для рабочей папки этой установки"""
+        self.stage(game_path)
+        return self.planner.plan(jobs, game_path, download_slots, extract_slots, installed)
+
+    def run_install(self, dlc_id, dlc_info, game_path, slots=None):
+        """Установить одно DLC в текущем потоке (используется планировщиком)"""
+        if dlc_info.get("parts"):
+            seven_path = SevenZipFinder(self.logger).find()
+            if not seven_path:
+                return False, "7-zip not found"
+            inst = MultiPartInstaller(
+                dlc_id, dlc_info, game_path,
+                self.downloader, self.extractor,
+                seven_path, self.logger, slots=slots, cache=self.cache
+            )
+        else:
+            inst = SingleDLCInstaller(
+                dlc_id, dlc_info, game_path,
+                self.downloader, self.extractor,
+                self.logger, slots=slots, cache=self.cache
+            )
+        try:
+            return inst.run()
+        finally:
+            self.progress.finish(dlc_id)
+
+    def install_batch(self, jobs, game_path, on_done,
+                      download_slots=2, extract_slots=1, order="smallest"):
+        """
+        Установка пачки DLC через планировщик с лимитами на сеть и распаковку.
+        on_done(dlc_id, ok, reason) вызывается из рабочих потоков
+        """
+        previous = self.scheduler
+        if previous:
+            # Отчёты отменённой очереди не должны попасть в новую, а её потоки -
+            # продолжить загрузки после reset_cancel
+            previous.on_done = None
+            previous.wait()
+        self.downloader.reset_cancel()
+        self.progress.reset()
+        staging = self.stage(game_path)
+        self.scheduler = InstallScheduler(
+            lambda dlc_id, info, slots: self.run_install(dlc_id, info, game_path, slots),
+            download_slots=download_slots,
+            extract_slots=extract_slots,
+            order=order,
+            temp_dir=str(staging.root),
+            logger=self.logger
+        )
+        for dlc_id, info in jobs:
+            self.scheduler.submit(dlc_id, info)
+        self.scheduler.start(on_done)
+        return self.scheduler
+
+    def busy(self):
+        """Потоки прошлой очереди ещё работают (например, дораспаковывают после Cancel)"""
+        return bool(self.scheduler) and not self.scheduler.wait(0)
+
+    def cancel_batch(self):
+        """Отменить очередь и прервать текущие загрузки"""
+        if self.scheduler:
+            self.scheduler.cancel()
+        self.downloader.cancel()
+
+    def finish_batch(self):
+        """Очередь закончилась: убрать пустые рабочие папки"""
+        if self.staging:
+            self.staging.cleanup()
+
+
+# ================================================================
+#                           REPAIR ENGINE - из старого кода
+# ================================================================
+class RepairEngine:
+    """Система восстановления папки Sims 4"""
+
+    def __init__(self, game_path, logger, temp_dir=None):
+        self.game = Path(game_path)
+        self.logger = logger
+        # Рабочая папка установки из настроек (StagingManager.CONFIG_KEY)
+        self.temp_dir = temp_dir or None
+
+    def log(self, msg):
+        if self.logger:
+            self.logger.log(msg)
+
+    def run(self):
+        try:
+            if not self.game.exists():
+                self.log("Invalid game path")
+                return False
+
+            self.log("Starting deep repair...")
+
+            self.check_structure()
+            self.check_executables()
+            self.clean_empty_dlc()
+            self.clean_temp_files()
+
+            self.log("Repair completed successfully")
+            return True
+
+        except Exception as e:
+            self.log(f"Repair failed: {e}")
+            return False
+
+    def check_structure(self):
+        self.log("Checking game structure...")
+        required = ["Game", "Data"]
+        for f in required:
+            if not (self.game / f).exists():
+                self.log(f"Missing folder: {f}")
+
+    def check_executables(self):
+        self.log("Checking executables...")
+        exe = self.game / "Game" / "Bin" / "TS4_x64.exe"
+        if not exe.exists():
+            self.log("TS4_x64.exe missing - game may not run")
+        else:
+            size_mb = exe.stat().st_size / (1024 * 1024)
+            self.log(f"TS4_x64.exe size: {size_mb:.1f} MB")
+
+    def clean_empty_dlc(self):
+        self.log("Cleaning empty DLC folders...")
+        cleaned = 0
+        for item in self.game.iterdir():
+            if item.is_dir():
+                name = item.name.upper()
+                if name.startswith(("EP", "GP", "SP", "FP")):
+                    if not any(item.iterdir()):
+                        self.log(f"Removing empty folder: {name}")
+                        try:
+                            shutil.rmtree(item, ignore_errors=True)
+                            cleaned += 1
+                        except:
+                            pass
+        self.log(f"Cleaned {cleaned} empty DLC folders")
+
+    def clean_temp_files(self):
+        self.log("Cleaning temp files...")
+        stale = StagingManager.prune_all(self.game, self.temp_dir)
+        if stale:
+            self.log(f"Removed {stale} stale partial downloads")
+        temp = Path(tempfile.gettempdir())
+        patterns = [".7z.001", ".7z.002", ".zip", ".tmp", ".part"]
+        
+        cleaned = 0
+        for pattern in patterns:
+            for f in temp.glob(f"*{pattern}"):
+                try:
+                    if f.is_file():
+                        f.unlink()
+                        cleaned += 1
+                except:
+                    pass
+        self.log(f"Cleaned {cleaned} temp files")
+
+
+# ================================================================
+#                       NETWORK CHECKER
+# ================================================================
+class NetworkChecker:
+    @staticmethod
+    def is_online():
+        try:
+            socket.create_connection(("8.8.8.8", 53), timeout=2)
+            return True
+        except:
+            return False
+
+
+# ================================================================
+#                      DISK SPACE CHECKER - из старого кода
+# ================================================================
+class DiskChecker:
+    @staticmethod
+    def get_free_gb(path):
+        try:
+            usage = shutil.disk_usage(path)
+            return usage.free / (1024**3)  # Convert to GB
+        except:
+            return 0
+
+    @staticmethod
+    def check_disk_space(path, required_gb=10):
+        """Проверка свободного места на диске"""
+        try:
+            total, used, free = shutil.disk_usage(path)
+            free_gb = free // (2**30)  # Конвертируем в GB
+            return free_gb >= required_gb, free_gb
+        except Exception as e:
+            return True, 0  # Если проверка не удалась, продолжаем
+
+
+# ================================================================
+#                           LOGGER
+# ================================================================
+class LogSink:
+    """
+    Запись лога в файл одним фоновым потоком на процесс: строки из любых
+    потоков кладутся в очередь и пишутся пачками (одно открытие файла на
+    пачку). Дневной файл ротируется по размеру: log_<дата>.txt, .1.txt, ...
+    """
+
+    MAX_BYTES = 5 * 1024 * 1024
+    BACKUPS = 3
+    BATCH = 500
+
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(self, log_dir):
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.queue = queue.Queue()
+        self.worker = threading.Thread(target=self._run, name="linua-log", daemon=True)
+        self.worker.start()
+
+    @classmethod
+    def shared(cls, log_dir):
+        with cls._lock:
+            if cls._shared is None:
+                cls._shared = cls(log_dir)
+                atexit.register(cls._shared.flush)
+            return cls._shared
+
+    def log_file(self):
+        return self.log_dir / f"log_{time.strftime('%Y-%m-%d')}.txt"
+
+    def put(self, line):
+        self.queue.put(line)
+
+    def flush(self, timeout=2.0):
+        """Дождаться записи всего, что уже в очереди"""
+        marker = threading.Event()
+        self.queue.put(marker)
+        return marker.wait(timeout)
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            try:
+                while len(batch) < self.BATCH:
+                    batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+            lines = [item for item in batch if isinstance(item, str)]
+            if lines:
+                self._write(lines)
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+    def _write(self, lines):
+        path = self.log_file()
+        try:
+            if path.exists() and path.stat().st_size >= self.MAX_BYTES:
+                self._rotate(path)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        except Exception as e:
+            print(f"Failed to write log: {e}")
+
+    def _rotate(self, path):
+        """log.txt -> log.1.txt -> ... -> log.<BACKUPS>.txt (самый старый удаляется)"""
+        def backup(n):
+            return path.with_name(f"{path.stem}.{n}{path.suffix}")
+
+        oldest = backup(self.BACKUPS)
+        if oldest.exists():
+            oldest.unlink()
+        for n in range(self.BACKUPS - 1, 0, -1):
+            if backup(n).exists():
+                os.replace(backup(n), backup(n + 1))
+        os.replace(path, backup(1))
+
+
+class Logger:
+    """
+    Лог приложения. Вызывается из любых потоков: файл пишет общий LogSink,
+    а для окна (ui=True) строки копятся в ограниченном буфере, который GUI
+    забирает из своего потока через drain()
+    """
+
+    UI_BACKLOG = 5000       # строк ждут вывода в окно; при переполнении старые теряются
+
+    def __init__(self, ui=False):
+        self.log_dir = Path.home() / "AppData" / "Local" / "LinuaUpdater" / "logs"
+        self.sink = LogSink.shared(self.log_dir)
+        # deque.append/popleft потокобезопасны - блокировка не нужна
+        self.pending = collections.deque(maxlen=self.UI_BACKLOG) if ui else None
+
+    @property
+    def log_file(self):
+        return self.sink.log_file()
+
+    def log(self, text):
+        line = f"{time.strftime('[%H:%M:%S]')} {text}"
+        self.sink.put(line)
+        if self.pending is not None:
+            self.pending.append(line)
+
+    def drain(self):
+        """Забрать накопленные для окна строки"""
+        lines = []
+        if self.pending is not None:
+            try:
+                while True:
+                    lines.append(self.pending.popleft())
+            except IndexError:
+                pass
+        return lines
+
+    def flush(self):
+        self.sink.flush()
+
+    def write(self, text):
+        """Совместимость с LogWriter из старого кода"""
+        self.log(text)
+
+
+# ================================================================
+#                        CONFIG MANAGER
+# ================================================================
+class ConfigManager:
+    def __init__(self):
+        self.path = Path.home() / "AppData" / "Local" / "LinuaUpdater" / "config.json"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        if not self.path.exists():
+            self.data = {"game_path": ""}
+            self.save()
+        else:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.data = json.load(f)
+            except:
+                self.data = {"game_path": ""}
+                self.save()
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        self.data[key] = value
+        self.save()
+
+    def save(self):
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.data, f, indent=4)
+        except Exception as e:
+            print(f"Failed to save config: {e}")
+
+
+# ================================================================
+#               НОВЫЕ КЛАССЫ ДЛЯ УЛУЧШЕНИЙ v4.0
+# ================================================================
+
+# 3. Rollback система: транзакционная установка через rename
+class InstallTransaction:
+    """
+    Атомарная замена папок DLC. Распакованное дерево (staging на томе игры)
+    сбрасывается на диск (fsync), затем каждая папка DLC встаёт на место
+    одним os.replace, а прежняя версия отодвигается тоже rename'ом - откат
+    O(1), без копирования. Журнал <game>/_linua_work/txn/<id>.json
+    переживает сбой: recover() при запуске доводит или откатывает транзакцию.
+    Общие папки (Delta, __Installer) переносятся пофайлово, как раньше
+    """
+
+    DIR_NAME = "txn"
+    FSYNC = True
+    FSYNC_WORKERS = 8
+    _lock = threading.Lock()
+
+    def __init__(self, game_path, staging, logger=None):
+        self.game = str(game_path)
+        self.staging = str(staging)
+        self.logger = logger
+        self.root = Path(game_path) / StagingManager.DIR_NAME / self.DIR_NAME
+        self.name = os.path.basename(self.staging.rstrip(os.sep))
+        self.journal = self.root / f"{self.name}.json"
+        self.old = self.root / f"{self.name}.old"
+
+    @classmethod
+    def from_journal(cls, journal, logger=None):
+        with open(journal, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        game = Path(journal).parent.parent.parent
+        txn = cls(game, data["staging"], logger)
+        txn.journal = Path(journal)
+        txn.old = txn.journal.with_suffix(".old")
+        return txn, data
+
+    def log(self, text):
+        if self.logger:
+            self.logger.log(f"[TXN] {text}")
+
+    # ---------- диск ----------
+    @classmethod
+    def fsync_tree(cls, path):
+        """Сбросить на диск все файлы дерева (и каталоги там, где это возможно)"""
+        files = []
+        dirs = []
+        for folder, _, names in os.walk(path):
+            dirs.append(folder)
+            files.extend(os.path.join(folder, name) for name in names)
+        with ThreadPoolExecutor(max_workers=cls.FSYNC_WORKERS) as pool:
+            list(pool.map(cls.fsync_file, files))
+        for folder in dirs:
+            cls.fsync_dir(folder)
+
+    @staticmethod
+    def fsync_file(path):
+        """
+        fsync одного файла. На POSIX хватает дескриптора только для чтения;
+        на Windows нужен доступ на запись - файл с атрибутом read-only
+        пропускаем. Ошибка fsync установку не прерывает
+        """
+        flags = os.O_RDWR | getattr(os, "O_BINARY", 0) if os.name == "nt" else os.O_RDONLY
+        try:
+            fd = os.open(path, flags)
+        except OSError:
+            return False
+        try:
+            os.fsync(fd)
+            return True
+        except OSError:
+            return False
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def fsync_dir(path):
+        # На Windows каталог не открыть через os.open - там rename журналируется NTFS
+        if os.name == "nt":
+            return
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def write(self, data):
+        """Атомарно записать журнал (tmp + fsync + os.replace)"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.journal.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.journal)
+        self.fsync_dir(str(self.root))
+
+    # ---------- установка ----------
+    def owned(self):
+        """Папки DLC в корне staging - они заменяются целиком"""
+        try:
+            with os.scandir(self.staging) as it:
+                return sorted(
+                    entry.name for entry in it
+                    if entry.is_dir(follow_symlinks=False)
+                    and entry.name[:2].upper() in DLCValidator.PREFIXES and entry.name[2:].isdigit()
+                )
+        except OSError:
+            return []
+
+    def commit(self):
+        """
+        Поставить staging на место; при ошибке - откат к прежней версии.
+        Перенос между дисками и fsync идут без блокировки, под _lock - только
+        журнал и rename'ы. Журнал помечен pid: recover() не трогает
+        транзакции живых процессов, в том числе своего
+        """
+        if StagingManager.device(self.staging) != StagingManager.device(self.game):
+            # Заданная вручную папка на другом диске: сначала переносим на том игры
+            local = self.root / f"{self.name}.new"
+            self.root.mkdir(parents=True, exist_ok=True)
+            StagingManager.move(self.staging, str(local))
+            self.staging = str(local)
+        if self.FSYNC:
+            self.fsync_tree(self.staging)
+        with self._lock:
+            self._commit()
+
+    def _commit(self):
+        names = self.owned()
+        existing = [name for name in names if os.path.lexists(os.path.join(self.game, name))]
+        data = {"staging": self.staging, "names": names, "existing": existing, "state": "prepared",
+                "pid": os.getpid()}
+        self.write(data)
+        try:
+            for name in names:
+                target = os.path.join(self.game, name)
+                if name in existing:
+                    self.old.mkdir(parents=True, exist_ok=True)
+                    os.replace(target, self.old / name)
+                os.replace(os.path.join(self.staging, name), target)
+            # Общие папки - пофайлово поверх существующих
+            StagingManager.commit(self.staging, self.game)
+            self.fsync_dir(self.game)
+        except Exception:
+            self.roll_back(data)
+            raise
+        data["state"] = "committed"
+        self.write(data)
+        self.finish()
+        if names:
+            self.log(f"Committed {', '.join(names)}" + (" (previous version replaced)" if existing else ""))
+
+    # ---------- восстановление ----------
+    def moved_in(self, name, data):
+        """Новая папка name уже на месте (прежняя, если была, отодвинута)"""
+        if os.path.lexists(os.path.join(self.staging, name)):
+            return False
+        if not os.path.lexists(os.path.join(self.game, name)):
+            return False
+        return name not in data["existing"] or os.path.lexists(self.old / name)
+
+    def roll_back(self, data):
+        """Вернуть прежние версии (rename) и выбросить новое дерево"""
+        discard = self.root / f"{self.name}.discard"
+        for name in data["names"]:
+            target = os.path.join(self.game, name)
+            if self.moved_in(name, data):
+                discard.mkdir(parents=True, exist_ok=True)
+                os.replace(target, discard / name)
+            if os.path.lexists(self.old / name):
+                os.replace(self.old / name, target)
+        shutil.rmtree(discard, ignore_errors=True)
+        shutil.rmtree(self.staging, ignore_errors=True)
+        self.finish()
+
+    def roll_forward(self, data):
+        """Все папки уже на месте - доносим общие файлы и убираем старую версию"""
+        if os.path.isdir(self.staging):
+            StagingManager.commit(self.staging, self.game)
+        self.finish()
+
+    def finish(self):
+        shutil.rmtree(self.old, ignore_errors=True)
+        for path in (self.journal, self.journal.with_suffix(".tmp")):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        for folder in (self.root, self.root.parent):
+            try:
+                folder.rmdir()
+            except OSError:
+                pass
+
+    @staticmethod
+    def pid_alive(pid):
+        """Жив ли процесс pid (его транзакция, возможно, ещё идёт)"""
+        if not pid:
+            return False
+        if pid == os.getpid():
+            # Журнал этого процесса - транзакция идёт в соседнем потоке
+            return True
+        if os.name == "nt":
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            handle = kernel32.OpenProcess(0x1000, False, pid)    # PROCESS_QUERY_LIMITED_INFORMATION
+            if not handle:
+                return False
+            try:
+                code = ctypes.c_ulong()
+                kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+                return code.value == 259                         # STILL_ACTIVE
+            finally:
+                kernel32.CloseHandle(handle)
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            return True     # процесс есть, но чужой (EPERM)
+        return True
+
+    @classmethod
+    def recover(cls, game_path, logger=None):
+        """
+        Довести или откатить транзакции, прерванные сбоем. Журналы живых
+        процессов, включая этот (идущая установка в GUI или CLI), пропускаются.
+        Возвращает число обработанных журналов
+        """
+        root = Path(game_path) / StagingManager.DIR_NAME / cls.DIR_NAME
+        if not root.is_dir():
+            return 0
+        recovered = 0
+        with cls._lock:
+            for journal in sorted(root.glob("*.json")):
+                try:
+                    txn, data = cls.from_journal(journal, logger)
+                    if cls.pid_alive(data.get("pid")):
+                        continue
+                    names = ", ".join(data["names"]) or txn.name
+                    if data["state"] == "committed" or all(txn.moved_in(n, data) for n in data["names"]):
+                        txn.roll_forward(data)
+                        txn.log(f"Finished interrupted install of {names}")
+                    else:
+                        txn.roll_back(data)
+                        txn.log(f"Rolled back interrupted install of {names}")
+                    recovered += 1
+                except Exception as e:
+                    if logger:
+                        logger.log(f"[TXN] Cannot recover {journal.name}: {e}")
+        return recovered
+
+
+# 4. Улучшенная проверка DLC (ПРАВИЛЬНАЯ ДЛЯ SIMS 4)
+class DLCValidator:
+    PREFIXES = ("EP", "GP", "SP", "FP")
+
+    # Характерные для Sims 4 DLC папки и файлы
+    MARKERS = {
+        "folders": [
+            "_locdata_", "_installer", "Geometry",
+            "Thumbnails", "UI", "Audio", "Movies"
+        ],
+        "files": [
+            "*.package", "*.bnk", "*.trayitem",
+            "*.sgi", "*.dll", "*.ts4script"
+        ]
+    }
+
+    @staticmethod
+    def is_dlc_valid(dlc_path):
+        """Проверка DLC The Sims 4 - правильная структура (один обход, до первого маркера)"""
+        path = Path(dlc_path)
+        
+        # 1. Папка существует
+        if not path.exists():
+            return False, "Path doesn't exist"
+            
+        # 2-3. Пустая папка / характерные для Sims 4 папки и файлы
+        return DLCValidator.validate_entry(DLCValidator.walk(path, stop_when_valid=True))
+        
+    @staticmethod
+    def get_dlc_size(dlc_path):
+        """Получить размер DLC"""
+        return DLCValidator.walk(dlc_path)["size"] / (1024*1024*1024)  # в GB
+
+    @staticmethod
+    def walk(dlc_path, stop_when_valid=False):
+        """
+        Один потоковый обход папки через os.scandir: число файлов, размер,
+        найденные расширения-маркеры и папки верхнего уровня.
+        stop_when_valid - остановиться, как только DLC признан валидным
+        (тогда files/size неполные, complete=False)
+        """
+        wanted = DLCValidator.marker_exts()
+        folders = set(DLCValidator.MARKERS["folders"])
+        entry = {"files": 0, "size": 0, "markers": [], "subfolders": [], "complete": True}
+        markers = set()
+        stack = [str(dlc_path)]
+        root = True
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for item in it:
+                        try:
+                            if item.is_dir(follow_symlinks=False):
+                                stack.append(item.path)
+                                if root:
+                                    entry["subfolders"].append(item.name)
+                            elif item.is_file(follow_symlinks=False):
+                                entry["files"] += 1
+                                entry["size"] += item.stat(follow_symlinks=False).st_size
+                                ext = os.path.splitext(item.name)[1].lower()
+                                if ext in wanted:
+                                    markers.add(ext)
+                        except OSError:
+                            pass
+            except OSError:
+                pass
+
+            if stop_when_valid and (markers or folders.intersection(entry["subfolders"])):
+                entry["complete"] = not stack
+                break
+            root = False
+
+        entry["markers"] = sorted(markers)
+        return entry
+
+    @staticmethod
+    def marker_exts():
+        return {pattern.replace("*", "") for pattern in DLCValidator.MARKERS["files"]}
+
+    @staticmethod
+    def validate_entry(entry):
+        """Вердикт по результату обхода (walk или запись InstalledIndex)"""
+        if not entry["files"] and not entry["subfolders"]:
+            return False, "Empty DLC folder"
+
+        found_folders = [f for f in DLCValidator.MARKERS["folders"] if f in entry["subfolders"]]
+        found_files = [
+            pattern.replace("*", "") for pattern in DLCValidator.MARKERS["files"]
+            if pattern.replace("*", "") in entry["markers"]
+        ]
+        if found_folders or found_files:
+            markers = []
+            if found_folders:
+                markers.append(f"folders: {', '.join(found_folders[:3])}")
+            if found_files:
+                markers.append(f"files: {', '.join(found_files[:3])}")
+            return True, f"Valid Sims 4 DLC ({'; '.join(markers)})"
+
+        return False, "No Sims 4 DLC markers found"
+
+
+# 4.1 Индекс установленных DLC
+class InstalledIndex:
+    """
+    Кэш состояния папок DLC в корне игры: число файлов, размер и найденные
+    маркеры. Хранится на диске; при обновлении заново читаются только
+    каталоги, у которых изменился mtime (добавили/удалили/переименовали файлы),
+    остальные берутся из индекса. Изменение содержимого файла на месте
+    mtime каталога не меняет - такие DLC нужно сбросить через invalidate().
+    """
+
+    ROOT = Path.home() / "AppData" / "Local" / "LinuaUpdater" / "index"
+    VERSION = 1
+    WORKERS = 8  # папки DLC сканируются параллельно
+
+    def __init__(self, game_path, logger=None):
+        self.game = game_path
+        self.path = self.ROOT / f"{game_key(game_path)}.json"
+        self.logger = logger
+        self.lock = threading.Lock()
+        self.root_mtime = None
+        self.entries = {}
+        self.load()
+
+    def log(self, text):
+        if self.logger:
+            self.logger.log(f"[INDEX] {text}")
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self.root_mtime = data.get("root_mtime")
+                self.entries = data.get("dlc", {})
+        except Exception:
+            pass
+
+    def save(self):
+        with self.lock:
+            data = {"version": self.VERSION, "root_mtime": self.root_mtime, "dlc": self.entries}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except Exception:
+            pass
+
+    def list_folders(self):
+        """Имена папок DLC в корне игры"""
+        folders = {}
+        try:
+            with os.scandir(self.game) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False) and entry.name.upper().startswith(DLCValidator.PREFIXES):
+                        folders[entry.name.upper()] = entry.name
+        except OSError:
+            pass
+        return folders
+
+    def installed(self):
+        """
+        Установленные DLC. Если корень игры не менялся - прямо из индекса,
+        иначе только перечитываем список папок (без обхода содержимого)
+        """
+        try:
+            mtime = os.stat(self.game).st_mtime_ns
+        except OSError:
+            return set()
+        with self.lock:
+            if mtime == self.root_mtime:
+                return set(self.entries)
+        return set(self.list_folders())
+
+    def sizes(self):
+        """{dlc_id: байт} по последнему обновлению индекса"""
+        with self.lock:
+            return {dlc_id: entry.get("size", 0) for dlc_id, entry in self.entries.items()}
+
+    def invalidate(self, dlc_id=None):
+        """Сбросить записи (после установки или ремонта), чтобы refresh прочитал их заново"""
+        with self.lock:
+            if dlc_id is None:
+                self.entries = {}
+            else:
+                self.entries.pop(dlc_id.upper(), None)
+            self.root_mtime = None
+
+    def refresh(self, on_entry=None, stop=None):
+        """
+        Обновить индекс; перечитываются только изменившиеся каталоги.
+        on_entry(dlc_id, entry) вызывается по мере готовности папок (из потоков пула),
+        stop() -> True прерывает обход: индекс не сохраняется, возвращается то, что успели
+        """
+        began = time.time()
+        try:
+            root_mtime = os.stat(self.game).st_mtime_ns
+        except OSError:
+            return {}
+
+        with self.lock:
+            old = dict(self.entries)
+
+        def scan(item):
+            dlc_id, folder = item
+            cached = old.get(dlc_id, {})
+            dirs = cached.get("dirs", {}) if cached.get("folder") == folder else {}
+            entry, count = self.scan_folder(os.path.join(self.game, folder), dirs, stop)
+            entry["folder"] = folder
+            if on_entry and not (stop and stop()):
+                on_entry(dlc_id, entry)
+            return dlc_id, entry, count
+
+        entries = {}
+        rescanned = 0
+        folders = self.list_folders()
+        with ThreadPoolExecutor(max_workers=max(1, min(self.WORKERS, len(folders)))) as pool:
+            futures = [pool.submit(scan, item) for item in folders.items()]
+            for future in as_completed(futures):
+                if stop and stop():
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                dlc_id, entry, count = future.result()
+                entries[dlc_id] = entry
+                rescanned += count
+
+        if stop and stop():
+            return entries
+
+        with self.lock:
+            self.entries = entries
+            self.root_mtime = root_mtime
+        if rescanned or set(entries) != set(old):
+            self.save()
+        self.log(f"{len(entries)} DLC folders indexed, {rescanned} directories rescanned "
+                 f"in {time.time() - began:.2f}s")
+        return entries
+
+    def scan_folder(self, path, old_dirs, stop=None):
+        """Обойти папку DLC, переиспользуя записи каталогов с прежним mtime"""
+        dirs = {}
+        rescanned = 0
+        stack = [""]
+        while stack:
+            if stop and stop():
+                break
+            rel = stack.pop()
+            full = os.path.join(path, rel) if rel else path
+            try:
+                mtime = os.stat(full).st_mtime_ns
+            except OSError:
+                continue
+            record = old_dirs.get(rel)
+            if not record or record["mtime"] != mtime:
+                record = self.scan_dir(full, mtime)
+                rescanned += 1
+            dirs[rel] = record
+            stack.extend(os.path.join(rel, d) if rel else d for d in record["subdirs"])
+
+        markers = set()
+        for record in dirs.values():
+            markers.update(record["exts"])
+        root = dirs.get("", {"subdirs": []})
+        return {
+            "files": sum(r["files"] for r in dirs.values()),
+            "size": sum(r["size"] for r in dirs.values()),
+            "markers": sorted(markers),
+            "subfolders": root["subdirs"],
+            "dirs": dirs,
+        }, rescanned
+
+    @staticmethod
+    def scan_dir(path, mtime):
+        """Один каталог через os.scandir (на Windows размер приходит без лишнего stat)"""
+        wanted = DLCValidator.marker_exts()
+        record = {"mtime": mtime, "files": 0, "size": 0, "exts": [], "subdirs": []}
+        exts = set()
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            record["subdirs"].append(entry.name)
+                        elif entry.is_file(follow_symlinks=False):
+                            record["files"] += 1
+                            record["size"] += entry.stat(follow_symlinks=False).st_size
+                            ext = os.path.splitext(entry.name)[1].lower()
+                            if ext in wanted:
+                                exts.add(ext)
+                    except OSError:
+                        pass
+        except OSError:
+            pass
+        record["exts"] = sorted(exts)
+        return record
+
+
+# 5. Улучшенная проверка игры (ОБНОВЛЕННЫЙ)
+class GameValidator:
+    # ТОЛЬКО ОБЯЗАТЕЛЬНЫЕ ФАЙЛЫ
+    ESSENTIAL_FILES = [
+        "Game/Bin/TS4_x64.exe",  # Основной исполняемый файл
+        "Data/Client/ClientDeltaBuild0.package",  # Обязательный файл данных
+        "Data/Client/ClientFullBuild0.package"   # Обязательный файл данных
+    ]
+    
+    # ОПЦИОНАЛЬНЫЕ ФАЙЛЫ (32-битные версии не обязательны)
+    OPTIONAL_FILES = [
+        "Game/Bin/TS4.exe",      # 32-битная версия (не обязательна)
+        "Game/Bin/TS4_x86.exe",  # Старая версия (не обязательна)
+    ]
+    
+    ESSENTIAL_FOLDERS = [
+        "Game",
+        "Data", 
+        "Delta",           # Delta может отсутствовать в некоторых установках
+        "Game/Bin",
+        "Data/Client"
+    ]
+    
+    @staticmethod
+    def validate_game_path(path, logger=None):
+        """Проверка игры - без ложных предупреждений о размере"""
+        game_path = Path(path)
+        issues = []
+        
+        if not game_path.exists():
+            return False, ["Game folder doesn't exist"]
+            
+        # 1. ОБЯЗАТЕЛЬНО: TS4_x64.exe
+        ts4_exe = game_path / "Game/Bin/TS4_x64.exe"
+        if not ts4_exe.exists():
+            issues.append("TS4_x64.exe missing - game cannot run")
+        else:
+            # ТОЛЬКО логируем размер, не проверяем
+            try:
+                size_mb = ts4_exe.stat().st_size / (1024 * 1024)
+                if logger:
+                    logger.log(f"[VALIDATE] TS4_x64.exe: {size_mb:.1f} MB")
+            except:
+                pass
+                
+        # 2. ОБЯЗАТЕЛЬНО: Основные папки
+        required_folders = ["Game", "Data", "Game/Bin"]
+        for folder in required_folders:
+            if not (game_path / folder).exists():
+                issues.append(f"Missing folder: {folder}")
+                
+        # 3. Проверка на Sims 4
+        sims4_markers = [
+            "Data/Client/ClientDeltaBuild0.package",
+            "Data/Client/ClientFullBuild0.package",
+            "Data/Simulation/FullBuild0.package"
+        ]
+        
+        found_markers = sum(1 for marker in sims4_markers if (game_path / marker).exists())
+        if found_markers < 1:
+            issues.append("Doesn't appear to be a Sims 4 folder")
+                
+        return len(issues) == 0, issues
+
+
+# 6. Внешняя DLC Database
+class ExternalDatabase:
+    """
+    Синхронизация базы DLC с GitHub. Формат: {"schema": 1, "version": N,
+    "dlc": {...}} (старый плоский словарь тоже понимается как версия 0).
+    Сначала запрашивается лента изменений {"base": B, "version": N,
+    "changes": [{"version": V, "set": {...}, "remove": [...]}]} - с версии
+    >= B применяются только новые записи; иначе база скачивается целиком.
+    Оба запроса условные (If-None-Match / If-Modified-Since, 304 - без тела),
+    ответ сжат gzip; кэш заменяется атомарно только целиком проверенной базой
+    """
+
+    DB_URL = "https://raw.githubusercontent.com/l1ntol/Linua-Updater/main/dlc_database.json"
+    CHANGES_URL = "https://raw.githubusercontent.com/l1ntol/Linua-Updater/main/dlc_changes.json"
+    SCHEMA = 1
+    CACHE_TIME = 300  # не чаще раза в 5 минут (проверка дешёвая - 304 без тела)
+    TIMEOUT = (3, 5)  # connect, read
+
+    _transport = None
+    _transport_lock = threading.Lock()
+
+    def __init__(self, logger, cache_file=None, db_url=None, changes_url=None):
+        self.logger = logger
+        self.cache_file = Path(cache_file) if cache_file else (
+            Path.home() / "AppData" / "Local" / "LinuaUpdater" / "dlc_cache.json"
+        )
+        self.db_url = db_url or self.DB_URL
+        self.changes_url = changes_url or self.CHANGES_URL
+        self.local_db = DLCCatalog.builtin()  # Используем локальную базу как fallback
+
+    def log(self, text):
+        if self.logger:
+            self.logger.log(f"[DB] {text}")
+
+    # ---------- кэш ----------
+    def load_state(self):
+        """Кэш: {"schema", "version", "dlc", "etag", "last_modified", "changes_etag", "checked"}"""
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("schema") == self.SCHEMA and isinstance(state.get("dlc"), dict):
+                return state
+        except Exception:
+            pass
+        return None
+
+    def save_state(self, state):
+        """Атомарная замена: читатели видят либо старую, либо новую базу целиком"""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_file.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.cache_file)
+
+    @staticmethod
+    def valid_entries(entries):
+        return isinstance(entries, dict) and all(
+            isinstance(info, dict) and info.get("name") and (info.get("url") or info.get("parts"))
+            for info in entries.values()
+        )
+
+    @classmethod
+    def parse(cls, data):
+        """(version, dlc) из ответа сервера; старый плоский формат - версия 0"""
+        if isinstance(data, dict) and "dlc" in data:
+            if data.get("schema", cls.SCHEMA) > cls.SCHEMA:
+                raise ValueError(f"Unsupported database schema {data.get('schema')}")
+            version, entries = int(data.get("version", 0)), data["dlc"]
+        else:
+            version, entries = 0, data
+        if not cls.valid_entries(entries):
+            raise ValueError("Malformed DLC entries")
+        return version, entries
+
+    # ---------- сеть ----------
+    def request(self, url, etag="", last_modified=""):
+        """Условный GET: ответ или None при 304 Not Modified"""
+        headers = {"Accept-Encoding": "gzip, deflate"}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        r = self.transport().session().get(url, headers=headers, timeout=self.TIMEOUT, verify=False)
+        if r.status_code == 304:
+            return None
+        r.raise_for_status()
+        return r
+
+    @classmethod
+    def transport(cls):
+        """Отдельный маленький пул без повторов: без сети синхронизация сразу уступает кэшу"""
+        with cls._transport_lock:
+            if cls._transport is None:
+                cls._transport = HttpTransport(pool_hosts=2, pool_per_host=2, retries=0)
+            return cls._transport
+
+    def apply_changes(self, state):
+        """
+        Применить ленту изменений к state. True - применено (или нечего),
+        False - лента не покрывает нашу версию и нужна полная загрузка
+        """
+        try:
+            r = self.request(self.changes_url, state.get("changes_etag", ""))
+        except Exception as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            if status is None:
+                raise  # нет сети - полную базу тоже не скачать
+            # 404 - сервер публикует только полную базу
+            if status != 404:
+                self.log(f"Changes feed unavailable (HTTP {status})")
+            return False
+        if r is None:
+            return True
+
+        feed = r.json()
+        if int(feed.get("base", 0)) > state["version"]:
+            return False
+        dlc = dict(state["dlc"])
+        applied = 0
+        for change in sorted(feed.get("changes", []), key=lambda c: c["version"]):
+            if change["version"] <= state["version"]:
+                continue
+            if not self.valid_entries(change.get("set", {})):
+                raise ValueError(f"Malformed change {change['version']}")
+            dlc.update(change.get("set", {}))
+            for dlc_id in change.get("remove", []):
+                dlc.pop(dlc_id, None)
+            applied += 1
+        state.update(dlc=dlc, version=max(state["version"], int(feed.get("version", 0))),
+                     changes_etag=r.headers.get("etag", ""))
+        if applied:
+            self.log(f"Applied {applied} change set(s), database version {state['version']}")
+        return True
+
+    def fetch_full(self, state):
+        """Полная загрузка (условная, если база уже есть)"""
+        r = self.request(self.db_url, state.get("etag", ""), state.get("last_modified", ""))
+        if r is None:
+            return
+        version, dlc = self.parse(r.json())
+        state.update(dlc=dlc, version=version, etag=r.headers.get("etag", ""),
+                     last_modified=r.headers.get("last-modified", ""))
+        self.log(f"Downloaded database version {version} ({len(dlc)} DLC)")
+
+    def sync(self, force=False):
+        """Обновить кэш с сервера; возвращает state кэша или None"""
+        cached = self.load_state()
+        if cached and not force and time.time() - cached.get("checked", 0) < self.CACHE_TIME:
+            return cached
+
+        state = dict(cached or {"schema": self.SCHEMA, "version": 0, "dlc": {}})
+        try:
+            if not (cached and self.apply_changes(state)):
+                self.fetch_full(state)
+        except Exception as e:
+            self.log(f"GitHub sync failed: {e}")
+            return cached
+
+        state["checked"] = time.time()
+        if cached and state["dlc"] == cached["dlc"]:
+            self.log("Database is up to date")
+        self.save_state(state)
+        return state
+
+    def merged(self, state):
+        """Встроенный каталог, дополненный/переопределённый синхронизированной базой"""
+        if not state:
+            return self.local_db
+        return self.local_db.merged(state["dlc"], state.get("version"))
+
+    def fetch_remote_database(self, force=False):
+        """Пытаться загрузить с GitHub, но использовать локальную если нет"""
+        return self.merged(self.sync(force))
+
+    def cached_database(self):
+        """База из кэша без обращения к сети"""
+        return self.merged(self.load_state())
+
+    def get_database(self, force_refresh=False):
+        """Получить актуальную базу данных"""
+        try:
+            return self.fetch_remote_database(force_refresh)
+        except Exception:
+            return self.local_db
+
+
+# 7. Расширенный Repair-режим
+class RepairCancelled(Exception):
+    """Полный ремонт отменён пользователем"""
+
+
+class StageTimeout(Exception):
+    """Этап ремонта не уложился в бюджет времени"""
+
+
+class AdvancedRepair:
+    """
+    Полный ремонт как последовательность этапов. Каждый этап можно
+    отменить (cancel) и у каждого есть бюджет времени: по его исчерпании
+    этап прерывается, а в отчёт попадают частичные результаты и время этапов.
+    """
+
+    # (этап, заголовок в отчёте)
+    STAGES = (
+        ("structure", "Checking game structure..."),
+        ("dlc", "Checking DLC folders..."),
+        ("integrity", "Verifying DLC file hashes..."),
+        ("executable", "Checking TS4_x64.exe..."),
+        ("temp", "Cleaning temp files..."),
+        ("permissions", "Checking permissions..."),
+    )
+    BUDGETS = {"structure": 30, "dlc": 600, "integrity": 1800, "executable": 30, "temp": 300, "permissions": 30}
+    TEMP_PATTERNS = [
+        "*.tmp", "*.temp", "Thumbs.db", "desktop.ini",
+        "_linua_*", "*.part", "*.crdownload"
+    ]
+
+    def __init__(self, game_path, logger, index=None, budgets=None, integrity=None, db=None, temp_dir=None):
+        self.game_path = Path(game_path)
+        self.logger = logger
+        self.temp_dir = temp_dir or None
+        # Состояние папок DLC берём из индекса (перечитываются только изменившиеся каталоги)
+        self.index = index or InstalledIndex(game_path, logger)
+        # Проверка хэшей (IntegrityVerifier) и база DLC - этап integrity выполняется только с ними
+        self.integrity = integrity
+        self.db = db or {}
+        self.budgets = dict(self.BUDGETS, **(budgets or {}))
+        self.cancelled = threading.Event()
+        self.deadline = None
+        self.progress = None
+        self.lock = threading.Lock()
+
+    def log(self, text):
+        if self.logger:
+            self.logger.log(text)
+
+    def cancel(self):
+        """Прервать текущий этап и пропустить оставшиеся"""
+        self.cancelled.set()
+
+    def should_stop(self):
+        return self.cancelled.is_set() or (self.deadline is not None and time.time() > self.deadline)
+
+    def checkpoint(self):
+        """Точка прерывания внутри этапа"""
+        if self.cancelled.is_set():
+            raise RepairCancelled()
+        if self.deadline is not None and time.time() > self.deadline:
+            raise StageTimeout()
+
+    def notify(self, stage, done=0, total=0):
+        if self.progress:
+            try:
+                self.progress(stage, done, total)
+            except Exception:
+                pass
+
+    def run_full_repair(self, progress=None):
+        """
+        Полный ремонт игры - правильная проверка DLC.
+        progress(stage, done, total) сообщает о начале этапа и о ходе проверки DLC
+        """
+        results = {
+            "checks": [],
+            "fixed": [],
+            "errors": [],
+            "warnings": [],
+            "timings": {}
+        }
+        self.progress = progress
+
+        for stage, title in self.STAGES:
+            if self.cancelled.is_set():
+                break
+            if stage == "integrity" and not self.integrity:
+                continue
+            results["checks"].append(title)
+            self.notify(stage)
+            began = time.time()
+            self.deadline = began + self.budgets[stage]
+            try:
+                getattr(self, f"stage_{stage}")(results)
+            except StageTimeout:
+                results["warnings"].append(
+                    f"Stage '{stage}' exceeded its {self.budgets[stage]}s budget - results are partial"
+                )
+            except RepairCancelled:
+                pass
+            finally:
+                results["timings"][stage] = time.time() - began
+                self.deadline = None
+
+        if self.cancelled.is_set():
+            results["warnings"].append("Repair cancelled by user")
+
+        # Сводка
+        if not results["errors"]:
+            results["fixed"].append("No critical errors found")
+            
+        report = self.generate_report(results)
+        return results, report
+
+    def stage_structure(self, results):
+        """1. Проверка структуры игры"""
+        structure_ok, issues = GameValidator.validate_game_path(self.game_path)
+        if not structure_ok:
+            results["errors"].extend(issues)
+
+    def stage_dlc(self, results):
+        """2. Проверка DLC Sims 4 - папки проверяются параллельно, результаты идут по мере готовности"""
+        total = len(self.index.list_folders())
+        counts = {"done": 0, "valid": 0, "size": 0}
+
+        def on_entry(dlc_id, entry):
+            name = entry["folder"]
+            valid, reason = DLCValidator.validate_entry(entry)
+            with self.lock:
+                counts["done"] += 1
+                if valid:
+                    counts["valid"] += 1
+                    counts["size"] += entry["size"]
+                elif entry["files"] or entry["subfolders"]:
+                    # Есть файлы, но не похоже на стандартный DLC
+                    results["warnings"].append(f"{name}: Non-standard content ({entry['files']} files)")
+                else:
+                    # Пустая папка - удалить?
+                    results["warnings"].append(f"{name}: Empty folder")
+                done = counts["done"]
+            self.log(f"[OK] {name} - {reason}" if valid else f"[WARNING] {name} - {reason}")
+            self.notify("dlc", done, total)
+
+        try:
+            self.index.refresh(on_entry=on_entry, stop=self.should_stop)
+            self.checkpoint()
+        finally:
+            size_gb = counts["size"] / (1024 * 1024 * 1024)
+            results["checks"].append(
+                f"Found {counts['valid']}/{total} valid DLC ({size_gb:.1f} GB total)"
+                + ("" if counts["done"] == total else f" - checked {counts['done']}/{total}")
+            )
+
+    def stage_integrity(self, results):
+        """3. Хэши файлов установленных DLC; повреждённые файлы скачиваются заново"""
+        installed = self.index.installed()
+        targets = [(dlc_id, info) for dlc_id, info in sorted(self.db.items()) if dlc_id.upper() in installed]
+        counts = {"files": 0, "hashed": 0, "skipped": 0}
+
+        try:
+            for done, (dlc_id, info) in enumerate(targets):
+                self.checkpoint()
+                result = self.integrity.verify(dlc_id, info, stop=self.should_stop)
+                self.checkpoint()
+                self.notify("integrity", done + 1, len(targets))
+                if result is None:
+                    counts["skipped"] += 1
+                    continue
+                counts["files"] += result["files"]
+                counts["hashed"] += result["hashed"]
+                if result["unreadable"]:
+                    # Скорее всего файлы заняты запущенной игрой - перезаписать их тоже не выйдет
+                    results["warnings"].append(
+                        f"{dlc_id}: {len(result['unreadable'])} file(s) could not be read "
+                        f"(close the game and run repair again)"
+                    )
+                broken = result["damaged"] + result["missing"]
+                if not broken:
+                    continue
+
+                self.log(f"[REPAIR] {dlc_id}: re-downloading {len(broken)} damaged file(s)")
+                ok, reason = self.integrity.repair(dlc_id, info, broken)
+                if ok:
+                    results["fixed"].append(f"{dlc_id}: restored {len(broken)} damaged file(s)")
+                else:
+                    results["errors"].append(f"{dlc_id}: {len(broken)} damaged file(s) - {reason}")
+        finally:
+            results["checks"].append(
+                f"Verified {counts['files']} files in {len(targets) - counts['skipped']} DLC "
+                f"({counts['hashed']} hashed, the rest unchanged since last check)"
+            )
+
+    def stage_executable(self, results):
+        """4. Проверка TS4_x64.exe"""
+        exe_path = self.game_path / "Game/Bin/TS4_x64.exe"
+        if exe_path.exists():
+            try:
+                size_mb = exe_path.stat().st_size / (1024 * 1024)
+                results["checks"].append(f"TS4_x64.exe: {size_mb:.1f} MB")
+                
+                # Диапазон размеров для разных версий Sims 4
+                if size_mb > 30 and size_mb < 200:
+                    results["fixed"].append(f"Game executable OK ({size_mb:.1f} MB)")
+                elif size_mb < 30:
+                    results["warnings"].append(f"TS4_x64.exe small ({size_mb:.1f} MB)")
+                else:
+                    results["warnings"].append(f"TS4_x64.exe large ({size_mb:.1f} MB)")
+            except:
+                results["checks"].append("TS4_x64.exe: Unable to get size")
+        else:
+            results["errors"].append("TS4_x64.exe missing")
+
+    def stage_temp(self, results):
+        """5. Очистка временных файлов"""
+        counter = {"cleaned": 0}
+        try:
+            self.clean_temp_files(counter)
+        finally:
+            if counter["cleaned"]:
+                results["fixed"].append(f"Cleaned {counter['cleaned']} temp files")
+
+    def stage_permissions(self, results):
+        """6. Проверка прав"""
+        if not self.check_permissions():
+            results["warnings"].append("Insufficient write permissions")
+        
+    def clean_temp_files(self, counter=None):
+        """Очистка временных файлов - один обход дерева игры для всех шаблонов"""
+        counter = counter if counter is not None else {"cleaned": 0}
+        work = set(StagingManager.roots(self.game_path, self.temp_dir))
+        for folder, dirs, files in os.walk(self.game_path):
+            self.checkpoint()
+            # Недокачанные архивы в рабочих папках нужны для докачки - их чистит StagingManager.prune
+            dirs[:] = [d for d in dirs if Path(folder, d) not in work]
+            for name in files:
+                if any(fnmatch.fnmatch(name, pattern) for pattern in self.TEMP_PATTERNS):
+                    try:
+                        os.unlink(os.path.join(folder, name))
+                        counter["cleaned"] += 1
+                    except OSError:
+                        pass
+        counter["cleaned"] += StagingManager.prune_all(self.game_path, self.temp_dir)
+        return counter["cleaned"]
+                    
+    def check_permissions(self):
+        """Проверка прав на запись"""
+        test_file = self.game_path / ".permission_test"
+        try:
+            test_file.touch()
+            test_file.unlink()
+            return True
+        except:
+            return False
+            
+    def generate_report(self, results):
+        """Создать отчет о ремонте"""
+        report_lines = [
+            "=== Linua Updater Repair Report ===",
+            f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Game path: {self.game_path}",
+            ""
+        ]
+        
+        if results["checks"]:
+            report_lines.append("Checks performed:")
+            for check in results["checks"]:
+                report_lines.append(f"  • {check}")
+                
+        if results["fixed"]:
+            report_lines.append("\nIssues fixed:")
+            for fix in results["fixed"]:
+                report_lines.append(f"  ✓ {fix}")
+                
+        if results["warnings"]:
+            report_lines.append("\nWarnings:")
+            for warning in results["warnings"]:
+                report_lines.append(f"  ⚠ {warning}")
+                
+        if results["errors"]:
+            report_lines.append("\nCritical errors:")
+            for error in results["errors"]:
+                report_lines.append(f"  ✗ {error}")
+
+        if results.get("timings"):
+            report_lines.append("\nStage timings:")
+            for stage, seconds in results["timings"].items():
+                report_lines.append(f"  {stage:<12} {seconds:7.2f}s")
+                
+        return "\n".join(report_lines)
+
+
+# 8. Offline-режим
+class OfflineMode:
+    def __init__(self, config, logger):
+        self.config = config
+        self.logger = logger
+        self.is_offline = False
+        
+    HOSTS = (("8.8.8.8", 53), ("github.com", 443))
+
+    @classmethod
+    def probe(cls, timeout=2):
+        """Проверка сети без побочных эффектов (можно звать из любого потока)"""
+        try:
+            for host in cls.HOSTS:
+                socket.create_connection(host, timeout=timeout).close()
+            return True
+        except OSError:
+            return False
+
+    def apply(self, online):
+        """Запомнить результат проверки"""
+        self.is_offline = not online
+        if self.is_offline:
+            self.enable_offline_mode()
+        return online
+
+    def check_connection(self):
+        """Проверить подключение (блокирует до 4 секунд)"""
+        return self.apply(self.probe())
+            
+    def enable_offline_mode(self):
+        """Включить оффлайн-режим"""
+        self.logger.log("[OFFLINE] Running in offline mode")
+        
+    def get_available_features(self):
+        """Получить доступные функции в оффлайн-режиме"""
+        if self.is_offline:
+            return {
+                "repair": True,
+                "validate": True,
+                "check_installed": True,
+                "cleanup": True,
+                "update": False,
+                "download": False,
+                "auto_update": False
+            }
+        return {
+            "repair": True,
+            "validate": True,
+            "check_installed": True,
+            "cleanup": True,
+            "update": True,
+            "download": True,
+            "auto_update": True
+        }
+
+
+# ================================================================
+#                         DLC DATABASE
+# ================================================================
+class DLCCatalog(Mapping):
+    """
+    Неизменяемый каталог DLC с индексами, которые строятся один раз:
+    по категориям, многотомные/одиночные, по словам названия, плюс размер
+    и зависимости. Читается как обычный dict (id -> info); обновление
+    базы создаёт новый каталог, а не правит существующий
+    """
+
+    # Порядок задаёт порядок групп в окне выбора
+    CATEGORIES = (
+        ("EP", "Expansion Packs"),
+        ("GP", "Game Packs"),
+        ("SP", "Stuff Packs"),
+        ("FP", "Free Packs"),
+    )
+    OTHER = "Other"
+
+    _builtin = None
+    _lock = threading.Lock()
+
+    def __init__(self, entries, version=0):
+        self.version = version
+        self._entries = MappingProxyType({
+            str(dlc_id).upper(): dict(info) for dlc_id, info in entries.items()
+        })
+        titles = dict(self.CATEGORIES)
+        groups = {}
+        tokens = {}
+        for dlc_id in sorted(self._entries):
+            info = self._entries[dlc_id]
+            title = titles.get(dlc_id[:2], self.OTHER)
+            groups.setdefault(title, []).append(dlc_id)
+            for token in self.tokenize(f"{dlc_id} {info.get('name', '')}"):
+                tokens.setdefault(token, set()).add(dlc_id)
+        order = [title for _, title in self.CATEGORIES] + [self.OTHER]
+        self._categories = MappingProxyType({
+            title: tuple(groups[title]) for title in order if title in groups
+        })
+        self._tokens = {token: frozenset(ids) for token, ids in tokens.items()}
+        self.multipart = frozenset(i for i, info in self._entries.items() if info.get("parts"))
+        self.single = frozenset(self._entries) - self.multipart
+
+    # ---------- построение ----------
+    @classmethod
+    def from_compact(cls, rows, base_url="", extra=None, version=0):
+        """Каталог из строк (id, название, файл); extra - доп. поля по id"""
+        extra = extra or {}
+        entries = {}
+        for dlc_id, name, filename in rows:
+            info = {"name": name, "url": f"{base_url}{dlc_id}/{filename}"}
+            info.update(extra.get(dlc_id, {}))
+            entries[dlc_id] = info
+        return cls(entries, version)
+
+    @classmethod
+    def builtin(cls):
+        """Встроенный каталог - один экземпляр на процесс"""
+        with cls._lock:
+            if cls._builtin is None:
+                import dlc_database
+                cls._builtin = cls.from_compact(
+                    dlc_database.ROWS, dlc_database.BASE_URL,
+                    dlc_database.EXTRA, dlc_database.VERSION
+                )
+            return cls._builtin
+
+    def merged(self, entries, version=None):
+        """Новый каталог: этот, дополненный/переопределённый entries"""
+        if not entries:
+            return self
+        combined = dict(self._entries)
+        combined.update(entries)
+        return DLCCatalog(combined, self.version if version is None else version)
+
+    # ---------- Mapping ----------
+    def __getitem__(self, dlc_id):
+        return self._entries[dlc_id]
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def all(self):
+        return self
+
+    # ---------- запросы ----------
+    @staticmethod
+    def tokenize(text):
+        return {word for word in "".join(
+            c if c.isalnum() else " " for c in text.lower()
+        ).split()}
+
+    def categories(self):
+        """{название группы: отсортированные id} в порядке CATEGORIES"""
+        return self._categories
+
+    def category(self, dlc_id):
+        return dict(self.CATEGORIES).get(dlc_id.upper()[:2], self.OTHER)
+
+    def search(self, text):
+        """id, в названии которых есть все слова запроса (по префиксу)"""
+        found = None
+        for word in self.tokenize(text):
+            ids = set()
+            for token, owners in self._tokens.items():
+                if token.startswith(word):
+                    ids |= owners
+            found = ids if found is None else found & ids
+        return sorted(found or ())
+
+    def is_multipart(self, dlc_id):
+        return dlc_id in self.multipart
+
+    @staticmethod
+    def archive_size(info):
+        """Размер архива (или суммы частей) по записи DLC, 0 если неизвестен"""
+        return int(info.get("size") or sum(info.get("parts_size", ())) or 0)
+
+    def size(self, dlc_id):
+        """Размер архива(ов) в байтах, если известен, иначе 0"""
+        return self.archive_size(self._entries.get(dlc_id, {}))
+
+    def installed_size(self, dlc_id):
+        """Размер после распаковки, если известен (см. InstallPlanner), иначе 0"""
+        return int(self._entries.get(dlc_id, {}).get("installed_size", 0) or 0)
+
+    def requires(self, dlc_id):
+        """DLC, без которых этот не работает"""
+        return tuple(self._entries.get(dlc_id, {}).get("requires", ()))
+
+
+class DLCDatabase:
+    """Текущий каталог приложения: по умолчанию общий встроенный DLCCatalog"""
+
+    def __init__(self, catalog=None):
+        self.dlc = catalog or DLCCatalog.builtin()
+
+    def all(self):
+        return self.dlc
+
+    def replace(self, dlc):
+        """Подменить базу целиком (одно присваивание - читатели видят старую или новую)"""
+        self.dlc = dlc if isinstance(dlc, DLCCatalog) else DLCCatalog(dlc)
@@ -0,0 +1,161 @@
+"""
+Общие фикстуры: in-process HTTP-сервер с Range/ETag/If-Range и обрывами
+соединения, ZIP-архивы DLC и изолированные каталоги кэшей.
+"""
+
+import io
+import os
+import sys
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import linua_core  # noqa: E402
+
+
+class FileServer:
+    """
+    Отдаёт файлы из self.files: {path: {"data", "etag"}}.
+    ranges - поддержка Range; faults - список "оборвать ответ после N байт"
+    (по одному на каждый следующий GET); head_etag - ETag, который видит
+    HEAD (файл изменился между HEAD и GET); requests - журнал запросов
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.ranges = True
+        self.faults = []
+        self.head_etag = None
+        self.requests = []
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler())
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/{path.lstrip('/')}"
+
+    def put(self, path, data, etag='"v1"'):
+        self.files["/" + path.lstrip("/")] = {"data": data, "etag": etag}
+        return self.url(path)
+
+    def gets(self, path=None):
+        """Заголовки GET-запросов (к path, если задан)"""
+        return [headers for method, p, headers in self.requests
+                if method == "GET" and (path is None or p == "/" + path.lstrip("/"))]
+
+    def handler(self):
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def send(self, code, length, etag, extra=()):
+                self.send_response(code)
+                self.send_header("Content-Type", "application/zip")
+                self.send_header("Content-Length", str(length))
+                if owner.ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                if etag:
+                    self.send_header("ETag", etag)
+                for key, value in extra:
+                    self.send_header(key, value)
+                self.end_headers()
+
+            def lookup(self):
+                with owner.lock:
+                    owner.requests.append((self.command, self.path, dict(self.headers)))
+                entry = owner.files.get(self.path)
+                if entry is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                return entry
+
+            def do_HEAD(self):
+                entry = self.lookup()
+                if entry:
+                    etag = owner.head_etag or entry["etag"]
+                    self.send(200, len(entry["data"]), etag)
+
+            def do_GET(self):
+                entry = self.lookup()
+                if not entry:
+                    return
+                data, etag = entry["data"], entry["etag"]
+                if etag and self.headers.get("If-None-Match") == etag:
+                    self.send(304, 0, etag)
+                    return
+                rng = self.headers.get("Range")
+                if_range = self.headers.get("If-Range")
+                if owner.ranges and rng and (if_range is None or if_range == etag):
+                    first, last = rng.split("=", 1)[1].split("-")
+                    start = int(first)
+                    end = min(int(last), len(data) - 1) if last else len(data) - 1
+                    body = data[start:end + 1]
+                    self.send(206, len(body), etag, [("Content-Range", f"bytes {start}-{end}/{len(data)}")])
+                else:
+                    body = data
+                    self.send(200, len(body), etag)
+                with owner.lock:
+                    cut = owner.faults.pop(0) if owner.faults else None
+                try:
+                    if cut is not None:
+                        # Обрыв на середине ответа: Content-Length уже обещан целиком
+                        self.wfile.write(body[:cut])
+                        self.wfile.flush()
+                        self.close_connection = True
+                        return
+                    self.wfile.write(body)
+                except OSError:
+                    pass
+
+        return Handler
+
+
+@pytest.fixture
+def server():
+    srv = FileServer()
+    yield srv
+    srv.server.shutdown()
+    srv.server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    """Индексы, манифесты и запасная рабочая папка - во временном каталоге теста"""
+    monkeypatch.setattr(linua_core.InstalledManifest, "ROOT", tmp_path / "manifests")
+    monkeypatch.setattr(linua_core.InstalledIndex, "ROOT", tmp_path / "index")
+    monkeypatch.setattr(linua_core.StagingManager, "FALLBACK_ROOT", tmp_path / "fallback")
+
+
+def make_zip(files, compression=zipfile.ZIP_DEFLATED):
+    """ZIP в памяти: {имя: байты}"""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression) as z:
+        for name, data in files.items():
+            z.writestr(name, data)
+    return buf.getvalue()
+
+
+def payload(size):
+    return os.urandom(size)
+
+
+class ListLogger:
+    """Логгер, собирающий строки (для проверок по тексту лога)"""
+
+    def __init__(self):
+        self.lines = []
+
+    def log(self, text):
+        self.lines.append(text)
@@ -0,0 +1,98 @@
+"""ArchiveCache: поиск по URL с проверкой размера/sha256/ETag, LRU-вытеснение и seed"""
+
+import hashlib
+import time
+
+import pytest
+
+from linua_core import ArchiveCache, DownloadEngine, Extractor, SingleDLCInstaller
+from conftest import make_zip, payload
+
+URL = "https://example.com/EP01.zip"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ArchiveCache(tmp_path / "cache", max_bytes=10_000)
+
+
+def archive(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_lookup_checks_size_and_sha256(cache, tmp_path):
+    data = payload(1000)
+    stored = cache.store(URL, archive(tmp_path, "a.zip", data), etag='"v1"')
+
+    assert cache.lookup(URL) == stored
+    assert cache.lookup(URL, size=1000, sha256=hashlib.sha256(data).hexdigest()) == stored
+    assert cache.lookup(URL, size=999) is None
+    assert cache.lookup("https://example.com/EP02.zip") is None
+
+
+def test_lookup_revalidates_with_server(cache, tmp_path):
+    stored = cache.store(URL, archive(tmp_path, "a.zip", payload(1000)), etag='"v1"')
+
+    assert cache.lookup(URL, probe=lambda url: {"total": 1000, "etag": '"v1"'}) == stored
+    # Архив перевыложен под тем же URL
+    assert cache.lookup(URL, probe=lambda url: {"total": 1000, "etag": '"v2"'}) is None
+    assert cache.lookup(URL, probe=lambda url: {"total": 1200, "etag": ""}) is None
+    # Сервер недоступен - копия отдаётся как есть
+    assert cache.lookup(URL, probe=lambda url: {"total": 0, "etag": ""}) == stored
+
+
+def test_trusted_sha256_skips_probe(cache, tmp_path):
+    data = payload(1000)
+    digest = hashlib.sha256(data).hexdigest()
+    stored = cache.store(URL, archive(tmp_path, "a.zip", data), sha256=digest)
+
+    def probe(url):
+        raise AssertionError("no network for a verified copy")
+
+    assert cache.lookup(URL, sha256=digest, probe=probe) == stored
+
+
+def test_lru_eviction(cache, tmp_path):
+    urls = [f"https://example.com/SP0{i}.zip" for i in range(3)]
+    for i, url in enumerate(urls[:2]):
+        cache.store(url, archive(tmp_path, f"{i}.zip", payload(4000)))
+        time.sleep(0.02)  # разные last_used и при грубом таймере
+    assert cache.lookup(urls[0])  # SP00 использован позже SP01
+    time.sleep(0.02)
+
+    cache.store(urls[2], archive(tmp_path, "2.zip", payload(4000)))
+
+    assert cache.lookup(urls[0]) and cache.lookup(urls[2])
+    assert cache.lookup(urls[1]) is None
+    assert len(list(cache.objects.iterdir())) == 2
+
+
+def test_seed_by_file_name(cache, tmp_path):
+    folder = tmp_path / "archives"
+    folder.mkdir()
+    (folder / "ep01.zip").write_bytes(payload(100))
+    (folder / "unknown.zip").write_bytes(payload(100))
+    db = {"EP01": {"name": "Get to Work", "url": URL}}
+
+    assert cache.seed(folder, db) == 1
+    assert cache.lookup(URL)
+
+
+def test_installer_uses_cache_without_download(server, tmp_path):
+    files = {"EP01/a.package": payload(5000)}
+    data = make_zip(files)
+    url = server.put("EP01.zip", data)
+    cache = ArchiveCache(tmp_path / "cache")
+    cache.store(url, archive(tmp_path, "EP01.zip", data), etag='"v1"')
+    game = tmp_path / "game"
+    game.mkdir()
+    server.requests.clear()
+
+    ok, reason = SingleDLCInstaller("EP01", {"url": url}, str(game), DownloadEngine(None), Extractor(None),
+                                    None, cache=cache).run()
+
+    assert ok, reason
+    assert (game / "EP01" / "a.package").read_bytes() == files["EP01/a.package"]
+    assert server.gets() == []
@@ -0,0 +1,106 @@
+"""ExternalDatabase: условная синхронизация базы DLC, лента изменений и 304"""
+
+import json
+import threading
+import time
+
+import pytest
+
+import linua_core
+from linua_core import ExternalDatabase
+from conftest import ListLogger
+
+BASE = {"EP01": {"name": "Get to Work", "url": "https://example.com/EP01.zip"}}
+
+
+def publish(server, path, data, etag):
+    return server.put(path, json.dumps(data).encode(), etag=etag)
+
+
+@pytest.fixture
+def database(server, tmp_path):
+    db_url = publish(server, "dlc_database.json", {"schema": 1, "version": 3, "dlc": BASE}, '"db3"')
+    changes_url = publish(server, "dlc_changes.json", {"base": 3, "version": 3, "changes": []}, '"ch3"')
+    return ExternalDatabase(ListLogger(), tmp_path / "dlc_cache.json", db_url, changes_url)
+
+
+def test_first_sync_downloads_full_database(database, server):
+    state = database.sync()
+
+    assert state["version"] == 3 and state["dlc"] == BASE
+    assert state["etag"] == '"db3"'
+    assert database.load_state()["dlc"] == BASE
+    assert len(server.gets("dlc_changes.json")) == 0
+
+
+def test_not_modified_keeps_cache(database, server):
+    database.sync()
+    database.sync(force=True)  # первый запрос ленты запоминает её ETag
+    server.requests.clear()
+
+    state = database.sync(force=True)
+
+    assert state["dlc"] == BASE
+    # Лента не изменилась: 304 без тела, полная база не запрашивается
+    assert [h.get("If-None-Match") for h in server.gets("dlc_changes.json")] == ['"ch3"']
+    assert server.gets("dlc_database.json") == []
+    assert "[DB] Database is up to date" in database.logger.lines
+
+
+def test_full_database_not_modified(database, server):
+    """Без ленты изменений полная база запрашивается условно"""
+    database.sync()
+    del server.files["/dlc_changes.json"]
+    server.requests.clear()
+
+    state = database.sync(force=True)
+
+    assert state["dlc"] == BASE
+    assert [h.get("If-None-Match") for h in server.gets("dlc_database.json")] == ['"db3"']
+
+
+def test_changes_feed_is_applied(database, server):
+    database.sync()
+    publish(server, "dlc_changes.json", {"base": 3, "version": 4, "changes": [
+        {"version": 4, "set": {"GP01": {"name": "Outdoor Retreat", "url": "https://example.com/GP01.zip"}},
+         "remove": ["EP01"]},
+    ]}, '"ch4"')
+    server.requests.clear()
+
+    state = database.sync(force=True)
+
+    assert state["version"] == 4 and list(state["dlc"]) == ["GP01"]
+    assert server.gets("dlc_database.json") == []
+
+
+def test_changes_from_older_base_fall_back_to_full(database, server):
+    database.sync()
+    publish(server, "dlc_changes.json", {"base": 5, "version": 6, "changes": []}, '"ch6"')
+    publish(server, "dlc_database.json", {"schema": 1, "version": 6, "dlc": {}}, '"db6"')
+
+    state = database.sync(force=True)
+
+    assert state["version"] == 6 and state["dlc"] == {}
+
+
+def test_transport_created_once(monkeypatch):
+    """Параллельные первые синхронизации получают один и тот же пул"""
+    created = []
+
+    class SlowTransport(linua_core.HttpTransport):
+        def __init__(self, *args, **kwargs):
+            created.append(self)
+            time.sleep(0.05)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(linua_core, "HttpTransport", SlowTransport)
+    monkeypatch.setattr(ExternalDatabase, "_transport", None)
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(ExternalDatabase.transport())) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(created) == 1
+    assert all(t is created[0] for t in seen)
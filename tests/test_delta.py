@@ -0,0 +1,135 @@
+"""DeltaUpdater: докачка только изменившихся элементов ZIP поверх установленного DLC"""
+
+import io
+import os
+import zipfile
+from contextlib import contextmanager
+
+import pytest
+
+from linua_core import (DeltaUpdater, DownloadEngine, Extractor, InstallSlots, InstalledManifest,
+                        SingleDLCInstaller)
+from conftest import make_zip, payload
+
+V1 = {f"EP01/file{i}.package": payload(100_000) for i in range(4)}
+
+
+@pytest.fixture
+def installed(server, tmp_path):
+    game = tmp_path / "game"
+    game.mkdir()
+    info = {"url": server.put("EP01.zip", make_zip(V1))}
+    ok, reason = SingleDLCInstaller("EP01", info, str(game), DownloadEngine(None), Extractor(None), None).run()
+    assert ok, reason
+    return game, info
+
+
+def updater(game, info, slots=None):
+    return DeltaUpdater("EP01", info, str(game), DownloadEngine(None), Extractor(None), None, slots)
+
+
+def fetched(server):
+    return [h["Range"] for h in server.gets("EP01.zip")]
+
+
+def test_up_to_date(installed, server):
+    game, info = installed
+    server.requests.clear()
+
+    assert updater(game, info).run() == (True, "Up to date")
+    # Только хвост с central directory
+    assert len(fetched(server)) == 1
+
+
+def test_add_change_remove(installed, server):
+    game, info = installed
+    v2 = dict(V1)
+    v2["EP01/file1.package"] = payload(120_000)
+    v2["EP01/new.package"] = payload(50_000)
+    del v2["EP01/file3.package"]
+    server.put("EP01.zip", make_zip(v2), etag='"v2"')
+    server.requests.clear()
+
+    assert updater(game, info).run() == (True, "OK")
+
+    on_disk = {f"EP01/{name}": (game / "EP01" / name).read_bytes() for name in os.listdir(game / "EP01")}
+    assert on_disk == v2
+    # Хвост с central directory и один диапазон (изменённые элементы рядом), а не весь архив
+    assert len(fetched(server)) == 2
+    manifest = InstalledManifest(str(game), "EP01")
+    assert manifest.load() and set(manifest.files) == set(v2)
+
+
+def test_damaged_file_without_manifest_is_found_by_crc(installed, server, tmp_path):
+    game, info = installed
+    for path in (tmp_path / "manifests").rglob("*.json"):
+        path.unlink()
+    target = game / "EP01" / "file2.package"
+    target.write_bytes(bytes(len(V1["EP01/file2.package"])))  # размер тот же, содержимое другое
+
+    assert updater(game, info).run() == (True, "OK")
+    assert target.read_bytes() == V1["EP01/file2.package"]
+
+
+class RecordingSlots(InstallSlots):
+    def __init__(self):
+        super().__init__()
+        self.held = set()
+
+    @contextmanager
+    def hold(self, name):
+        self.held.add(name)
+        try:
+            yield
+        finally:
+            self.held.discard(name)
+
+    def download(self):
+        return self.hold("download")
+
+    def extract(self):
+        return self.hold("extract")
+
+
+def test_local_hashing_does_not_hold_download_slot(installed, server, monkeypatch):
+    game, info = installed
+    server.put("EP01.zip", make_zip(dict(V1, **{"EP01/file0.package": payload(100_000)})), etag='"v2"')
+    slots = RecordingSlots()
+    seen = {}
+    real_changed, real_stream = DeltaUpdater.changed_members, Extractor.extract_zip_stream
+
+    def changed(self, *args):
+        seen["hashing"] = set(slots.held)
+        return real_changed(self, *args)
+
+    def stream(self, *args, **kwargs):
+        seen["fetch"] = set(slots.held)
+        return real_stream(self, *args, **kwargs)
+
+    monkeypatch.setattr(DeltaUpdater, "changed_members", changed)
+    monkeypatch.setattr(Extractor, "extract_zip_stream", stream)
+
+    assert updater(game, info, slots).run() == (True, "OK")
+    assert seen == {"hashing": {"extract"}, "fetch": {"download"}}
+
+
+def test_plan_ranges_merges_close_members(monkeypatch):
+    data = make_zip({f"f{i}": payload(1000) for i in range(5)}, zipfile.ZIP_STORED)
+    members = zipfile.ZipFile(io.BytesIO(data)).infolist()
+    du = DeltaUpdater("EP01", {}, "", None, None, None)
+
+    groups = du.plan_ranges(members, [members[3], members[1]], len(data))
+    assert len(groups) == 1
+    start, end, group = groups[0]
+    assert (start, end) == (members[1].header_offset, members[4].header_offset)
+    assert group == [members[1], members[3]]
+
+    monkeypatch.setattr(DeltaUpdater, "MAX_GAP", 0)
+    groups = du.plan_ranges(members, [members[1], members[3]], len(data))
+    assert [(s, e) for s, e, _ in groups] == [
+        (members[1].header_offset, members[2].header_offset),
+        (members[3].header_offset, members[4].header_offset),
+    ]
+    # Последний элемент: до конца архива не дальше оценки сверху
+    (s, e, _), = du.plan_ranges(members, [members[4]], len(data))
+    assert s == members[4].header_offset and members[4].header_offset + members[4].compress_size < e <= len(data)
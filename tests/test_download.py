@@ -0,0 +1,202 @@
+"""DownloadEngine: сегменты, журнал докачки, обрывы, смена файла на сервере"""
+
+import hashlib
+import os
+
+import pytest
+
+from linua_core import DownloadEngine, DownloadJournal, ProgressTracker, StreamHasher
+from conftest import ListLogger, payload
+
+SIZE = 3 * 1024 * 1024 + 123
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    # Мелкие сегменты, чтобы файл в несколько МБ качался по нескольким соединениям
+    monkeypatch.setattr(DownloadEngine, "MIN_SEGMENT_SIZE", 256 * 1024)
+    return DownloadEngine(ListLogger(), segments=4)
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def range_starts(server, path):
+    return [int(h["Range"].split("=")[1].split("-")[0]) for h in server.gets(path) if "Range" in h]
+
+
+def test_segmented_download_with_sha256(server, engine, tmp_path):
+    data = payload(SIZE)
+    url = server.put("a.zip", data)
+    out = str(tmp_path / "a.zip")
+
+    ok, reason = engine.download(url, out, size=len(data), sha256=hashlib.sha256(data).hexdigest())
+
+    assert (ok, reason) == (True, "OK")
+    assert read(out) == data
+    assert len(range_starts(server, "a.zip")) == 4
+
+
+def test_bad_sha256_discards_file(server, engine, tmp_path):
+    url = server.put("a.zip", payload(SIZE))
+    out = str(tmp_path / "a.zip")
+
+    ok, _ = engine.download(url, out, sha256="0" * 64)
+
+    assert not ok
+    assert not os.path.exists(out)
+    assert not os.path.exists(DownloadJournal(out).path)
+
+
+def test_server_without_ranges_falls_back_to_single_stream(server, engine, tmp_path):
+    data = payload(SIZE)
+    url = server.put("a.zip", data)
+    server.ranges = False
+    out = str(tmp_path / "a.zip")
+
+    ok, _ = engine.download(url, out, sha256=hashlib.sha256(data).hexdigest())
+
+    assert ok
+    assert read(out) == data
+    assert range_starts(server, "a.zip") == []
+
+
+def test_resume_fetches_only_missing_range(server, engine, tmp_path):
+    data = payload(SIZE)
+    url = server.put("a.zip", data)
+    out = str(tmp_path / "a.zip")
+    half = SIZE // 2
+    # Состояние после прерванной загрузки: первая половина на диске и в журнале
+    with open(out, "wb") as f:
+        f.write(data[:half])
+        f.truncate(SIZE)
+    journal = DownloadJournal(out)
+    journal.reset(url, '"v1"', "", SIZE)
+    journal.add(0, half)
+    journal.save()
+
+    ok, _ = engine.download(url, out, sha256=hashlib.sha256(data).hexdigest())
+
+    assert ok
+    assert read(out) == data
+    assert min(range_starts(server, "a.zip")) == half
+
+
+def test_etag_change_restarts_download(server, engine, tmp_path):
+    old = payload(SIZE)
+    url = server.put("a.zip", old, etag='"v1"')
+    out = str(tmp_path / "a.zip")
+    with open(out, "wb") as f:
+        f.write(old[:SIZE // 2])
+        f.truncate(SIZE)
+    journal = DownloadJournal(out)
+    journal.reset(url, '"v1"', "", SIZE)
+    journal.add(0, SIZE // 2)
+    journal.save()
+
+    new = payload(SIZE)
+    server.put("a.zip", new, etag='"v2"')
+    ok, _ = engine.download(url, out, sha256=hashlib.sha256(new).hexdigest())
+
+    assert ok
+    assert read(out) == new
+    assert min(range_starts(server, "a.zip")) == 0
+    assert any("Remote file changed" in line for line in engine.logger.lines)
+
+
+def test_if_range_mismatch_restarts_hash(server, engine, tmp_path):
+    """HEAD ещё видит старый ETag, а GET - уже новый файл: If-Range не совпадает"""
+    old = payload(SIZE)
+    url = server.put("a.zip", old, etag='"v1"')
+    out = str(tmp_path / "a.zip")
+    with open(out, "wb") as f:
+        f.write(old[:SIZE // 2])
+        f.truncate(SIZE)
+    journal = DownloadJournal(out)
+    journal.reset(url, '"v1"', "", SIZE)
+    journal.add(0, SIZE // 2)
+    journal.save()
+
+    new = payload(SIZE)
+    server.put("a.zip", new, etag='"v2"')
+    server.head_etag = '"v1"'
+    ok, reason = engine.download(url, out, sha256=hashlib.sha256(new).hexdigest())
+
+    assert (ok, reason) == (True, "OK")
+    assert read(out) == new
+
+
+def test_interrupted_segment_retries_from_written_byte(server, engine, tmp_path):
+    data = payload(SIZE)
+    url = server.put("a.zip", data)
+    out = str(tmp_path / "a.zip")
+    engine.segments = 1
+    server.faults = [700 * 1024]
+
+    ok, _ = engine.download(url, out, sha256=hashlib.sha256(data).hexdigest())
+
+    assert ok
+    assert read(out) == data
+    starts = range_starts(server, "a.zip")
+    assert len(starts) == 2 and starts[1] > 0
+
+
+def test_failed_segment_keeps_written_bytes_in_journal(server, engine, tmp_path, monkeypatch):
+    """Байты после последней контрольной точки не теряются при обрыве"""
+    data = payload(SIZE)
+    url = server.put("a.zip", data)
+    out = str(tmp_path / "a.zip")
+    engine.segments = 1
+    monkeypatch.setattr(DownloadEngine, "SEGMENT_RETRIES", 0)
+    server.faults = [700 * 1024]
+
+    ok, _ = engine.download(url, out)
+    assert not ok
+
+    journal = DownloadJournal(out)
+    assert journal.load()
+    written = journal.prefix()
+    assert written >= DownloadEngine.CHUNK_SIZE
+    with open(out, "rb") as f:
+        assert f.read(written) == data[:written]
+
+    # Докачка продолжает с записанного байта, хэш проходит через весь файл
+    ok, _ = engine.download(url, out, sha256=hashlib.sha256(data).hexdigest())
+    assert ok
+    assert read(out) == data
+    assert range_starts(server, "a.zip")[-1] == written
+
+
+def test_progress_counts_restarted_download_once(server, tmp_path):
+    data = payload(SIZE)
+    url = server.put("a.zip", data)
+    server.ranges = False
+    tracker = ProgressTracker()
+    engine = DownloadEngine(None, progress=tracker)
+    task = engine.task("EP01")
+    # Прежняя попытка успела насчитать байты для того же файла
+    out = str(tmp_path / "a.zip")
+    task.expect(out, SIZE)
+    task.counter(out).add(1000)
+
+    ok, _ = engine.download(url, out, task=task)
+
+    assert ok
+    assert task.done() == task.total() == SIZE
+
+
+def test_stream_hasher_reset(tmp_path):
+    path = tmp_path / "f"
+    path.write_bytes(b"abcdef")
+    hasher = StreamHasher(str(path))
+    hasher.feed(0, b"xyz")
+    hasher.reset()
+    assert hasher.hexdigest(6) == hashlib.sha256(b"abcdef").hexdigest()
+
+
+def test_split_ranges():
+    pieces = DownloadEngine.split_ranges([(0, 100)], 4, 10)
+    assert pieces == [(0, 25), (25, 50), (50, 75), (75, 100)]
+    assert DownloadEngine.split_ranges([(0, 15)], 4, 10) == [(0, 15)]
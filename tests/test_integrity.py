@@ -0,0 +1,74 @@
+"""IntegrityVerifier: проверка установленных файлов по CRC32 и докачка повреждённых"""
+
+import os
+
+import pytest
+
+import linua_core
+from linua_core import DownloadEngine, Extractor, IntegrityVerifier, SingleDLCInstaller
+from conftest import make_zip, payload
+
+FILES = {f"EP01/file{i}.package": payload(200_000) for i in range(4)}
+
+
+@pytest.fixture
+def installed(server, tmp_path):
+    game = tmp_path / "game"
+    game.mkdir()
+    url = server.put("EP01.zip", make_zip(FILES))
+    info = {"url": url}
+    ok, reason = SingleDLCInstaller("EP01", info, str(game), DownloadEngine(None), Extractor(None), None).run()
+    assert ok, reason
+    return game, info
+
+
+def verifier(game):
+    return IntegrityVerifier(str(game), None, DownloadEngine(None), Extractor(None))
+
+
+def test_verify_detects_damaged_and_missing(installed):
+    game, info = installed
+    (game / "EP01" / "file0.package").write_bytes(b"x" * 200_000)
+    (game / "EP01" / "file1.package").unlink()
+
+    result = verifier(game).verify("EP01", info, deep=True)
+
+    assert result["damaged"] == ["EP01/file0.package"]
+    assert result["missing"] == ["EP01/file1.package"]
+    assert result["unreadable"] == []
+
+
+def test_unreadable_file_is_reported(installed, monkeypatch):
+    game, info = installed
+    real = linua_core.digest_file
+    locked = str(game / "EP01" / "file2.package")
+
+    def digest(path, algo="crc32", buffer=4 * 1024 * 1024):
+        if os.path.abspath(path) == locked:
+            raise PermissionError(13, "The process cannot access the file", path)
+        return real(path, algo, buffer)
+
+    monkeypatch.setattr(linua_core, "digest_file", digest)
+    result = verifier(game).verify("EP01", info, deep=True)
+
+    assert result["unreadable"] == ["EP01/file2.package"]
+    assert result["damaged"] == [] and result["missing"] == []
+    assert result["hashed"] == len(FILES) - 1
+
+
+def test_repair_restores_only_broken_files(installed, server):
+    game, info = installed
+    (game / "EP01" / "file3.package").write_bytes(b"broken")
+    check = verifier(game)
+    result = check.verify("EP01", info)
+    broken = result["damaged"] + result["missing"]
+    server.requests.clear()
+
+    ok, _ = check.repair("EP01", info, broken)
+
+    assert ok
+    assert (game / "EP01" / "file3.package").read_bytes() == FILES["EP01/file3.package"]
+    # Хвост с central directory и один элемент - не весь архив
+    fetched = [h["Range"] for h in server.gets("EP01.zip")]
+    assert len(fetched) == 2 and all(r.startswith("bytes=") for r in fetched)
+    assert verifier(game).verify("EP01", info, deep=True)["damaged"] == []
@@ -0,0 +1,153 @@
+"""InstallScheduler: порядок очереди, лимиты слотов и резерв места во временной папке"""
+
+import threading
+import time
+
+from linua_core import InstallScheduler
+
+GB = 1024 ** 3
+
+
+class Disk:
+    """Свободное место временной папки, которое задачи занимают своими архивами"""
+
+    def __init__(self, free):
+        self.free = free
+        self.lock = threading.Lock()
+
+    def take(self, size):
+        with self.lock:
+            self.free -= size
+
+    def give(self, size):
+        with self.lock:
+            self.free += size
+
+
+def scheduler(run_job, disk=None, **kwargs):
+    sched = InstallScheduler(run_job, **kwargs)
+    if disk:
+        sched.free_temp_bytes = lambda: disk.free
+    return sched
+
+
+def run(sched, jobs):
+    done = []
+    for dlc_id, size in jobs:
+        sched.submit(dlc_id, {"size": size})
+    sched.start(lambda dlc_id, ok, reason: done.append((dlc_id, ok, reason)))
+    assert sched.wait(10)
+    return done
+
+
+def test_smallest_first():
+    order = []
+
+    def job(dlc_id, info, slots):
+        with slots.download():
+            order.append(dlc_id)
+        return True, "OK"
+
+    sched = scheduler(job, download_slots=1, extract_slots=0)
+    run(sched, [("EP03", 300), ("EP01", 100), ("EP02", 200)])
+
+    assert order == ["EP01", "EP02", "EP03"]
+
+
+def test_download_slots_limit_concurrency():
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def job(dlc_id, info, slots):
+        with slots.download():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+        return True, "OK"
+
+    sched = scheduler(job, download_slots=2, extract_slots=2)
+    done = run(sched, [(f"SP{i:02}", 10) for i in range(8)])
+
+    assert len(done) == 8 and all(ok for _, ok, _ in done)
+    assert peak[0] == 2
+
+
+def test_running_archive_is_counted_once():
+    """
+    Архив выделяется на диске сразу при загрузке: резерв задачи с этого
+    момента снят, иначе его размер вычитался бы из свободного места дважды
+    """
+    disk = Disk(10 * GB)
+    both = threading.Barrier(2, timeout=5)
+
+    def job(dlc_id, info, slots):
+        with slots.download():
+            disk.take(info["size"])
+            both.wait()  # обе загрузки идут одновременно
+        disk.give(info["size"])
+        return True, "OK"
+
+    sched = scheduler(job, disk, download_slots=2, extract_slots=0, reserve_bytes=GB)
+    done = run(sched, [("EP01", 4 * GB), ("EP02", 4 * GB)])
+
+    assert sorted(done) == [("EP01", True, "OK"), ("EP02", True, "OK")]
+    assert sched._reserved == 0
+
+
+def test_queued_job_waits_for_running_one():
+    disk = Disk(6 * GB)
+    finished = []
+
+    def job(dlc_id, info, slots):
+        with slots.download():
+            disk.take(info["size"])
+            time.sleep(0.2)
+        disk.give(info["size"])
+        finished.append((dlc_id, disk.free))
+        return True, "OK"
+
+    sched = scheduler(job, disk, download_slots=2, extract_slots=0, reserve_bytes=GB)
+    done = run(sched, [("EP01", 4 * GB), ("EP02", 4 * GB)])
+
+    assert [ok for _, ok, _ in done] == [True, True]
+    # Вторая загрузка началась только после того, как первая освободила место
+    assert [free for _, free in finished] == [6 * GB, 6 * GB]
+
+
+def test_not_enough_space_without_running_jobs():
+    disk = Disk(2 * GB)
+    sched = scheduler(lambda *a: (True, "OK"), disk, download_slots=1, extract_slots=0, reserve_bytes=GB)
+
+    done = run(sched, [("EP01", 4 * GB)])
+
+    assert done == [("EP01", False, "Not enough free temp space")]
+
+
+def test_cancel_reports_pending():
+    started = threading.Event()
+    release = threading.Event()
+
+    def job(dlc_id, info, slots):
+        with slots.download():
+            started.set()
+            release.wait(5)
+        return True, "OK"
+
+    # Два рабочих потока: EP01 качается, EP02 уже взята и ждёт слот
+    sched = scheduler(job, download_slots=1, extract_slots=1, order="user")
+    done = []
+    for dlc_id in ("EP01", "EP02", "EP03", "EP04"):
+        sched.submit(dlc_id, {"size": 1})
+    sched.start(lambda dlc_id, ok, reason: done.append((dlc_id, ok, reason)))
+    assert started.wait(5)
+    while len(sched._queue) > 2:
+        time.sleep(0.01)
+    sched.cancel()
+    release.set()
+    assert sched.wait(5)
+
+    assert sorted(done) == [("EP01", True, "OK"), ("EP02", True, "OK"),
+                            ("EP03", False, "Cancelled by user"), ("EP04", False, "Cancelled by user")]
@@ -0,0 +1,44 @@
+"""StagingManager и staging-папки Extractor: ничего не остаётся в папке игры"""
+
+import os
+import time
+
+from linua_core import Extractor, StagingManager
+from conftest import make_zip, payload
+
+FILES = {"EP01/a.package": payload(10_000), "EP01/b.package": payload(10_000)}
+
+
+def test_extract_without_manager_leaves_no_work_dirs(tmp_path):
+    game = tmp_path / "game"
+    archive = tmp_path / "EP01.zip"
+    archive.write_bytes(make_zip(FILES))
+
+    ok, reason = Extractor(None).extract_zip(str(archive), str(game))
+
+    assert ok, reason
+    assert sorted(os.listdir(game)) == ["EP01"]
+
+
+def test_failed_extract_without_manager_cleans_up(tmp_path):
+    game = tmp_path / "game"
+    archive = tmp_path / "EP01.zip"
+    archive.write_bytes(b"not a zip")
+
+    ok, _ = Extractor(None).extract_zip(str(archive), str(game))
+
+    assert not ok
+    assert os.listdir(game) == []
+
+
+def test_fallback_staging_is_pruned_by_age(tmp_path):
+    """Брошенная (процесс упал) staging-папка находится prune_all, свежая - нет"""
+    game = tmp_path / "game"
+    game.mkdir()
+    extractor = Extractor(None)
+    stale, fresh = extractor.make_staging(str(game)), extractor.make_staging(str(game))
+    old = time.time() - StagingManager.STAGING_AGE - 60
+    os.utime(stale, (old, old))
+
+    assert StagingManager.prune_all(game) == 1
+    assert not os.path.exists(stale) and os.path.isdir(fresh)
@@ -0,0 +1,191 @@
+"""InstallTransaction: замена папок DLC и восстановление по журналу после сбоя"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from linua_core import InstallTransaction, StagingManager
+from conftest import ListLogger
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def dead_pid():
+    proc = subprocess.Popen([sys.executable, "-c", ""])
+    proc.wait()
+    return proc.pid
+
+
+@pytest.fixture
+def game(tmp_path):
+    game = tmp_path / "game"
+    write(game / "EP01" / "old.package", "old EP01")
+    write(game / "EP02" / "old.package", "old EP02")
+    return game
+
+
+@pytest.fixture
+def staging(game):
+    """Распакованная новая версия EP01, EP02 и общая папка Delta"""
+    root = game / StagingManager.DIR_NAME / "staging" / "dlc_test"
+    write(root / "EP01" / "new.package", "new EP01")
+    write(root / "EP02" / "new.package", "new EP02")
+    write(root / "Delta" / "EP01" / "d.package", "delta")
+    return root
+
+
+def crash(game, staging, moved=(), state="prepared", pid=None):
+    """
+    Состояние диска после сбоя: журнал записан, папки из moved уже
+    переставлены (старые отодвинуты в .old)
+    """
+    txn = InstallTransaction(game, staging)
+    data = {"staging": str(staging), "names": ["EP01", "EP02"], "existing": ["EP01", "EP02"],
+            "state": state, "pid": dead_pid() if pid is None else pid}
+    txn.write(data)
+    for name in moved:
+        txn.old.mkdir(parents=True, exist_ok=True)
+        os.replace(game / name, txn.old / name)
+        os.replace(staging / name, game / name)
+    return txn
+
+
+def installed(game, name):
+    return sorted(os.listdir(game / name))
+
+
+def assert_clean(game):
+    assert not (game / StagingManager.DIR_NAME / InstallTransaction.DIR_NAME).exists()
+
+
+def test_commit_replaces_folders(game, staging):
+    os.chmod(staging / "EP01" / "new.package", 0o444)
+    InstallTransaction(game, staging).commit()
+
+    assert installed(game, "EP01") == ["new.package"]
+    assert installed(game, "EP02") == ["new.package"]
+    assert (game / "Delta" / "EP01" / "d.package").read_text() == "delta"
+    assert not staging.exists()
+    assert_clean(game)
+
+
+def test_failed_commit_rolls_back(game, staging, monkeypatch):
+    real = os.replace
+
+    def failing(src, dst):
+        if str(src).endswith(os.path.join("dlc_test", "EP02")):
+            raise OSError("disk error")
+        return real(src, dst)
+
+    monkeypatch.setattr(os, "replace", failing)
+    with pytest.raises(OSError):
+        InstallTransaction(game, staging).commit()
+    monkeypatch.setattr(os, "replace", real)
+
+    assert installed(game, "EP01") == ["old.package"]
+    assert installed(game, "EP02") == ["old.package"]
+    assert not staging.exists()
+    assert_clean(game)
+
+
+def test_recover_prepared_nothing_moved_rolls_back(game, staging):
+    crash(game, staging)
+
+    assert InstallTransaction.recover(game, ListLogger()) == 1
+    assert installed(game, "EP01") == ["old.package"]
+    assert installed(game, "EP02") == ["old.package"]
+    assert not staging.exists()
+    assert_clean(game)
+
+
+def test_recover_prepared_partly_moved_rolls_back(game, staging):
+    crash(game, staging, moved=["EP01"])
+
+    assert InstallTransaction.recover(game) == 1
+    assert installed(game, "EP01") == ["old.package"]
+    assert installed(game, "EP02") == ["old.package"]
+    assert not (game / "Delta").exists()
+    assert_clean(game)
+
+
+def test_recover_prepared_all_moved_rolls_forward(game, staging):
+    crash(game, staging, moved=["EP01", "EP02"])
+
+    assert InstallTransaction.recover(game) == 1
+    assert installed(game, "EP01") == ["new.package"]
+    assert installed(game, "EP02") == ["new.package"]
+    assert (game / "Delta" / "EP01" / "d.package").read_text() == "delta"
+    assert_clean(game)
+
+
+def test_recover_committed_finishes(game, staging):
+    txn = crash(game, staging, moved=["EP01", "EP02"], state="committed")
+    StagingManager.commit(str(staging), str(game))
+
+    assert InstallTransaction.recover(game) == 1
+    assert installed(game, "EP01") == ["new.package"]
+    assert not txn.old.exists()
+    assert_clean(game)
+
+
+def test_recover_new_dlc_without_previous_version(tmp_path):
+    game = tmp_path / "game"
+    staging = game / StagingManager.DIR_NAME / "staging" / "dlc_new"
+    write(staging / "GP05" / "a.package", "new")
+    txn = InstallTransaction(game, staging)
+    txn.write({"staging": str(staging), "names": ["GP05"], "existing": [], "state": "prepared",
+               "pid": dead_pid()})
+
+    assert InstallTransaction.recover(game) == 1
+    assert not (game / "GP05").exists()
+    assert_clean(game)
+
+
+@pytest.mark.parametrize("pid", [os.getpid(), os.getppid()])
+def test_recover_skips_live_transactions(game, staging, pid):
+    crash(game, staging, moved=["EP01"], pid=pid)
+
+    assert InstallTransaction.recover(game) == 0
+    assert installed(game, "EP01") == ["new.package"]
+    assert (staging / "EP02").exists()
+
+
+def test_recover_does_not_wait_for_fsync(game, staging, monkeypatch):
+    """fsync большого дерева идёт без блокировки - recover() не ждёт его"""
+    release = threading.Event()
+    monkeypatch.setattr(InstallTransaction, "fsync_tree", classmethod(lambda cls, path: release.wait(10)))
+    (game / StagingManager.DIR_NAME / InstallTransaction.DIR_NAME).mkdir(parents=True)
+    worker = threading.Thread(target=InstallTransaction(game, staging).commit)
+    worker.start()
+    try:
+        time.sleep(0.2)
+        began = time.time()
+        assert InstallTransaction.recover(game) == 0
+        assert time.time() - began < 1
+    finally:
+        release.set()
+        worker.join()
+    assert installed(game, "EP01") == ["new.package"]
+
+
+def test_journal_records_owner(game, staging, monkeypatch):
+    seen = []
+    real = InstallTransaction.write
+
+    def spy(self, data):
+        seen.append(dict(data))
+        real(self, data)
+
+    monkeypatch.setattr(InstallTransaction, "write", spy)
+    InstallTransaction(game, staging).commit()
+
+    assert [d["state"] for d in seen] == ["prepared", "committed"]
+    assert seen[0]["pid"] == os.getpid()
+    assert seen[0]["names"] == ["EP01", "EP02"]